@@ -6,29 +6,63 @@ Using Gemini 1.5 Pro with Universal Physical Law (UPL) Protocol
 
 import streamlit as st
 import google.generativeai as genai
-from PIL import Image
-import io
+import contextvars
+import threading
 import time
-from typing import Optional, Tuple
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from dataclasses import asdict
+from typing import List, Optional, Tuple
+
+from kinetic.analyzers import AnalyzerReport
+from kinetic.cache import VerdictCache, verdict_cache
+from kinetic.costs import BLOCKED, ECONOMY, BudgetPolicy, BudgetStatus, Spend, spend_scopes
+from kinetic.deadline import SAVINGS, DEFAULT_DEADLINE, AuditAborted, Deadline, deadline_scope
+from kinetic.frames import FrameAudit, FramePlan, combined_suspicion, frame_hash
+from kinetic.hedging import POLICY as HEDGE_POLICY
+from kinetic.jobs import CANCELLED, DONE, EXPIRED, QUEUED, RUNNING, Job, job_queue
+from kinetic.keypool import KeyPool, PooledModel
+from kinetic.loader import MAX_UPLOAD_BYTES, ImageLoadError, load_image
+from kinetic.overlays import OverlaySet
+from kinetic.pipeline import (
+    ECONOMY_ADDENDUM,
+    ECONOMY_OUTPUT_TOKENS,
+    AuditModels,
+    AuditOptions,
+    AuditOutcome,
+    ModelSettings,
+    build_models,
+    run_forensic_audit,
+)
+from kinetic.prompts import estimate_tokens
+from kinetic.protocol import load_protocol
+from kinetic.router import PRICES, STATS
+from kinetic.scheduler import breaker_for, model_name, scheduler_stats
+from kinetic.singleflight import FLIGHTS
+from kinetic.store import PAGE_SIZE, AuditRecord, audit_store
+from kinetic.tracing import METRICS, Span, span, start_metrics_server
+from kinetic.verdicts import MANIPULATED, VERDICTS, combine_verdicts, parse_verdict
+from kinetic.video import (
+    ECONOMY_KEYFRAMES,
+    MAX_KEYFRAMES,
+    VIDEO_DEADLINE,
+    VIDEO_EXTENSIONS,
+    VideoAudit,
+    VideoLoadError,
+    analyze_video,
+    sniff_video_format,
+)
+from kinetic.worker import start_threads
+from kinetic.workspace import ImageWorkspace
+from kinetic.zoom import ZoomVerification
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION & INITIALIZATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def initialize_page():
-    """Configure Streamlit page with custom CSS for Gemini-inspired theme."""
-    st.set_page_config(
-        page_title="Kinetic.AI | Forensic Analysis",
-        page_icon="⚡",
-        layout="centered",  # Better for mobile responsiveness
-        initial_sidebar_state="collapsed",
-        menu_items={
-            'About': "Kinetic.AI - Advanced AI-Generated Image Detection"
-        }
-    )
-    
-    # Custom CSS Injection - Gemini-Inspired Theme
-    st.markdown("""
+# Gemini-inspired theme; Streamlit needs it emitted on every run, so it is built once here
+PAGE_CSS = """
         <style>
         /* Global Gemini Theme */
         .stApp {
@@ -406,42 +440,90 @@ def initialize_page():
             }
         }
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+MAX_SESSION_RESULTS = 8  # audits remembered per browser session
+JOB_POLL_SECONDS = 1.0  # how often a waiting session re-reads its job
+VIDEO_RUNNERS = 4  # video audits running at once in this server process
+VIDEO_POLL_SECONDS = 0.25  # how often a running video audit's progress is redrawn
+
+
+def initialize_page():
+    """Configure Streamlit page with custom CSS for Gemini-inspired theme."""
+    st.set_page_config(
+        page_title="Kinetic.AI | Forensic Analysis",
+        page_icon="⚡",
+        layout="centered",  # Better for mobile responsiveness
+        initial_sidebar_state="collapsed",
+        menu_items={
+            'About': "Kinetic.AI - Advanced AI-Generated Image Detection"
+        }
+    )
+    
+    # Custom CSS Injection - Gemini-Inspired Theme (built once at import, re-sent each run)
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
 
+@st.cache_resource(show_spinner=False)
+def load_models(settings: ModelSettings) -> AuditModels:
+    """One set of pooled models per key set and model names, shared by every session and rerun."""
+    return build_models(settings)
 
-def initialize_gemini_client() -> Optional[genai.GenerativeModel]:
+
+def initialize_gemini_client() -> Optional[AuditModels]:
     """
     Initialize Gemini API client with deterministic settings.
     Returns None if API key is not configured.
+    
+    Calls are balanced over every key in GEMINI_API_KEYS (a list or
+    comma-separated string), falling back to the single GEMINI_API_KEY.
+    GEMINI_MODEL, GEMINI_ESCALATION_MODEL and GEMINI_HEDGE_MODEL pick the models.
     """
     try:
-        api_key = st.secrets.get("GEMINI_API_KEY")
-        if not api_key:
-            st.error("❌ API Key not found. Please configure GEMINI_API_KEY in .streamlit/secrets.toml")
+        settings = ModelSettings.from_config(st.secrets)
+        if not settings.api_keys:
+            st.error("❌ API Key not found. Please configure GEMINI_API_KEYS or GEMINI_API_KEY in .streamlit/secrets.toml")
             return None
         
-        genai.configure(api_key=api_key)
-        
-        # Generation config for deterministic, objective analysis
-        generation_config = {
-            "temperature": 0.0,  # Deterministic output
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-        }
-        
-        model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
-            generation_config=generation_config
-        )
-        
-        return model
+        return load_models(settings)
     
     except Exception as e:
         st.error(f"❌ Failed to initialize Gemini API: {str(e)}")
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def start_embedded_workers(_models: AuditModels, count: int) -> int:
+    """
+    Start ``count`` queue workers inside the Streamlit server, once per process.
+    
+    Set EMBEDDED_WORKERS = 0 when audits are served by separate
+    ``python -m kinetic.worker`` processes.
+    """
+    return len(start_threads(_models, count))
+
+
+@st.cache_resource(show_spinner=False)
+def video_runner() -> ThreadPoolExecutor:
+    """Threads that run video audits off the script thread, so the page can poll them and offer Cancel."""
+    return ThreadPoolExecutor(max_workers=VIDEO_RUNNERS, thread_name_prefix="video-run")
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_endpoint(port: int) -> bool:
+    """
+    Serve this process's stage histograms on ``/metrics`` (METRICS_PORT in secrets), once per process.
+    
+    Returns:
+        False if the port could not be bound (e.g. another server process holds it)
+    """
+    try:
+        start_metrics_server(port)
+        return True
+    except OSError:
+        return False
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # UNIVERSAL PHYSICAL LAW (UPL) PROTOCOL
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -450,1033 +532,797 @@ def get_upl_forensic_prompt() -> str:
     """
     Returns the Universal Physical Law (UPL) Protocol prompt.
     Physics and mathematics-based analysis focusing on fundamental differences between camera optics and AI generation.
+    Compiled once per process from kinetic/protocols/upl.md.
     """
-    return """
-# FORENSIC IMAGE AUDIT: PHYSICS & MATHEMATICS-BASED DETECTION PROTOCOL v4.0
-## COMPUTATIONAL IMAGING vs AI GENERATION ANALYSIS
+    return load_protocol().text
 
-You are an ELITE forensic analyst specializing in computational photography, optical physics, and AI generation mathematics.
 
-🎯 **MISSION**: Analyze images based on FUNDAMENTAL PHYSICS and MATHEMATICAL DIFFERENCES between real camera capture and AI neural network synthesis.
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE FORENSIC ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
 
-⚠️ **CRITICAL DIRECTIVE - READ CAREFULLY**:
-Modern AI in 2026 (Midjourney v6, DALL-E 3, Flux Pro, Stable Diffusion 3) is EXTREMELY sophisticated and can fake many visual aspects. Your PRIMARY GOAL is to ensure NO AI-GENERATED IMAGES are classified as AUTHENTIC.
+def validate_image(uploaded_file) -> Optional[ImageWorkspace]:
+    """
+    Validate the uploaded image file without decoding its pixels.
+    
+    Size is checked first, the format is sniffed from magic bytes (not the
+    extension) and header dimensions are bounded before any decode happens.
+    The workspace is kept in session state, so reruns reuse its decoded
+    pixels and planes instead of loading the upload again.
+    
+    Args:
+        uploaded_file: Streamlit uploaded file object
+        
+    Returns:
+        ImageWorkspace shared by every check of this audit, or None if invalid
+    """
+    cached = st.session_state.get("upload")
+    if cached is not None and cached[0] == uploaded_file.file_id:
+        return cached[1]
+    
+    try:
+        # Check file size before touching the bytes (max 20MB for API)
+        if uploaded_file.size > MAX_UPLOAD_BYTES:
+            st.error("❌ Image too large. Maximum size: 20MB")
+            return None
+        
+        with span("validate"):
+            source = load_image(uploaded_file.getvalue())
+            workspace = ImageWorkspace.from_source(source)
+        st.session_state["upload"] = (uploaded_file.file_id, workspace)
+        return workspace
+    
+    except ImageLoadError as e:
+        st.error(f"❌ {str(e)}")
+        return None
+    
+    except Exception as e:
+        st.error(f"❌ Failed to load image: {str(e)}")
+        return None
 
-**DETECTION PHILOSOPHY**:
-1. **Burden of Proof**: To classify as AUTHENTIC, you must find POSITIVE PROOF of camera capture (Bayer artifacts, sensor noise, chromatic aberration, MTF degradation)
-2. **Absence ≠ Authenticity**: Just because you don't see obvious AI artifacts does NOT mean it's authentic
-3. **Default to Skepticism**: When uncertain → INCONCLUSIVE, never AUTHENTIC
-4. **Zero False Negatives**: It's acceptable to mark real photos as INCONCLUSIVE, but NEVER mark AI as AUTHENTIC
 
-**The Test**: Ask yourself "Could a neural network have generated this?" If the answer is "possibly yes" → NOT authentic.
+def render_local_forensics(reports: List[AnalyzerReport], wall_time: float):
+    """
+    Render on-device analyzer results below the model verdict.
+    
+    Args:
+        reports: Analyzer reports in run order
+        wall_time: Total wall time of the local run (≈ slowest analyzer)
+    """
+    with st.expander(f"🧪 Local Forensic Checks ({wall_time:.2f}s)"):
+        for report in reports:
+            if report.status != "ok":
+                st.markdown(f"**{report.name}** — ⚠️ {report.status}: {report.summary}")
+                continue
+            st.markdown(
+                f"**{report.name}** — suspicion {report.score:.0%} · {report.wall_time:.2f}s  \n"
+                f"{report.summary}"
+            )
+
+
+def render_zoom_verification(verification: ZoomVerification, extra_time: float):
+    """
+    Render second-pass results for the coordinates the model claimed.
+    
+    Args:
+        verification: Zoom pass outcome
+        extra_time: Wall time the second pass added after the first finished
+    """
+    title = (
+        f"🔎 Zoom Verification — {verification.count('CONFIRMED')}/{len(verification.claims)} claims confirmed "
+        f"(+{extra_time:.2f}s, {verification.prompt_tokens + verification.output_tokens:,} tokens)"
+    )
+    with st.expander(title):
+        if verification.error:
+            st.warning(f"⚠️ Verification call failed: {verification.error}")
+        st.markdown(verification.to_markdown())
 
----
 
-## 📐 FUNDAMENTAL PHYSICS TESTS
+def record_overlay_run(overlay_set: Optional[OverlaySet], latency: float, usage: dict):
+    """
+    Remember latency and token use of a single-call audit for the overlay comparison.
+    
+    Args:
+        overlay_set: Overlays attached to the call (None if disabled)
+        latency: Model call wall time in seconds
+        usage: Token counts filled by run_forensic_audit
+    """
+    runs = st.session_state.setdefault("overlay_runs", [])
+    runs.append({
+        "overlays": overlay_set is not None,
+        "latency": latency,
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "output_tokens": usage.get("output_tokens"),
+    })
 
-### 1. SENSOR PHYSICS vs NEURAL NETWORK SYNTHESIS
 
-#### 1.1 PHOTON SHOT NOISE (POISSON STATISTICS)
-**Camera Physics**: Light arrives as discrete photons following Poisson distribution.
-- **Mathematical Property**: σ² = μ (variance equals mean)
-- **Real Behavior**: Noise magnitude = √(signal intensity)
-- **Critical Implication**: DARK areas have MORE noise (proportionally)
+def render_overlay_comparison(overlay_set: Optional[OverlaySet]):
+    """
+    Show the attached overlays and average cost of audits with vs without them.
+    
+    Args:
+        overlay_set: Overlays attached to this audit (None if disabled)
+    """
+    runs = st.session_state.get("overlay_runs", [])
+    if overlay_set is None and not any(run["overlays"] for run in runs):
+        return
+    
+    with st.expander("🗺️ Forensic Overlays"):
+        if overlay_set is not None:
+            st.caption(
+                f"Rendered locally in {overlay_set.wall_time:.2f}s · ~{overlay_set.estimated_tokens} image tokens"
+            )
+            st.image(overlay_set.images, caption=[overlay.name for overlay in overlay_set.overlays], width=200)
+        
+        rows = ["| Overlays | Audits | Avg latency | Avg prompt tokens | Avg output tokens |", "|---|---|---|---|---|"]
+        for enabled in (False, True):
+            group = [run for run in runs if run["overlays"] == enabled]
+            if not group:
+                continue
+            
+            def mean(key):
+                values = [run[key] for run in group if run[key] is not None]
+                return f"{sum(values) / len(values):,.0f}" if values else "n/a"
+            
+            latency = sum(run["latency"] for run in group) / len(group)
+            rows.append(
+                f"| {'with' if enabled else 'without'} | {len(group)} | {latency:.2f}s | "
+                f"{mean('prompt_tokens')} | {mean('output_tokens')} |"
+            )
+        st.markdown("\n".join(rows))
+
+
+def render_routing_stats():
+    """Render process-wide per-route latency, token, cost and escalation totals."""
+    routes = STATS.snapshot()
+    if not routes:
+        return
+    
+    with st.expander("📈 Model Routing"):
+        st.caption(
+            f"{STATS.audits} audits · {STATS.escalations} escalated ({STATS.escalation_rate:.0%}) · "
+            f"{STATS.high_stakes} high-stakes"
+        )
+        flights = FLIGHTS.snapshot()
+        if flights["coalesced"]:
+            st.caption(
+                f"🔗 {flights['coalesced']} identical concurrent requests coalesced onto "
+                f"{flights['leaders']} model calls · {flights['in_flight']} in flight"
+            )
+        rows = ["| Model | Calls | Failures | Avg latency | Prompt tokens | Output tokens | Cost |", "|---|---|---|---|---|---|---|"]
+        for name, route in routes:
+            rows.append(
+                f"| {name} | {route.calls} | {route.failures} | {route.mean_latency:.2f}s | "
+                f"{route.prompt_tokens:,} | {route.output_tokens:,} | ${route.cost:.4f} |"
+            )
+        st.markdown("\n".join(rows))
+        
+        for name, stats in scheduler_stats().items():
+            breaker = breaker_for(name).snapshot()
+            circuit = f"circuit {breaker['state']}" + (f" ({breaker['reason']})" if breaker["reason"] else "")
+            st.caption(
+                f"🚦 {name}: {stats.calls} requests · {stats.queued} queued for quota ({stats.queued_seconds:.1f}s) · "
+                f"{stats.retries} retries · {stats.quota_pauses} quota pauses · {stats.failures} failed after retries · "
+                f"🔌 {circuit}, {breaker['trips']} trips, {breaker['rejected']} calls refused"
+            )
+
+
+def render_hedging_stats():
+    """Render how often hedged requests fired and won."""
+    stats = HEDGE_POLICY.snapshot()
+    if not stats["requests"]:
+        return
+    
+    with st.expander("🪁 Hedged Requests"):
+        st.markdown(
+            f"**{stats['requests']}** streamed calls · **{stats['hedges']}** hedged ({stats['hedge_rate']:.0%}) · "
+            f"**{stats['hedge_wins']}** won by the hedge · {stats['capped']} suppressed by the rate cap"
+        )
+        st.caption(f"Current hedge delay: {HEDGE_POLICY.delay():.1f}s from {stats['samples']} recent first-chunk times")
+
+
+def render_key_pool_stats(pool: KeyPool):
+    """Render per-key request, token, rate-limit and headroom figures."""
+    with st.expander(f"🔑 API Keys ({len(pool)})"):
+        rows = ["| Key | Requests | Input tokens | Rate-limited | Errors | Headroom | Status |", "|---|---|---|---|---|---|---|"]
+        for row in pool.snapshot():
+            stats = row["stats"]
+            headroom = " · ".join(f"{name} {value:.0%}" for name, value in row["headroom"].items()) or "—"
+            status = f"⏸️ quarantined {row['quarantined']:.0f}s" if row["quarantined"] else "✅ active"
+            rows.append(
+                f"| {row['key']} | {stats.requests} | {stats.tokens:,} | {stats.rate_limited} | "
+                f"{stats.errors} | {headroom} | {status} |"
+            )
+        st.markdown("\n".join(rows))
+
+
+def render_cancellation_stats():
+    """Render what cancelled and timed-out audits saved."""
+    stats = SAVINGS.snapshot()
+    if not (stats["cancelled"] or stats["expired"] or stats["calls_aborted"]):
+        return
+    
+    routes = STATS.snapshot()
+    calls = sum(route.calls for _, route in routes)
+    mean_output = sum(route.output_tokens for _, route in routes) / calls if calls else 0.0
+    with st.expander("⏹️ Cancellations"):
+        st.markdown(
+            f"**{stats['cancelled']}** audits cancelled · **{stats['expired']}** past their deadline · "
+            f"~{stats['seconds_saved']:.0f}s of waiting saved"
+        )
+        st.caption(
+            f"{stats['calls_aborted']} model calls aborted mid-request (~{stats['calls_aborted'] * mean_output:,.0f} "
+            f"output tokens not generated) · {stats['calls_unsent']} never sent "
+            f"({stats['input_tokens_unsent']:,} input tokens)"
+        )
 
-**AI Generation**: Neural networks add Gaussian noise uniformly.
-- **Mathematical Property**: σ² is constant
-- **Wrong Behavior**: Equal noise everywhere OR less noise in shadows
 
-**TEST PROCEDURE**:
-1. Sample 3 bright regions (sky, highlights) and 3 dark regions (shadows, dark clothing)
-2. Measure relative noise levels
-3. **AUTHENTIC**: Dark regions show 2-3× MORE noise (relative to signal)
-4. **AI RED FLAG**: Equal noise everywhere OR inverted relationship
+def render_stage_latency(trace: List[Span]):
+    """Render this audit's stage breakdown and the process-wide stage histograms."""
+    rows = METRICS.snapshot()
+    if not rows and not trace:
+        return
+    
+    with st.expander("⏱️ Stage Latency"):
+        if trace:
+            st.caption("This audit: " + " · ".join(
+                f"{item.stage.replace('_', ' ')} {item.duration:.2f}s" + (f" ({item.model})" if item.model else "")
+                for item in sorted(trace, key=lambda item: item.start)
+            ))
+        table = ["| Stage | Model | Count | Mean | p50 | p95 | Total |", "|---|---|---|---|---|---|---|"]
+        for stage, model, histogram in rows:
+            table.append(
+                f"| {stage.replace('_', ' ')} | {model or '—'} | {histogram.count} | {histogram.mean:.2f}s | "
+                f"{histogram.quantile(0.5):.2f}s | {histogram.quantile(0.95):.2f}s | {histogram.sum:.1f}s |"
+            )
+        st.markdown("\n".join(table))
+        port = st.secrets.get("METRICS_PORT")
+        if port:
+            served = start_metrics_endpoint(int(port))
+            st.caption(
+                f"📡 Prometheus histograms for this server process on :{port}/metrics" if served
+                else f"📡 Port {port} is taken — /metrics is not served by this process"
+            )
+        st.caption("Standalone workers export their own stages with `python -m kinetic.worker --metrics-port PORT`.")
+
+
+def render_profile(job_id: str):
+    """Offer the cProfile/tracemalloc capture of a profiled audit for download."""
+    profile = audit_store().profile(job_id)
+    if profile is None:
+        return
+    
+    with st.expander("🔬 Profile"):
+        st.caption(
+            f"{profile.wall_time:.2f}s under cProfile · peak traced memory {profile.peak_memory / 2**20:.1f} MiB · "
+            f"{len(profile.allocations)} top allocation sites"
+        )
+        rows = ["| Allocation site | Size | Blocks |", "|---|---|---|"]
+        for site in profile.allocations[:10]:
+            rows.append(f"| `{site.location}` | {site.size / 1024:,.1f} KiB | {site.count:,} |")
+        st.markdown("\n".join(rows))
+        st.code(profile.summary, language=None)
+        stats_column, stacks_column = st.columns(2)
+        stats_column.download_button(
+            "⬇️ cProfile stats (.prof)",
+            profile.pstats,
+            file_name=f"kinetic-{job_id[:8]}.prof",
+            mime="application/octet-stream",
+            use_container_width=True,
+            key=f"prof-{job_id}",
+        )
+        stacks_column.download_button(
+            "⬇️ Collapsed stacks (.folded)",
+            profile.folded,
+            file_name=f"kinetic-{job_id[:8]}.folded",
+            mime="text/plain",
+            use_container_width=True,
+            key=f"folded-{job_id}",
+        )
+        st.caption("Open the .prof with snakeviz or `python -m pstats`; feed the .folded file to flamegraph.pl or speedscope.")
 
-**CONFIDENCE**: This is physics law - if violated, likely AI
 
----
+def render_frame_forensics(plan: FramePlan, audits: List[FrameAudit], model_report: str):
+    """
+    Render the combined verdict and per-frame local results for an animation.
+    
+    Args:
+        plan: Frame selection from the hashing pass
+        audits: Local analyzer results per audited frame
+        model_report: Model response text ("" if the call failed)
+    """
+    suspicion = combined_suspicion(audits)
+    verdict = combine_verdicts(parse_verdict(model_report), suspicion)
+    scanned = f"{plan.total_frames}+" if plan.truncated else str(plan.total_frames)
+    st.caption(
+        f"🎞️ {scanned} frames · {plan.duplicates_dropped} near-duplicates dropped · "
+        f"{len(plan.selected_indices)} audited"
+    )
+    if verdict is not None:
+        confidence = f" ({verdict.confidence:.0f}%)" if verdict.confidence is not None else ""
+        st.markdown(f"**🎯 Combined Verdict**: {verdict.label}{confidence} · source: {verdict.source}")
+    
+    with st.expander("🧪 Local Forensic Checks per Frame"):
+        for audit in audits:
+            score = f"{audit.suspicion:.0%}" if audit.suspicion is not None else "n/a"
+            st.markdown(f"**Frame #{audit.index}** — mean suspicion {score}")
+            for report in audit.reports:
+                st.caption(f"{report.name}: {report.summary}")
 
-#### 1.2 BAYER FILTER DEMOSAICING
-**Camera Physics**: Sensors use RGBG pattern (2× green photosites).
-- **Mathematical Consequence**: Green channel has √2 better SNR
-- **Demosaicing Artifacts**: Zipper artifacts, color aliasing at edges
-- **Green Channel Dominance**: Better detail preservation
 
-**AI Generation**: Synthesizes RGB channels independently.
-- **Wrong Behavior**: Equal SNR across R/G/B channels
-- **Missing Artifacts**: No demosaicing artifacts OR fakes them incorrectly
+def render_video_timeline(video_audit: VideoAudit):
+    """
+    Render the per-segment verdict timeline of a video audit.
+    
+    Args:
+        video_audit: Completed video pipeline result
+    """
+    overall = video_audit.overall
+    if overall is not None:
+        confidence = f" ({overall.confidence:.0f}%)" if overall.confidence is not None else ""
+        st.markdown(f"**🎯 Overall Verdict**: {overall.label}{confidence}")
+    st.caption(
+        f"🎬 {video_audit.duration:.1f}s · {video_audit.sampled_frames} frames sampled · "
+        f"{len(video_audit.segments)} keyframes audited"
+        + (" · keyframe cap reached" if video_audit.keyframe_cap_hit else "")
+    )
+    
+    rows = ["| Segment | Verdict | Noise CV | Flicker |", "|---|---|---|---|"]
+    for segment in video_audit.segments:
+        label = segment.verdict.label if segment.verdict else "⚠️ failed"
+        rows.append(
+            f"| {segment.start:.1f}s – {segment.end:.1f}s | {label} | "
+            f"{segment.metrics.get('noise_cv', 0):.2f} | {segment.metrics.get('flicker', 0):.2f} |"
+        )
+    st.markdown("\n".join(rows))
+    
+    for segment in video_audit.segments:
+        with st.expander(f"🔍 Keyframe @ {segment.keyframe_time:.1f}s"):
+            st.markdown(segment.report)
 
-**TEST PROCEDURE**:
-1. Examine noise in R, G, B channels separately
-2. Check high-contrast edges for color zipper artifacts
-3. **AUTHENTIC**: Green has less noise, subtle color fringing at edges
-4. **AI RED FLAG**: Perfect RGB balance, no demosaicing artifacts
-
----
 
-#### 1.3 OPTICAL CHROMATIC ABERRATION
-**Lens Physics**: Different wavelengths refract differently (Snell's Law: n(λ)).
-- **Mathematical Consequence**: Blue focuses shorter than red (Δf ≈ 1-2mm typical lens)
-- **Observable Effect**: Color fringing at high-contrast edges
-- **Pattern**: Purple/cyan away from center, red/blue at edges
-
-**AI Generation**: No physical optics, adds CA as post-effect (if at all).
-- **Wrong Behavior**: No CA, OR CA added uniformly (ignoring field position)
-- **Contradiction**: Perfect CA pattern (impossible with real lens)
-
-**TEST PROCEDURE**:
-1. Zoom to 200% on high-contrast edges (branches against sky, building edges)
-2. Look for color separation (typically 1-3 pixels)
-3. **AUTHENTIC**: Visible, consistent color fringing, stronger at image corners
-4. **AI RED FLAG**: Zero CA OR uniform CA across entire image
-
----
-
-### 2. OPTICAL PHYSICS vs NEURAL RENDERING
+def sniff_upload(uploaded_file) -> Optional[str]:
+    """Video container of an upload, read from its first bytes instead of copying the whole file every rerun."""
+    position = uploaded_file.tell()
+    uploaded_file.seek(0)
+    header = uploaded_file.read(16)
+    uploaded_file.seek(position)
+    return sniff_video_format(header)
 
-#### 2.1 DEPTH-OF-FIELD & CIRCLE OF CONFUSION
-**Lens Physics**: Thin lens equation: 1/f = 1/s + 1/s'
-- **Mathematical Property**: Objects out of focus spread to circles (CoC = |D × (s - f)/(s × (f - D))|)
-- **Bokeh Shape**: Determined by aperture blade count (5-9 blades creates polygons)
-- **Coherent Blur**: All objects at same distance blur equally
-
-**AI Generation**: Approximates depth-map-based blur.
-- **Wrong Behavior**: Inconsistent blur for objects at same depth
-- **No Optical Logic**: Circular bokeh regardless of "aperture", no blade structure
-- **Edge Bleeding**: Foreground bleeds into background blur (no real optical separation)
-
-**TEST PROCEDURE**:
-1. Identify objects at similar depths
-2. Check blur consistency
-3. Examine bokeh shape (if visible)
-4. **AUTHENTIC**: Consistent blur, polygonal bokeh, sharp foreground/background separation
-5. **AI RED FLAG**: Inconsistent blur, perfect circles, edge bleeding
-
----
 
-#### 2.2 FRESNEL EQUATIONS & REFLECTION PHYSICS
-**Maxwell's Equations**: Reflection follows Fresnel equations: R(θ) = ½[|R_s|² + |R_p|²]
-- **Mathematical Consequence**: Reflections increase at grazing angles (Brewster's angle ~56° for glass)
-- **Polarization**: Reflected light is partially polarized
-- **Critical Property**: Reflection must obey incident angle = reflected angle
-
-**AI Generation**: Approximates reflections using style transfer or depth maps.
-- **Wrong Behavior**: Reflections ignore Fresnel effect
-- **Geometric Errors**: Wrong angles, incorrect object placement
-- **Missing Physics**: No polarization effects, uniform reflection strength
-
-**TEST PROCEDURE**:
-1. Locate reflective surfaces (water, glass, metal)
-2. Verify reflection angles geometrically
-3. Check grazing-angle enhancement
-4. **AUTHENTIC**: Correct angles, stronger reflection at edges, consistent perspective
-5. **AI RED FLAG**: Wrong reflection angles, uniform reflection, geometric impossibilities
-
----
-
-### 3. LIGHTING PHYSICS vs SYNTHETIC ILLUMINATION
-
-#### 3.1 INVERSE SQUARE LAW
-**Radiometry**: Light intensity follows I = I₀/r²
-- **Mathematical Consequence**: Falloff is rapid - doubling distance = ¼ intensity
-- **Critical Test**: Near-source lighting shows dramatic gradient
-
-**AI Generation**: Often uses ambient lighting or wrong falloff curves.
-- **Wrong Behavior**: Linear falloff OR no falloff (ambient assumption)
-- **Contradiction**: Multiple light sources not following 1/r²
-
-**TEST PROCEDURE**:
-1. Identify point light sources (lamps, sun, flash)
-2. Measure relative brightness at different distances
-3. **AUTHENTIC**: Rapid intensity falloff near source (1/r²)
-4. **AI RED FLAG**: Linear falloff or constant intensity
-
----
-
-#### 3.2 SHADOW VECTOR CONSISTENCY
-**Geometric Optics**: All shadows from single source point to same vanishing point.
-- **Mathematical Property**: Parallel rays from distant source (sun) create parallel shadow edges
-- **Vector Consistency**: tan(θ) must be identical for all shadows
-- **Hard vs Soft**: Penumbra size = (source angular size) × (distance from shadow caster)
-
-**AI Generation**: Shadows generated per-object, not from unified light field.
-- **Wrong Behavior**: Shadow angles don't converge to single point
-- **Inconsistent Softness**: Random blur without physical justification
-- **Multiple Suns**: Contradictory shadow directions
-
-**TEST PROCEDURE**:
-1. Identify 3+ distinct shadows
-2. Trace shadow edges backward
-3. Verify convergence to single point (or parallel for sun)
-4. **AUTHENTIC**: Perfect geometric consistency
-5. **AI RED FLAG**: Shadows point to different sources OR inconsistent softness
-
----
-
-### 4. FREQUENCY DOMAIN ANALYSIS
-
-#### 4.1 MODULATION TRANSFER FUNCTION (MTF)
-**Lens Physics**: Optical systems have frequency-dependent resolution (MTF curve).
-- **Mathematical Property**: High frequencies attenuate (diffraction limit ≈ 1/(λ × f/#))
-- **Spatial Behavior**: Resolution degrades from center to corners
-- **Color Dependence**: Blue has lower MTF than red (shorter wavelength = more diffraction)
-
-**AI Generation**: Synthesizes at target resolution without optical MTF constraints.
-- **Wrong Behavior**: Uniform sharpness across frame
-- **Impossible Detail**: High frequencies beyond diffraction limit
-- **No Color Dependence**: Equal detail in all channels
-
-**TEST PROCEDURE**:
-1. Compare edge sharpness at center vs corners
-2. Look for diffraction-limited detail loss
-3. **AUTHENTIC**: Softer corners, natural high-frequency rolloff
-4. **AI RED FLAG**: Uniform sharpness, impossible detail preservation
-
----
-
-#### 4.2 DIFFUSION MODEL LATENT SPACE ARTIFACTS
-**Neural Network Math**: Diffusion models denoise in compressed 8×8 or 16×16 latent blocks.
-- **Mathematical Consequence**: Block boundaries in frequency domain
-- **Observable Pattern**: Energy peaks at 8, 16, 32, 64 cycles/image
-- **Denoising Residue**: Organized flow patterns in flat areas
-
-**Real Camera**: No latent space - captures direct optical projection.
-- **Frequency Behavior**: Smooth 1/f power law (pink noise)
-- **Random Phase**: No organized patterns
-
-**TEST PROCEDURE** (Mental/Conceptual):
-1. Examine flat uniform areas (sky, walls)
-2. Look for subtle swirls, flow patterns, or grid structures
-3. **AUTHENTIC**: Pure random noise, no organization
-4. **AI RED FLAG**: Organized patterns, swirls, or visible 8×8 / 16×16 grids
-
----
-
-### 5. COMPRESSION & ENCODING FORENSICS
-
-#### 5.1 JPEG DISCRETE COSINE TRANSFORM (DCT) ANALYSIS
-**JPEG Math**: Images compressed in 8×8 blocks using DCT.
-- **Mathematical Property**: Uniform quantization across entire image
-- **Generational Loss**: Each save increases compression artifacts
-- **Block Boundaries**: Subtle 8×8 grid visible at high magnification
-
-**AI Generation → Save**: Often generated as PNG (no compression) then converted.
-- **Wrong Behavior**: Pristine regions mixed with compressed regions (composite)
-- **Inconsistent Quantization**: Different compression levels in different areas
-
-**TEST PROCEDURE**:
-1. Check for uniform 8×8 block artifacts across image
-2. Compare compression consistency between regions
-3. **AUTHENTIC**: Uniform compression throughout
-4. **AI RED FLAG**: Mixed compression levels OR no compression (suspiciously pristine)
-
----
-
-### 6. STATISTICAL DISTRIBUTION TESTS
-
-#### 6.1 HISTOGRAM ANALYSIS
-**Real Cameras**: Limited dynamic range, 8-14 bit depth.
-- **Observable**: Histogram may clip at 0/255, show quantization
-- **Natural Distribution**: Follows scene illumination statistics
-
-**AI Generation**: Synthesized values can exceed natural bounds.
-- **Wrong Behavior**: Perfect histogram with no clipping (suspiciously ideal)
-- **Supersaturation**: Colors exceed camera gamut
-- **Posterization**: Histogram gaps from limited neural network precision
-
-**TEST PROCEDURE**:
-1. Check for natural histogram clipping or posterization
-2. Verify colors within realistic gamut
-3. **AUTHENTIC**: Realistic histogram with natural limitations
-4. **AI RED FLAG**: Perfect histogram OR impossible colors
-
----
-
-## 🎯 ANALYSIS PROTOCOL
-
-**STEP 1: SENSOR PHYSICS TESTS** (Highest Priority)
-- Poisson noise distribution (dark areas noisier)
-- Green channel SNR advantage
-- Chromatic aberration presence
-
-**STEP 2: OPTICAL PHYSICS TESTS**
-- Depth-of-field consistency
-- Fresnel reflection behavior
-- MTF degradation corner-to-center
-
-**STEP 3: LIGHTING PHYSICS TESTS**
-- Inverse square law
-- Shadow vector convergence
-- Specular highlight physics
-
-**STEP 4: FREQUENCY & ENCODING**
-- Diffusion model artifacts in flat areas
-- JPEG compression consistency
-- Histogram realism
-
-**STEP 5: STATISTICAL VALIDATION**
-- Cross-validate findings across tests
-- Look for AUTHENTIC markers (proper noise, CA, MTF)
-- Only flag systematic physics violations
-
----
-
-## 📊 VERDICT FRAMEWORK
-
-⚠️ **CRITICAL DIRECTIVE**: AI-generated images are extremely sophisticated in 2026. To ensure NO AI images pass as authentic, you MUST find positive proof of camera capture, not just absence of AI artifacts.
-
-**AUTHENTIC (90-100% confidence)** - REQUIRES ALL OF:
-✅ Poisson noise in shadows (2-3× more than highlights) - VERIFIED
-✅ Green channel SNR advantage (Bayer filter proof) - VERIFIED
-✅ Chromatic aberration at edges (real lens optics) - VERIFIED
-✅ MTF degradation at corners (optical physics) - VERIFIED
-✅ Proper sensor noise pattern (random, not organized) - VERIFIED
-✅ Shadow vector convergence (geometric consistency) - VERIFIED
-✅ At least 2 camera imperfections (hot pixels, vignetting, dust spots) - VERIFIED
-✅ ZERO AI artifacts detected
-
-**RULE**: If ANY of the above fails, CANNOT be classified as AUTHENTIC.
-
-**LIKELY AUTHENTIC (70-89%)** - REQUIRES:
-✅ 6-7 of the above camera markers present
-⚠️ 1-2 tests unclear (heavy post-processing, compression artifacts)
-✅ No definitive AI artifacts
-✅ Natural camera limitations visible
-
-**INCONCLUSIVE (40-69%)** - DEFAULT WHEN UNCERTAIN:
-⚠️ Some camera markers present but incomplete
-⚠️ Heavy post-processing obscures fundamental physics
-⚠️ Cannot definitively confirm camera capture OR AI generation
-⚠️ Missing critical data (too low resolution, extreme compression)
-
-**IMPORTANT**: When in doubt between AUTHENTIC and INCONCLUSIVE, choose INCONCLUSIVE.
-
-**LIKELY AI (30-39%)**:
-❌ 2-3 camera markers missing (no Bayer, no CA, wrong noise)
-❌ Suspicious patterns detected (organized noise, latent grids)
-⚠️ Some physics tests pass (sophisticated model)
-⚠️ Could be heavily processed real photo, but unlikely
-
-**DEFINITELY AI (0-29%)**:
-❌ 5+ camera-specific markers completely absent
-❌ Definitive AI artifacts (diffusion swirls, uniform MTF, impossible optics)
-❌ Physics violations (equal noise everywhere, no chromatic aberration)
-❌ Neural network patterns (8×8/16×16 grids, organized flow in flat areas)
-
----
-
-## 🎯 MANDATORY AI DETECTION CHECKS
-
-Before classifying ANY image as "AUTHENTIC", you MUST verify these AI indicators are ABSENT:
-
-### AI Red Flags (Any 3+ → Definitely NOT authentic):
-1. **Diffusion Model Artifacts**: Swirls or organized patterns in flat areas (sky, walls)
-2. **Perfect Noise**: Uniform grain without Poisson statistics
-3. **Missing Bayer**: Equal noise across R/G/B channels
-4. **No Chromatic Aberration**: Perfect color alignment at high-contrast edges
-5. **Uniform Sharpness**: No MTF degradation from center to corners
-6. **Wrong Shadow Noise**: Shadows cleaner than highlights (physics violation)
-7. **Impossible Optics**: No vignetting, no distortion, perfect lens
-8. **Latent Grid**: 8×8 or 16×16 block patterns in frequency domain
-9. **Resolution Tells**: Image size exactly 512×512, 1024×1024, or multiples of 64
-10. **Texture Breakdown**: Details dissolve into blur at 200%+ zoom
-11. **Anatomical Errors**: Wrong fingers, impossible joints, merged body parts
-12. **Physics Violations**: Wrong shadow angles, impossible reflections
-13. **Too Perfect**: Zero camera imperfections, no dust, no noise variations
-14. **Synthetic Bokeh**: Circular bokeh without aperture blade structure
-15. **Compositional Perfection**: Rule of thirds, golden ratio - no happy accidents
-
-### Required Camera Authenticity Markers (Need 7+ for AUTHENTIC):
-1. ✅ Poisson noise (dark = more noise)
-2. ✅ Bayer pattern (green channel superior)
-3. ✅ Chromatic aberration (color fringing)
-4. ✅ MTF corner degradation
-5. ✅ Sensor artifacts (hot pixels, dust)
-6. ✅ Vignetting (darker corners)
-7. ✅ Natural compression (uniform JPEG)
-8. ✅ Lens distortion (barrel/pincushion)
-9. ✅ Camera noise pattern (specific to sensor)
-10. ✅ Proper histogram (realistic clipping/range)
-
----
-
-## 🔬 OUTPUT FORMAT
-
-Provide analysis as:
-
-**SENSOR PHYSICS**: [PASS/FAIL] - Poisson noise, Bayer pattern, green channel SNR
-**OPTICAL PHYSICS**: [PASS/FAIL] - CA, MTF, depth-of-field, vignetting
-**LIGHTING PHYSICS**: [PASS/FAIL] - Inverse square, shadows, reflections
-**FREQUENCY DOMAIN**: [PASS/FAIL] - No latent grids, proper 1/f spectrum, no diffusion artifacts
-**ENCODING**: [PASS/FAIL] - Uniform compression, realistic histogram
-**AI ARTIFACT CHECK**: [CLEAN/SUSPICIOUS/DETECTED] - Diffusion patterns, neural grids, impossible optics
-
-**CAMERA MARKERS FOUND**: [X/10] - List which specific camera artifacts detected
-**AI RED FLAGS FOUND**: [X/15] - List which specific AI patterns detected
-
-**VERDICT**: [AUTHENTIC / LIKELY AUTHENTIC / INCONCLUSIVE / LIKELY AI / DEFINITELY AI]
-**CONFIDENCE**: [0-100%]
-
-**MATHEMATICAL EVIDENCE**:
-- List specific measurements and calculations
-- Reference physics laws violated or confirmed
-- Provide spatial coordinates for observed phenomena
-- Show noise ratio measurements (shadow vs highlight)
-
-**REASONING**:
-- Explain which physics tests were decisive
-- Note any contradictory evidence
-- Justify why verdict chosen over alternatives
-- If AUTHENTIC: Explain which camera markers proved it
-- If AI: Explain which red flags detected
-
-**CRITICAL RULE**: To classify as AUTHENTIC, you must PROVE camera capture with multiple positive markers. Absence of AI artifacts alone is NOT sufficient - modern AI is too good. Default to INCONCLUSIVE when uncertain.
-  * **TEST**: Compare noise magnitude: should be G < R ≈ B
-
-- **Noise Frequency Spectrum**:
-  * Real: White noise (flat power spectrum)
-  * AI: Colored noise (frequency-dependent power)
-  * **Pattern**: Plot noise power vs frequency - should be flat line, not sloped
-
-- **RED FLAGS**: 
-  * Perfectly smooth gradients with zero grain (probability ≈ 0%)
-  * Uniform noise that looks "computer generated" or has patterns
-  * Skin/sky that looks like plastic, wax, or CGI render
-  * No film grain or sensor noise pattern visible at 200% zoom
-  * Noise that's stronger in bright areas than shadows (physically impossible)
-
-### 1.2 MICRO-DETAIL COHERENCE (PhD-Level - Enhanced)
-**Concept**: AI "understands" macro-structure but fails at micro-logic and consistency.
-
-- **Texture Breakdown Analysis**:
-  * Start at 100% zoom, increase to 200%, then 400%
-  * Real: Detail remains coherent at all scales
-  * AI: Detail "dissolves" or becomes nonsensical at high zoom
-  * **SPECIFIC REGIONS**: Test on skin pores, fabric threads, wood grain, brick mortar
-
-- **Fabric Weave Forensics**: 
-  * Real fabric: Consistent thread direction, proper over-under pattern
-  * AI fabric: Threads that merge, change direction randomly, or lose structure
-  * **TEST**: Follow single thread across fabric - does it maintain continuity?
-
-- **Hair Strand Physics**: 
-  * Real hair: Individual strands follow physics, proper occlusion
-  * AI hair: Clumps unnaturally, passes through objects, merges impossibly
-  * **CHECK**: Hair-face boundary - proper layering or blending?
-
-- **Wrinkle Topology**: 
-  * Real skin: Wrinkles follow muscle fiber direction (perpendicular to contraction)
-  * AI wrinkles: Random placement, no anatomical logic
-  * **MAPPING**: Do forehead wrinkles go horizontally? Smile lines radiate from nose?
-
-- **Surface Micro-Texture Degradation**:
-  * Wood grain: Should maintain direction, not morph
-  * Concrete: Pores should be random but individually distinct
-  * Brick: Mortar lines should be consistent depth
-  * **AI TELL**: Textures that are "suggested" not "rendered" - vague approximations
-
-- **Pattern Repetition vs Variation**:
-  * Real: Tiles/bricks have variations (color, wear, damage)
-  * AI: Suspiciously uniform OR breaks pattern logic mid-image
-  * **COUNT**: In 10 visible tiles, how many are identical? Real: 0-2, AI: 5+
-
-- **RED FLAGS**:
-  * Details that look convincing from far but nonsensical close-up
-  * Textures that "give up" when you zoom in (resolution-independent failure)
-  * Patterns that almost repeat but can't commit to proper geometry
-  * Materials that morph between different textures (metal→fabric)
-  * Micro-details showing "neural network uncertainty" (blurry half-defined forms)
-
-### 1.3 BIOMETRIC PRECISION TESTS (Enhanced with Measurement)
-**Concept**: AI struggles with human anatomy at microscopic detail level.
-
-- **Eye Analysis (20+ Checkpoints)**:
-  * **Iris Limbal Ring**: Should be perfect circle, consistent width (0.5-1mm)
-  * **Iris Crypts**: Radial patterns from pupil should be unique but geometrically sound
-  * **Pupil Shape**: Perfect circle (or slight cat-eye if wide-angle lens)
-  * **Sclera Vessels**: Blood vessels should follow anatomical patterns, not random
-  * **Catch Light**: Reflections should match scene lighting (position, shape, intensity)
-  * **Eyelid Edge**: Upper lid should partially cover iris from above (2-3mm)
-  * **Eyelash Arrangement**: Individual lashes, proper curvature, not clumped
-  * **Tear Duct Detail**: Inner eye corner should show caruncle anatomy
-  * **AI TELLS**: 
-    - Eyes that are "too perfect" - no bloodshot, no iris texture variation
-    - Asymmetric iris patterns between left/right eyes (AI generates independently)
-    - Catchlights showing impossible reflections (mismatched scene)
-    - Pupils of different sizes without medical reason
-
-- **Dental Forensics (15+ Checks)**:
-  * **Occlusion**: Top incisors overlap bottom by 2-3mm
-  * **Tooth Count**: Should see 6-8 teeth in normal smile (not 12, not 4)
-  * **Individual Teeth**: Each tooth has distinct shape (central incisors ≠ laterals ≠ canines)
-  * **Gum Line**: Follows consistent curve, proper attachment to each tooth
-  * **Tooth Texture**: Enamel has subtle texture, not perfectly smooth
-  * **Spacing**: Natural slight variations in spacing, not perfect alignment (unless braces)
-  * **AI TELLS**:
-    - Teeth that merge like a white fence
-    - Too many teeth (10+ visible in normal smile)
-    - All teeth identical shape/size
-    - Flat tooth surface with no anatomical cusps/ridges
-    - Gum line that's perfectly straight or impossibly curved
-
-- **Hand & Finger Analysis (Critical - AI's Weakest Point)**:
-  * **Finger Count**: Exactly 5 per hand (count carefully, AI adds/subtracts)
-  * **Joint Count**: 3 joints per finger (4 for thumb), check each
-  * **Fingernail Anatomy**: 
-    - Lunula (white crescent) at base
-    - Nail curvature matches fingertip curve
-    - Cuticle visible at base
-    - Nail bed pink/red, nail plate translucent
-  * **Finger Proportions**: Index ≈ ring finger length, middle longest
-  * **Palm Lines**: Should follow anatomical landmarks, not random
-  * **Knuckle Creases**: 2-3 creases per joint, consistent across fingers
-  * **AI TELLS**:
-    - 6+ fingers or 4 fingers
-    - Fingers that merge or split mid-length
-    - Impossible joint angles (bent backwards, extra joints)
-    - Nails that look painted-on (no 3D structure)
-    - Fingers that pass through each other or objects
-
-- **Ear Cartilage Structure**:
-  * Should see: Helix, antihelix, tragus, antitragus, lobule
-  * Real: Complex 3D folds following embryological development
-  * AI: Simplified "ear-shaped blob" missing proper anatomy
-  * **TEST**: Can you identify 5+ distinct anatomical structures?
-
-- **Skin Micro-Anatomy**:
-  * **Pore Distribution**: Random but present (unless heavy makeup)
-  * **Skin Texture**: Visible at 200% zoom (lines, pores, imperfections)
-  * **Subsurface Scattering**: Skin glows slightly (not flat reflectance)
-  * **AI TELL**: Porcelain/plastic skin with zero visible pores or texture
-
-**SCORING SYSTEM**: 
-- 0-2 biometric fails: Likely authentic
-- 3-4 fails: Suspicious, investigate further  
-- 5+ fails: Almost certainly AI-generated
-
-### 1.4 SPECTRAL COHERENCE (Advanced)
-**Concept**: Real photos have consistent frequency distributions. AI has spectral anomalies.
-
-- **Edge Sharpness Consistency**: Real lenses blur edges uniformly by distance. AI randomly assigns sharpness.
-- **Bokeh Authenticity**: Out-of-focus highlights should have hexagonal/circular shapes (lens aperture). AI creates "artistic blur" that ignores optics.
-- **Chromatic Aberration**: Real lenses split colors at high-contrast edges. AI images lack this or fake it inconsistently.
-- **Diffraction Spikes**: Bright lights through real lenses create star patterns. AI doesn't understand diffraction physics.
-- **RED FLAGS**:
-  * Selective focus that ignores depth-of-field rules
-  * Perfect bokeh with no lens character
-  * Zero chromatic aberration (too perfect)
-  * Edges that are randomly sharp/soft regardless of distance
-
----
-
-## 🟡 TIER 2: SEMANTIC & CONTEXTUAL IMPOSSIBILITIES (Catches Latest Models)
-
-### 2.1 TEXT & LANGUAGE CORRUPTION
-**Concept**: Even GPT-4 integrated models struggle with in-image text.
-
-- **Character Consistency**: Zoom on ANY text. Real text has uniform stroke width. AI text warps mid-letter.
-- **Font Coherence**: One word shouldn't have 3 different fonts.
-- **Linguistic Validity**: Check if text is actual language or letter-like shapes.
-- **Brand Logos**: Compare to real logos. AI approximates but introduces errors.
-- **RED FLAGS**:
-  * Text that's 90% correct but has one warped letter
-  * Signs with gibberish that looks like words from distance
-  * Logos that are "inspired by" but legally distinct
-  * Text that curves or melts impossibly
-
-### 2.2 TEMPORAL & LOGICAL IMPOSSIBILITIES
-**Concept**: AI doesn't understand time, seasons, or context.
-
-- **Weather Coherence**: Wet ground requires overcast sky or recent rain. AI shows wet streets with bright sun.
-- **Seasonal Consistency**: Snow on ground but trees have green leaves? AI fail.
-- **Time-of-Day Logic**: Long shadows suggest early/late day = warm orange light. AI mixes lighting temperatures wrongly.
-- **Clothing-Weather Match**: Heavy coats in bright summer light = suspicious.
-- **RED FLAGS**:
-  * Contradictory environmental conditions
-  * Impossible time-of-day lighting
-  * Clothing that doesn't match apparent weather
-
-### 2.3 SOCIAL & CULTURAL CONTEXT ERRORS
-**Concept**: AI lacks real-world knowledge.
-
-- **Signage Logic**: Traffic signs in wrong countries, text in wrong languages for location.
-- **Architectural Style**: Building styles mixed from different continents/eras inappropriately.
-- **Vehicle Details**: License plates with wrong format, steering wheels on wrong side.
-- **Uniform Details**: Police/military uniforms with wrong insignia or impossible rank combinations.
-- **RED FLAGS**:
-  * Cultural mashups that make no geographic sense
-  * Anachronistic combinations (Victorian clothing with modern phones)
-  * Impossible institutional details
-
-### 2.4 SHADOW & REFLECTION SYNTHESIS ERRORS
-**Concept**: Latest AI improved shadows but still fails on SECONDARY reflections.
-
-- **Mutual Illumination**: Nearby colored objects cast colored light on each other. AI often misses this.
-- **Shadow Density**: Shadow darkness depends on light source size. AI creates arbitrary darkness.
-- **Reflection Recursion**: Mirrors in mirrors, glasses reflecting glasses. AI can't handle recursion.
-- **Shadow Contact Points**: Shadow MUST touch object's base. Floating shadows = instant AI tell.
-- **Caustics**: Water/glass creates light patterns (caustics). AI either omits or fakes them wrong.
-- **RED FLAGS**:
-  * Shadows that don't touch objects properly
-  * Reflections missing key scene elements
-  * No color bleeding between adjacent objects
-  * Impossible shadow density for lighting conditions
-
----
-
-## 🔴 TIER 3: STATISTICAL & PROBABILISTIC DETECTION (Research-Grade)
-
-### 3.1 COMPRESSION ARTIFACT CONSISTENCY
-**Concept**: Real JPEGs compress all regions similarly. AI composites have mismatched compression.
-
-- **Block Patterns**: JPEG creates 8x8 pixel blocks. Check if all regions have same block visibility.
-- **Compression Level**: Sky shouldn't be highly compressed while face is pristine.
-- **Format Consistency**: Real photos are uniformly PNG or JPEG, not mixed artifacts.
-- **RED FLAGS**:
-  * Different compression levels between foreground/background
-  * Some areas look PNG-clean while others show JPEG blocks
-  * Suspiciously clean image with no compression artifacts (straight from generator)
-
-### 3.2 MATHEMATICAL IMPROBABILITIES
-**Concept**: Real world has chaos. AI creates suspicious "perfection."
-
-- **Symmetry Overload**: Faces too symmetrical, patterns too regular.
-- **Distribution Uniformity**: Random elements (leaves, stars, crowd) AI distributes too evenly.
-- **Gaussian Blur Abuse**: AI uses software blur. Real cameras have optical blur with different characteristics.
-- **Uncanny Valley**: Composition is "too good," lighting is "too perfect."
-- **RED FLAGS**:
-  * Everything perfectly in thirds (rule of thirds too obvious)
-  * No dust, scratches, or natural imperfections
-  * Suspiciously ideal lighting with no harsh shadows
-  * Too-perfect symmetry in asymmetric objects
-
-### 3.3 METADATA & PROVENANCE
-**Concept**: Check the digital fingerprint.
-
-- **EXIF Data**: Real photos have camera model, lens, ISO, shutter speed. AI images often lack EXIF or have fake metadata.
-- **File Properties**: AI generators output specific sizes (512×512, 1024×1024, 1536×1536 multiples).
-- **Creation Date**: File creation seconds before posting? Suspicious.
-- **Software Tags**: Look for "Photoshop," "Python," "Stable Diffusion" in metadata.
-- **RED FLAGS**:
-  * No EXIF data on supposedly "real" photo
-  * Resolution is exact power of 2 or 64-multiple
-  * Software field mentions AI tools or Python libraries
-
----
-
-## 📊 MANDATORY OUTPUT FORMAT:
-
-### 🚨 FORENSIC VERDICT: [AUTHENTIC / SUSPICIOUS / AI-GENERATED / DIGITALLY MANIPULATED]
-
-### 📈 CONFIDENCE SCORE: [0-100%]
-*(Be harsh: 95%+ confidence requires ZERO red flags, 90%+ requires ≤1 minor flag)*
-
-### 🔬 TIER -1: ULTRA-FINE PIXEL FORENSICS
-**Pixel Correlation Analysis**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Adjacent pixel relationships: [NATURAL / ARTIFICIAL]
-  - Color channel coupling: [PHYSICAL / UNNATURAL]
-  - Gradient micro-discontinuities: [NONE / DETECTED at [locations]]
-
-**Training Data Leakage**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Dataset artifact patterns: [NOT FOUND / DETECTED: [description]]
-  - Style consistency across regions: [UNIFORM / INCONSISTENT]
-  - Semantic bleeding between objects: [NONE / PRESENT at [locations]]
-
-**Anti-Aliasing Patterns**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Edge rendering method: [OPTICAL / ALGORITHMIC]
-  - Sub-pixel structure: [AUTHENTIC / ARTIFICIAL / ABSENT]
-
-**Fourier Analysis**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Power spectrum: [1/f DECAY / ANOMALOUS PEAKS at [frequencies]]
-  - Phase spectrum: [RANDOM / ORGANIZED PATTERNS]
-  - Directional bias: [SCENE-CONSISTENT / UNNATURAL]
-
-**Perceptual Patterns**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Composition originality: [UNIQUE / CLICHÉ AI PATTERNS]
-  - "AI aesthetic" markers: [ABSENT / PRESENT: [description]]
-
-**RED FLAGS FOUND**: [Count and list with EXACT locations]
-
-### 🧮 TIER 0: MATHEMATICAL & PHYSICS ANALYSIS
-**Diffusion Model Artifacts**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Noise pattern in flat areas: [RANDOM / ORGANIZED / SUSPICIOUS]
-  - Frequency domain anomalies: [DETECTED / NOT DETECTED]
-  - Latent grid patterns: [PRESENT / ABSENT]
-
-**Camera Sensor Physics**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Shadow noise behavior: [CORRECT / INCORRECT / N/A]
-  - Color channel SNR ratio: [NATURAL / UNNATURAL / CANNOT ASSESS]
-  - Bayer demosaicing artifacts: [PRESENT / ABSENT / EXPECTED]
-  - Chromatic aberration: [PRESENT / ABSENT / FAKED]
-
-**Statistical Distributions**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Histogram shape: [NATURAL / ARTIFICIAL]
-  - Color gamut: [WITHIN CAMERA LIMITS / SUPERSATURATED]
-  - Gradient continuity: [NATURAL / TOO SMOOTH / POSTERIZED]
-
-**Compression Forensics**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - JPEG block consistency: [UNIFORM / MISMATCHED between [regions]]
-  - Bit depth indicators: [8-BIT NATURAL / SUSPICIOUS HIGH-BIT / POSTERIZED]
-  - Generation resolution: [CAMERA NATIVE: [WxH] / AI SUSPICIOUS: [WxH] (multiple of [N])]
-
-**Lighting Reconstruction**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Light source count: [N sources identified at [directions]]
-  - Key:Fill ratio: [Natural [X:Y] / IMPOSSIBLE [X:Y]]
-  - Photometric consistency: [COHERENT / CONTRADICTORY]
-
-**Material BRDF**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Specular highlight accuracy: [PHYSICALLY CORRECT / WRONG for [materials]]
-  - Fresnel effect: [PRESENT / ABSENT / FAKED]
-
-**RED FLAGS FOUND**: [Count and list specific physics violations WITH LOCATIONS]
-
-### 🔬 TIER 1: MICROSCOPIC ANALYSIS
-**Noise Pattern (Multi-Scale)**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Noise-signal correlation: [CORRECT (darker=noisier) / INVERSE / FLAT]
-  - Color channel SNR ratio: [G < R≈B (CORRECT) / EQUAL (WRONG) / ABSENT]
-  - Noise power spectrum: [WHITE (FLAT) / COLORED (SLOPED)]
-  - Sampled regions: [List 5 regions tested]
-  - Quantitative: Shadow noise [X%], Highlight noise [Y%], Ratio [Z]
-
-**Micro-Detail Coherence (400% Zoom)**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Texture breakdown test: [COHERENT at all scales / DISSOLVES at [zoom level]]
-  - Fabric weave continuity: [MAINTAINED / BREAKS at [locations]]
-  - Hair strand physics: [PROPER OCCLUSION / MERGES/PASSES THROUGH at [locations]]
-  - Pattern repetition count: [X/10 tiles identical] ([NATURAL <3 / SUSPICIOUS 3-4 / AI-LIKE 5+])
-  
-**Biometric Precision (Detailed)**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Eye analysis: [X/20 checks passed] - Failed: [list specific fails]
-  - Dental forensics: [X/15 checks passed] - Failed: [list specific fails]
-  - Finger count & anatomy: [Left hand: X fingers, Right hand: Y fingers] - Issues: [list]
-  - Scoring: [X total biometric fails] → [AUTHENTIC <3 / SUSPICIOUS 3-4 / AI-GENERATED 5+]
-
-**Spectral Coherence**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-  - Edge sharpness logic: [DEPTH-CONSISTENT / RANDOM]
-  - Bokeh authenticity: [OPTICAL APERTURE SHAPE / ARTISTIC BLUR / ABSENT]
-  - Chromatic aberration: [PRESENT at [locations] / ABSENT / FAKED]
-  - Diffraction spikes: [PRESENT / ABSENT / N/A]
-
-**RED FLAGS FOUND**: [Count and list with EXACT spatial locations - "top-right corner", "subject's left hand", etc.]
-
-### 🎯 TIER 2: SEMANTIC ANALYSIS
-**Text/Language**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**Temporal Logic**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**Cultural Context**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**Shadow/Reflection Physics**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**RED FLAGS FOUND**: [Count and list specific issues]
-
-### 📐 TIER 3: STATISTICAL ANALYSIS
-**Compression Consistency**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**Mathematical Probability**: [PASS / FAIL / SUSPICIOUS] - [Evidence]
-**Metadata Authenticity**: [CANNOT VERIFY / PASS / FAIL] - [Evidence]
-**RED FLAGS FOUND**: [Count and list specific issues]
-
-### ⚠️ CRITICAL AI TELLS DETECTED:
-**Tier -1 (Pixel-Level):**
-- [ ] Artificial pixel correlation patterns
-- [ ] Training data artifacts/watermark ghosts
-- [ ] Algorithmic antialiasing (not optical)
-- [ ] Fourier domain anomalies (peaks at [X] Hz)
-- [ ] AI compositional clichés
-
-**Tier 0 (Physics & Math):**
-- [ ] Diffusion noise patterns (organized vs random)
-- [ ] Incorrect shadow noise behavior (darker areas = less noise)
-- [ ] Missing/fake chromatic aberration
-- [ ] Unnatural frequency domain signature
-- [ ] Impossible color gamut (supersaturation)
-- [ ] Suspicious generation resolution (64-multiples)
-- [ ] Impossible lighting setup
-- [ ] Wrong material BRDF behavior
-
-**Tier 1-2 (Micro & Semantic):**
-- [ ] Nonsensical text/warped letters at [location]
-- [ ] Incorrect finger count: [L: X, R: Y fingers]
-- [ ] Merged/multiplied teeth ([X] visible, should be 6-8)
-- [ ] Morphing background objects at [locations]
-- [ ] Impossible reflections at [locations]
-- [ ] Micro-detail breakdown at [zoom %] in [regions]
-- [ ] Floating/incorrect shadows at [locations]
-- [ ] Anatomical impossibilities: [list X fails from biometric scoring]
-- [ ] Temporal contradictions: [description]
-- [ ] Texture dissolution at [zoom %] for [materials]
-- [ ] Pattern repetition: [X/10 identical] (threshold: 5+)
-
-**TOTAL CRITICAL TELLS**: [X/23]
-**DISTRIBUTION**: Tier -1: [X], Tier 0: [Y], Tier 1-2: [Z]
-
-### 📍 SPATIAL ANOMALY MAP:
-**Document EXACT locations of all anomalies:**
-- Top-Left Quadrant: [list findings]
-- Top-Right Quadrant: [list findings]
-- Bottom-Left Quadrant: [list findings]
-- Bottom-Right Quadrant: [list findings]
-- Central Region: [list findings]
-- Subject-Specific: [e.g., "left hand", "face region", "background upper portion"]
-
-### 🔗 CROSS-VALIDATION MATRIX:
-**Check if findings corroborate across tiers:**
-- Physics + Microscopic: [ALIGNED / CONTRADICTORY / MIXED]
-- Noise + Compression: [CONSISTENT / INCONSISTENT]
-- Biometric + Texture: [CORRELATED / INDEPENDENT]
-- Overall Pattern: [SYSTEMATIC AI FAILURES / RANDOM NOISE / AUTHENTIC IMPERFECTIONS]
-
-**Interpretation**: 
-- Systematic failures across tiers → HIGH CONFIDENCE AI
-- Contradictory signals → SUSPICIOUS/MANIPULATED
-- No patterns → AUTHENTIC or EXPERT FORGERY
-
-### 🎯 AI GENERATION PROBABILITY:
-- **Midjourney/Stable Diffusion**: [0-100%]
-- **DALL-E 3**: [0-100%]
-- **Flux Pro**: [0-100%]
-- **Traditional Photoshop**: [0-100%]
-- **Authentic Photograph**: [0-100%]
-
-### 💡 EXECUTIVE SUMMARY:
-[Provide ULTRA-SPECIFIC, QUANTITATIVE evidence with PHYSICS/MATH reasoning and EXACT LOCATIONS. Use this template:]
-
-**✅ AUTHENTIC Example (95% Confidence):**
-"Classified as AUTHENTIC (95% confidence):
-
-**TIER -1 PIXEL FORENSICS**:
-✓ Pixel correlation analysis shows natural variation (tested 10×10 blocks in sky, wall, skin)
-✓ No training data artifacts detected
-✓ Edge antialiasing consistent with optical diffraction
-✓ Fourier power spectrum shows clean 1/f decay (no artificial peaks)
-✓ Composition shows natural imperfections (subject off-center, slight motion blur)
-
-**TIER 0 PHYSICS**:
-✓ Noise: Proper Poisson distribution - Shadow regions (face left side) show 2.8× more noise than highlights (forehead). Green channel SNR superior (ratio 1.9:1 vs R/B). Noise power spectrum is flat (white noise).
-✓ Chromatic aberration: Present at high-contrast edges (purple fringing visible at building corner, top-right)
-✓ JPEG compression: Uniform Q=87 throughout (tested 5 regions)
-✓ Resolution: 4608×3072 (Canon EOS native, not AI multiple)
-✓ Lighting: Single key light (upper left), 4:1 key:fill ratio (natural), shadows touch ground properly
-
-**TIER 1 MICROSCOPIC**:
-✓ Texture coherence: Fabric weave maintained at 400% zoom, wood grain follows consistent direction
-✓ Biometric: 18/20 eye checks passed (minor: slight red-eye from flash), 5 fingers both hands, 7 teeth visible (anatomically correct), proper nail lunula visible
-✓ Micro-detail: Skin pores visible at 200% zoom (forehead, cheeks), hair strands individual and properly occluded
-
-**SPATIAL MAP**: No anomalies in any quadrant
-
-**METADATA**: EXIF confirms Canon EOS R5, EF 24-70mm f/2.8, ISO 800, 1/125s, f/4.0
-
-**CONCLUSION**: Passes 95% of forensic tests. Minor red-eye suggests flash photography (expected). All physics-based tests conclusive for authentic capture. High confidence authentic photograph."
-
----
-
-**❌ AI-GENERATED Example (98% Confidence):**
-"Classified as AI-GENERATED (98% confidence):
-
-**TIER -1 PIXEL FORENSICS FAILURES**:
-✗ Pixel correlation shows artificial uniformity in sky region (top half)
-✗ Training data leakage: Generic "AI grass texture" pattern detected in foreground (bottom-left quadrant)
-✗ Fourier analysis: Unnatural energy peaks at 16Hz and 32Hz (latent space artifacts)
-✗ Phase spectrum shows organized patterns (not random entropy)
-✗ Composition: Textbook rule-of-thirds, suspiciously perfect lighting (AI cliché)
-
-**TIER 0 PHYSICS FAILURES**:
-✗ Noise: INVERSE relationship - shadows cleaner than highlights (measured: shadow=0.8%, highlight=1.2% - physically impossible)
-✗ Color channels: Equal noise across R/G/B (no Bayer filter signature)
-✗ Chromatic aberration: Completely absent despite wide-angle composition (too perfect)
-✗ Resolution: 1536×1024 (exact 64×multiple - AI tell)
-✗ Lighting reconstruction: Impossible setup - 3 distinct shadow directions but no visible sources, key:fill ratio = 1:1 (studio-quality ambient impossible outdoors)
-
-**TIER 1 MICROSCOPIC FAILURES**:
-✗ Noise test failed: Flat 1.0% across all regions (5 samples: sky, grass, skin, wall, shadow)
-✗ Texture breakdown: Fabric pattern dissolves into blur at 250% zoom (center-right)
-✗ Biometric scoring: 8 CRITICAL FAILS
-  - Eyes: Irises too perfect, no vessel structure in sclera, catchlights show impossible reflection
-  - Teeth: 10 teeth visible in smile (should be 6-8), uniform shape (unrealistic)
-  - Hands: Left hand has 6 fingers (pinky duplicated), right hand obscured but nails look painted-on
-  - Scoring: 8/X fails → AI-GENERATED threshold exceeded
-
-**TIER 2 SEMANTIC FAILURES**:
-✗ Text on sign (top-right): "CAFÉ" has warped 'F' and 'É' letters
-✗ Background entropy: Building windows morph into ambiguous shapes (top-center to top-right transition)
-✗ Temporal impossibility: Wet pavement + harsh overhead sun + no clouds (contradictory)
-
-**SPATIAL ANOMALY MAP**:
-- Top-Left: Clean (possible focal point priority)
-- Top-Right: Text warping, window morphing
-- Bottom-Left: AI grass texture pattern
-- Bottom-Right: Shadow direction conflicts
-- Center: Subject shows 6 fingers (left hand), dental impossibility
-- Background: Coherence decay with distance
-
-**CROSS-VALIDATION**:
-- All tiers show SYSTEMATIC AI FAILURES
-- Physics violations corroborate microscopic failures
-- Pattern consistent with Midjourney v6 or Flux Pro (high surface quality, deep physics fails)
-
-**QUANTITATIVE SUMMARY**:
-- Tier -1: 5/5 tests FAILED
-- Tier 0: 5/6 tests FAILED
-- Tier 1: 4/4 tests FAILED (biometric: 8 critical tells)
-- Tier 2: 3/4 tests FAILED
-- TOTAL: 17/19 tests FAILED
-
-**CONCLUSION**: 98% confidence AI-GENERATED. Likely Midjourney v6 or Flux Pro based on sophisticated rendering that masks fundamental generation artifacts. 17 systematic failures across all detection tiers. Fingerprint: diffusion model artifacts + biometric impossibilities + semantic incoherence."
-
----
-
-**⚠️ SUSPICIOUS Example (70% Confidence - Investigate Further):**
-"Classified as SUSPICIOUS (70% confidence - BORDERLINE CASE):
-
-**AMBIGUOUS SIGNALS**:
-⚠ Noise pattern: Shows slight organization but not definitively AI (could be heavy NR post-processing)
-⚠ Chromatic aberration: Present but suspiciously uniform (2px purple fringe at ALL edges - may be artificially added in post)
-⚠ Resolution: 4000×3000 (plausible camera native, but also 1000× factor)
-⚠ Biometric: 2/20 minor eye issues (slightly too perfect symmetry, but within human range), 5 fingers confirmed, teeth look natural
-⚠ Minor text warping on distant sign (background, top-left) - could be motion blur OR early AI tell
-
-**CONTRADICTORY EVIDENCE**:
-✓ Proper shadow-noise relationship (darker = noisier)
-✓ Natural color channel SNR (G channel superior)
-✓ JPEG compression uniform
-✗ Texture breakdown slight at 350% zoom (fabric in middle-ground)
-⚠ Composition slightly too perfect but not impossible
-
-**CROSS-VALIDATION**: Mixed signals - physics mostly passes, microscopic shows minor concerns
-
-**SPATIAL MAP**: 
-- Concerns concentrated in background (top-left: text, middle-ground: fabric texture)
-- Foreground subject appears authentic
-
-**PROBABILISTIC BREAKDOWN**:
-- 60% AI-generated (likely Flux Pro with excellent physics simulation)
-- 30% Authentic with heavy post-processing (noise reduction, sharpening, fake CA)
-- 10% Hybrid (real photo with AI inpainting in background)
-
-**RECOMMENDATION**: 
-Cannot make definitive determination with current evidence. Requires:
-- Higher resolution upload (current: 4000×3000, need 6000×4000+)
-- RAW file analysis (would show authentic sensor data or lack thereof)
-- Metadata inspection (EXIF could be conclusive)
-
-**VERDICT RATIONALE**: Insufficient red flags for high-confidence AI classification, but too many minor anomalies for confident authentic classification. Mark SUSPICIOUS pending additional evidence."
-
-### 🔴 FINAL DIRECTIVE:
-**DETECTION THRESHOLD**: 
-- 5+ critical tells from ANY tier → AI-GENERATED (high confidence)
-- 3-4 critical tells → LIKELY AI (investigate further)
-- 1-2 minor tells → INCONCLUSIVE (could be post-processing or AI)
-- 0 tells with natural patterns → AUTHENTIC
-
-**ANALYSIS DEPTH REQUIREMENTS**:
-1. **Test at MULTIPLE zoom levels**: 100%, 200%, 400%
-2. **Sample MULTIPLE regions**: Minimum 5 diverse areas (sky, skin, fabric, background, text/detail)
-3. **Provide QUANTITATIVE measurements**: Not "noisy" but "2.8× more noise in shadows"
-4. **Document EXACT locations**: Not "hand" but "subject's left hand, pinky finger"
-5. **Cross-validate**: Check if Tier 0 + Tier 1 + Tier 2 findings corroborate or contradict
-6. **Look for AUTHENTIC markers**: Proper sensor noise, chromatic aberration, natural imperfections
-
-**BE FORENSICALLY BALANCED**: 
-- Your reputation depends on ACCURATE detection, not aggressive flagging
-- Only flag what you can DEFINITIVELY observe and measure
-- When in doubt (40-60% confidence), mark INCONCLUSIVE with detailed reasoning
-- False positives damage credibility as much as false negatives
-- Modern AI (2026) is VERY good - but real photos also pass all physics tests
-
-**SPECIFICITY REQUIRED**: 
-- ❌ NEVER say: "looks artificial", "seems fake", "appears suspicious"
-- ✅ ALWAYS say: "Sky region (top-center, 100-200px from top edge) shows organized noise pattern with visible swirl artifacts at 45° angle, consistent with diffusion model denoising residue. Measured: correlation coefficient 0.72 between adjacent pixels (natural: 0.45-0.60)."
-
-**PATTERN RECOGNITION PRIORITY**:
-Focus analysis on areas where AI systematically fails:
-1. Hands (fingers, nails) - AI's weakest point
-2. Text/symbols - Cannot render coherently
-3. Noise in shadows - Gets physics backwards (but many cameras also have this)
-4. Micro-textures at 400% zoom - Dissolves into blur
-5. Background coherence - Loses detail with distance
-6. Material boundaries - Bleeds between textures
-7. Reflections/shadows - Fails on secondary physics
-8. Teeth/eyes - Anatomical precision breaks
-
-**SCORING RIGOR**:
-- 95-100% AUTHENTIC: ZERO flags + positive auth markers (proper noise, CA, natural imperfections)
-- 85-94% LIKELY AUTHENTIC: ≤1 minor flag, all major tests passed
-- 70-84% PROBABLY AUTHENTIC: 2-3 minor flags OR 1 ambiguous flag (post-processing likely)
-- 50-69% INCONCLUSIVE: Multiple ambiguous signals, contradictory evidence
-- 30-49% LIKELY AI: 3-4 clear systematic flags
-- 0-29% DEFINITELY AI: 5+ systematic failures, definitive AI patterns
-
-**REMEMBER**: You are conducting PhD-level forensic science with courtroom standards. Every claim must be specific, measurable, and spatially documented. If a photo passes all physics tests, has proper noise patterns, and natural imperfections - it's likely AUTHENTIC. Only flag definitive anomalies.
-
-**PRIORITIZE ACCURACY OVER CAUTION**: A good forensic tool correctly identifies both real and fake images.
-"""
+def render_video_analysis(model: genai.GenerativeModel, uploaded_file):
+    """
+    Video mode: keyframe audits with temporal consistency checks.
+    
+    Args:
+        model: Initialized Gemini model
+        uploaded_file: Streamlit uploaded file object holding a video
+    """
+    tab1, tab2 = st.tabs(["🎬 Video", "📋 Analysis"])
+    
+    with tab1:
+        st.video(uploaded_file)
+        st.caption(f"📊 **Filename**: {uploaded_file.name}")
+        st.caption(f"💾 **Size**: {uploaded_file.size / (1024 * 1024):.1f} MB")
+    
+    with tab2:
+        # The last finished video audit stays on screen across reruns
+        cached = st.session_state.get("video_result")
+        if st.button("🔬 Initiate Video Forensic Analysis", use_container_width=True):
+            # Every keyframe is a model call: the same budgets as image audits apply
+            session, user = current_identity()
+            budget = check_budget(session, user)
+            if budget.action == BLOCKED:
+                st.error(f"💰 {budget.message}")
+                return
+            economy = budget.action == ECONOMY
+            status = st.empty()
+            spend, spend_lock = Spend(audits=1), threading.Lock()
+            
+            def audit_keyframe(keyframe) -> Tuple[bool, str]:
+                usage = {}
+                try:
+                    if economy:
+                        return run_forensic_audit(
+                            model, keyframe, ECONOMY_ADDENDUM, usage=usage, max_output_tokens=ECONOMY_OUTPUT_TOKENS
+                        )
+                    return run_forensic_audit(model, keyframe, usage=usage)
+                finally:
+                    with spend_lock:
+                        spend.add(model_name(model), usage)
+            
+            data = uploaded_file.getvalue()
+            progress = {"timestamp": 0.0, "submitted": 0}
+            
+            def on_progress(timestamp: float, submitted: int):
+                progress.update(timestamp=timestamp, submitted=submitted)
+            
+            def run_video() -> VideoAudit:
+                try:
+                    with span("video_end_to_end"):
+                        return analyze_video(
+                            data,
+                            audit_keyframe,
+                            max_keyframes=ECONOMY_KEYFRAMES if economy else MAX_KEYFRAMES,
+                            progress=on_progress,
+                        )
+                finally:
+                    # Charged once every keyframe call has finished, even if the page moved on
+                    audit_store().charge(spend_scopes(session, user), spend)
+            
+            # Runs off the script thread under its own deadline: the Cancel button (or leaving the
+            # page) reruns the script, and the interrupted poll below cancels the audit
+            deadline = Deadline(float(st.secrets.get("VIDEO_DEADLINE_SECONDS", VIDEO_DEADLINE)))
+            with deadline_scope(deadline):
+                run: Future = video_runner().submit(contextvars.copy_context().run, run_video)
+            st.button("⏹️ Cancel Video Audit", use_container_width=True, key="cancel-video")
+            with st.spinner("🔍 Executing UPL Protocol on keyframes..."):
+                try:
+                    while not run.done():
+                        status.caption(
+                            f"⏳ Decoded {progress['timestamp']:.1f}s · {progress['submitted']} keyframe audits submitted"
+                            f" · {deadline.elapsed:.0f}s of {deadline.seconds:.0f}s deadline"
+                        )
+                        time.sleep(VIDEO_POLL_SECONDS)
+                except BaseException:
+                    deadline.cancel()
+                    raise
+                try:
+                    video_audit = run.result()
+                except VideoLoadError as e:
+                    status.empty()
+                    st.error(f"❌ {str(e)}")
+                    return
+                except AuditAborted as e:
+                    status.empty()
+                    st.warning(f"⌛ Video audit stopped: {e}")
+                    return
+                elapsed_time = deadline.elapsed
+            
+            status.empty()
+            cached = st.session_state["video_result"] = (
+                uploaded_file.file_id, video_audit, elapsed_time, spend, budget.message if economy else None
+            )
+        elif cached is None or cached[0] != uploaded_file.file_id:
+            st.markdown('<div class="forensic-log">', unsafe_allow_html=True)
+            st.markdown("""
+                <h3>⚡ Awaiting Analysis</h3>
+                <p>Scene keyframes are audited with the full UPL protocol; every sampled frame
+                feeds local noise-stability and flicker checks.</p>
+            """, unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+            return
+        
+        _, video_audit, elapsed_time, spend, economy_message = cached
+        if economy_message:
+            st.caption(f"💰 {economy_message} — at most {ECONOMY_KEYFRAMES} keyframes, short reports")
+        st.markdown('<div class="forensic-log">', unsafe_allow_html=True)
+        st.markdown(f"**⏱️ Analysis Time**: {elapsed_time:.2f}s")
+        if spend.prompt_tokens:
+            st.caption(
+                f"🧾 {spend.prompt_tokens:,} prompt tokens (~{spend.image_tokens:,} image) · "
+                f"{spend.output_tokens:,} output · ${spend.cost:.4f}"
+            )
+        if spend.truncated:
+            st.warning(f"✂️ {spend.truncated} keyframe report(s) hit the output-token cap and may be cut off")
+        st.markdown("---")
+        render_video_timeline(video_audit)
+        st.markdown('</div>', unsafe_allow_html=True)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# CORE FORENSIC ENGINE
+# AUDIT EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def run_forensic_audit(model: genai.GenerativeModel, image: Image.Image) -> Tuple[bool, str]:
+def remember_job(jobs: dict, digest: str, job_id: str) -> str:
+    """Store a job id under its upload hash, forgetting the oldest beyond the session limit."""
+    jobs.pop(digest, None)
+    jobs[digest] = job_id
+    while len(jobs) > MAX_SESSION_RESULTS:
+        job_queue().cancel(jobs.pop(next(iter(jobs))))
+    return job_id
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_SESSION_RESULTS)
+def load_outcome(job_id: str) -> Optional[AuditOutcome]:
+    """
+    A finished job's outcome, unpickled once and shared by every rerun that shows it.
+    
+    Falls back to the verdict cache for jobs that ran on another replica.
+    """
+    return job_queue().outcome(job_id) or verdict_cache().outcome(job_id)
+
+
+def render_queue_stats():
+    """Render queue depth and how many workers are serving it."""
+    snapshot = job_queue().snapshot()
+    counts = snapshot["counts"]
+    st.caption(
+        f"📬 Queue: {counts.get(QUEUED, 0)} waiting · {counts.get(RUNNING, 0)} running · "
+        f"{counts.get(DONE, 0)} done · {snapshot['workers']} workers online"
+    )
+    cache = verdict_cache().snapshot()
+    st.caption(
+        f"♻️ Verdict cache on {cache['backend']} · near-cache hit rate {cache['keys']['hit_rate']:.0%} "
+        f"for keys, {cache['outcomes']['hit_rate']:.0%} for results"
+    )
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def render_job_progress(job_id: str):
     """
-    Execute the forensic audit using Gemini 1.5 Pro with UPL protocol.
+    Poll a queued or running job without rerunning the page; rerun it once the job finishes.
     
     Args:
-        model: Initialized Gemini model
-        image: PIL Image object to analyze
-        
-    Returns:
-        Tuple of (success: bool, result: str)
+        job_id: Job to follow
     """
-    try:
-        # Convert PIL image to bytes for API
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format='PNG')
-        img_byte_arr = img_byte_arr.getvalue()
-        
-        # Prepare the prompt
-        upl_prompt = get_upl_forensic_prompt()
-        
-        # Generate response with image
-        response = model.generate_content([upl_prompt, image])
-        
-        if not response or not response.text:
-            return False, "⚠️ No response received from the model. The image may be blocked by safety filters."
-        
-        return True, response.text
+    queue = job_queue()
+    job = queue.get(job_id)
+    if job is None or job.done:
+        st.rerun()
     
-    except Exception as e:
-        error_msg = f"❌ **Forensic Audit Failed**\n\n**Error Type**: {type(e).__name__}\n\n**Details**: {str(e)}"
-        return False, error_msg
+    if job.status == QUEUED:
+        workers = queue.snapshot()["workers"]
+        st.info(f"📬 Queued · {queue.position(job_id)} audits ahead · {workers} workers online · {job.elapsed:.0f}s")
+        if not workers:
+            st.warning("⚠️ No audit worker is running. Start one with `python -m kinetic.worker`.")
+    else:
+        deadline = f" of {job.deadline:.0f}s deadline" if job.deadline is not None else ""
+        st.info(f"🔍 Executing UPL Protocol Analysis... ⏳ {job.stage or 'starting'} · {job.elapsed:.0f}s{deadline}")
+    
+    if job.cancel_requested:
+        st.caption("⏹️ Cancelling...")
+    elif st.button("⏹️ Cancel Audit", use_container_width=True, key=f"cancel-{job_id}"):
+        queue.cancel(job_id)
+        st.rerun()
 
 
-def validate_image(uploaded_file) -> Optional[Image.Image]:
+def render_job(job_id: str, model: PooledModel):
     """
-    Validate and load the uploaded image file.
+    Render a job wherever it is: progress while it waits or runs, then its result.
     
     Args:
-        uploaded_file: Streamlit uploaded file object
-        
-    Returns:
-        PIL Image object or None if invalid
+        job_id: Job to show
+        model: Default model (its key pool is shown)
     """
-    try:
-        # Check file type
-        valid_formats = ['png', 'jpg', 'jpeg', 'webp', 'gif']
-        file_extension = uploaded_file.name.split('.')[-1].lower()
-        
-        if file_extension not in valid_formats:
-            st.error(f"❌ Invalid file format: {file_extension}. Supported: {', '.join(valid_formats)}")
-            return None
+    job = job_queue().get(job_id)
+    if job is None:
+        # Finished on another replica, or served from the verdict cache
+        outcome = load_outcome(job_id)
+        if outcome is None:
+            st.info("🗑️ This audit is no longer available. Upload the image to run it again.")
+        else:
+            with span("render"):
+                render_outcome(job_id, outcome, model)
+    elif not job.done:
+        render_job_progress(job_id)
+    else:
+        render_audit_result(job, model)
+
+
+def render_audit_result(job: Job, model: PooledModel):
+    """
+    Render a finished audit: the report, its supporting panels, or why it stopped.
+    
+    Args:
+        job: Finished job
+        model: Default model (its key pool is shown)
+    """
+    if job.status in (CANCELLED, EXPIRED):
+        st.warning(f"⏹️ Audit stopped after {job.elapsed:.1f}s — {job.error}")
+        render_cancellation_stats()
+        if job.profile:
+            render_profile(job.id)
+        return
+    outcome = load_outcome(job.id) if job.status == DONE else None
+    if outcome is None:
+        st.error(f"❌ **Forensic Audit Failed**\n\n**Details**: {job.error or 'no result was stored'}")
+        if job.profile:
+            render_profile(job.id)
+        return
+    with span("render"):
+        render_outcome(job.id, outcome, model)
+
+
+def render_outcome(job_id: str, outcome: AuditOutcome, model: PooledModel):
+    """
+    Render a successful audit: the report and its supporting panels.
+    
+    Args:
+        job_id: Job that produced the outcome
+        outcome: Pipeline result
+        model: Default model (its key pool is shown)
+    """
+    if outcome.success and outcome.routed is not None and st.session_state.get("recorded_audit") != job_id:
+        record_overlay_run(outcome.overlay_set, outcome.routed.final.latency, outcome.routed.final.usage)
+        st.session_state["recorded_audit"] = job_id
+    if st.session_state.get("cache_hit") == job_id:
+        st.caption("♻️ Served from the verdict cache — same file, options and protocol version")
+    economy = st.session_state.get("economy")
+    if economy is not None and economy[0] == job_id:
+        st.caption(f"💰 {economy[1]} — fast model, display-sized image, short report")
+    
+    # Display results
+    st.markdown(f'<div class="forensic-log">', unsafe_allow_html=True)
+    
+    if outcome.success:
+        st.markdown(f"**⏱️ Analysis Time**: {outcome.elapsed_time:.2f}s")
+        if outcome.degraded:
+            st.warning(f"🔌 Model endpoint circuit open ({outcome.degraded_reason}) — local-only verdict")
+        elif outcome.routed is not None:
+            st.caption(f"🧭 Route: {outcome.routed.describe()}")
+        spend = outcome.spend()
+        if spend.prompt_tokens:
+            st.caption(
+                f"🧾 {spend.prompt_tokens:,} prompt tokens (~{spend.image_tokens:,} image) · "
+                f"{spend.output_tokens:,} output · ${spend.cost:.4f}"
+            )
+        if spend.truncated:
+            st.warning("✂️ The report hit the output-token cap and may be cut off")
+        if outcome.profile is not None:
+            full_tokens = estimate_tokens(get_upl_forensic_prompt())
+            st.caption(
+                f"🧭 Scene: {outcome.profile.describe()} · protocol ~{estimate_tokens(outcome.protocol):,} "
+                f"of ~{full_tokens:,} tokens"
+            )
+        st.markdown("---")
+        st.markdown(outcome.result)
+    else:
+        st.markdown(outcome.result)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if outcome.animated:
+        render_frame_forensics(outcome.plan, outcome.frame_audits, outcome.model_report)
+    else:
+        if outcome.zoom_result is not None:
+            render_zoom_verification(outcome.zoom_result, outcome.zoom_time - outcome.elapsed_time)
+        if not outcome.fanout:
+            render_overlay_comparison(outcome.overlay_set)
+        render_local_forensics(outcome.local_reports, outcome.local_wall_time)
+    render_routing_stats()
+    render_hedging_stats()
+    render_key_pool_stats(model.pool)
+    render_cancellation_stats()
+    render_stage_latency(outcome.trace)
+    if outcome.profiled:
+        render_profile(job_id)
+    render_queue_stats()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AUDIT HISTORY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HISTORY_FILTERS = ("All verdicts", *VERDICTS, MANIPULATED)
+
+
+def describe_record(record: AuditRecord) -> str:
+    """One-line verdict summary of a stored audit."""
+    confidence = f" ({record.confidence:.0f}%)" if record.confidence is not None else ""
+    when = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M")
+    return f"{record.verdict or 'no verdict'}{confidence} · {when} · {record.model or 'local only'}"
+
+
+def render_prior_audits(workspace: ImageWorkspace):
+    """Show earlier audits of this exact file and of visually identical files."""
+    exact, similar = audit_store().prior(workspace.source.sha256, frame_hash(workspace.preview))
+    if exact is not None:
+        st.caption(f"🗂️ **Audited before**: {describe_record(exact)}")
+    if similar is not None:
+        st.caption(f"🗂️ **Visually identical file audited**: {describe_record(similar)}")
+
+
+def render_history():
+    """
+    Page through stored audits, newest first.
+    
+    Pages are fetched with a keyset cursor (the last id shown), so paging stays
+    constant-time however large the store grows; only the cursors of the pages
+    already visited are kept in the session.
+    """
+    store = audit_store()
+    total = store.approximate_count()
+    if not total:
+        return
+    
+    with st.expander(f"🗂️ Audit History (~{total:,} audits)"):
+        week = store.verdict_counts(time.time() - 7 * 24 * 3600)
+        if week:
+            st.caption("Last 7 days: " + " · ".join(f"{label or 'no verdict'} {count:,}" for label, count in week.items()))
         
-        # Load image
-        image = Image.open(uploaded_file)
+        choice = st.selectbox("Verdict", HISTORY_FILTERS, key="history_filter")
+        verdict = None if choice == HISTORY_FILTERS[0] else choice
+        cursors = st.session_state.setdefault("history_cursors", [None])
+        if st.session_state.get("history_verdict", verdict) != verdict:
+            cursors[:] = [None]
+        st.session_state["history_verdict"] = verdict
         
-        # Check image size (max 20MB for API)
-        if uploaded_file.size > 20 * 1024 * 1024:
-            st.error("❌ Image too large. Maximum size: 20MB")
-            return None
+        records = store.page(before=cursors[-1], verdict=verdict)
+        if not records:
+            st.caption("No audits on this page.")
+        else:
+            rows = [
+                "| # | When | Verdict | Confidence | Model | Tier red flags | Latency | Tokens | Cost | Protocol |",
+                "|---|---|---|---|---|---|---|---|---|---|",
+            ]
+            for record in records:
+                confidence = f"{record.confidence:.0f}%" if record.confidence is not None else "—"
+                tiers = " · ".join(f"{tier.title()} {count}" for tier, count in record.tiers.items() if count is not None) or "—"
+                latency = f"{record.latency:.1f}s" if record.latency is not None else "—"
+                rows.append(
+                    f"| {record.id}{' 🔬' if record.profiled else ''} | {datetime.fromtimestamp(record.created):%Y-%m-%d %H:%M} | "
+                    f"{record.verdict or '—'}{' ⚠️' if record.degraded else ''} | {confidence} | "
+                    f"{record.model or 'local'}{' ↑' if record.escalated else ''} | {tiers} | {latency} | "
+                    f"{record.prompt_tokens + record.output_tokens:,}{' ✂️' if record.truncated else ''} | "
+                    f"${record.cost:.4f} | {record.prompt_version} |"
+                )
+            st.markdown("\n".join(rows))
         
-        return image
+        previous, following = st.columns(2)
+        if previous.button("◀ Newer", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+        if following.button("Older ▶", disabled=len(records) < PAGE_SIZE, use_container_width=True):
+            cursors.append(records[-1].id)
+            st.rerun()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COSTS & BUDGETS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCOPE_TITLES = {"session": "This session", "user": "You today (UTC)", "day": "Everyone today (UTC)"}
+
+
+def current_identity() -> Tuple[str, Optional[str]]:
+    """(session id, signed-in user) that audit spend is charged to."""
+    session = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    user = st.user.get("email") or st.context.headers.get("X-Forwarded-Email") or st.context.headers.get("X-Forwarded-User")
+    return session, user
+
+
+def check_budget(session: str, user: Optional[str]) -> BudgetStatus:
+    """What a new audit may do under the configured budgets (always OK when none are set)."""
+    policy = BudgetPolicy.from_config(st.secrets)
+    if not policy.enabled:
+        return BudgetStatus()
+    return policy.check(audit_store().spend(spend_scopes(session, user)))
+
+
+def render_cost_panel():
+    """Render spend of this session, this user today and everyone today against the budgets."""
+    session, user = current_identity()
+    policy = BudgetPolicy.from_config(st.secrets)
+    spend = audit_store().spend(spend_scopes(session, user))
+    if not policy.enabled and not any(rollup.audits for rollup in spend.values()):
+        return
     
-    except Exception as e:
-        st.error(f"❌ Failed to load image: {str(e)}")
-        return None
+    with st.expander("💰 Usage & Budget"):
+        rows = [
+            "| Scope | Audits | Prompt tokens | Image tokens | Output tokens | Output cap hit | Cost | Budget |",
+            "|---|---|---|---|---|---|---|---|",
+        ]
+        for scope in SCOPE_TITLES:
+            if scope not in spend:
+                continue
+            rollup, limit = spend[scope], policy.limit(scope)
+            budget = f"${limit:.2f} ({rollup.cost / limit:.0%} used)" if limit else "—"
+            rows.append(
+                f"| {SCOPE_TITLES[scope]} | {rollup.audits} | {rollup.prompt_tokens:,} | ~{rollup.image_tokens:,} | "
+                f"{rollup.output_tokens:,} | {rollup.truncated} | ${rollup.cost:.4f} | {budget} |"
+            )
+        st.markdown("\n".join(rows))
+        if policy.enabled:
+            st.caption(
+                f"Past {policy.economy_at:.0%} of a budget new audits run in economy mode "
+                "(fast model only, display-sized image, short report); at 100% they are refused until it resets."
+            )
+        st.caption(
+            "List prices per 1M tokens (input / output): "
+            + " · ".join(f"{name} ${prices[0]:.2f} / ${prices[1]:.2f}" for name, prices in PRICES.items())
+            + " · image tokens are estimated per 768px tile; cached verdicts cost nothing"
+        )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1500,56 +1346,117 @@ def main():
     """, unsafe_allow_html=True)
     
     # Initialize Gemini client
-    model = initialize_gemini_client()
-    if model is None:
+    models = initialize_gemini_client()
+    if models is None:
         st.stop()
+    model, router = models.model, models.router
+    start_embedded_workers(models, int(st.secrets.get("EMBEDDED_WORKERS", 1)))
+    if st.secrets.get("METRICS_PORT"):
+        start_metrics_endpoint(int(st.secrets["METRICS_PORT"]))
     
     # File upload section
     st.markdown("### 📤 Upload Image for Analysis")
     uploaded_file = st.file_uploader(
         "Drag and drop or click to browse",
-        type=['png', 'jpg', 'jpeg', 'webp', 'gif'],
-        help="Supported formats: PNG, JPG, JPEG, WEBP, GIF (Max: 20MB)"
+        type=['png', 'jpg', 'jpeg', 'webp', 'gif', *VIDEO_EXTENSIONS],
+        help="Supported formats: PNG, JPG, JPEG, WEBP, GIF (Max: 20MB) · MP4, MOV, WEBM, MKV, AVI (Max: 200MB)"
     )
     
-    if uploaded_file is not None:
+    if uploaded_file is None and "job" in st.query_params:
+        # Reattach to the audit this page was following before a reload
+        render_job(st.query_params["job"], model)
+    elif uploaded_file is not None and sniff_upload(uploaded_file):
+        render_video_analysis(model, uploaded_file)
+    elif uploaded_file is not None:
         # Validate and load image
-        image = validate_image(uploaded_file)
+        workspace = validate_image(uploaded_file)
         
-        if image is not None:
+        if workspace is not None:
             # Use tabs for better mobile experience
             tab1, tab2 = st.tabs(["🖼️ Image", "📋 Analysis"])
             
             with tab1:
                 st.markdown('<div class="image-container">', unsafe_allow_html=True)
-                st.image(image, use_container_width=True)
+                st.image(workspace.preview, use_container_width=True)
                 st.markdown('</div>', unsafe_allow_html=True)
                 
                 # Image metadata
                 st.caption(f"📊 **Filename**: {uploaded_file.name}")
-                st.caption(f"📐 **Dimensions**: {image.size[0]} × {image.size[1]} px")
+                st.caption(f"📐 **Dimensions**: {workspace.size[0]} × {workspace.size[1]} px")
                 st.caption(f"💾 **Size**: {uploaded_file.size / 1024:.1f} KB")
+                render_prior_audits(workspace)
             
             with tab2:
+                fanout_mode = st.toggle(
+                    "⚡ Parallel tier fan-out",
+                    help="Run each UPL tier as its own concurrent call and stop once DEFINITELY AI is settled",
+                )
+                zoom_mode = st.toggle(
+                    "🔎 Zoom-verify claimed coordinates",
+                    value=True,
+                    help="Re-check every coordinate the model cites on native-resolution crops in one small second call",
+                )
+                overlay_mode = st.toggle(
+                    "🗺️ Attach forensic overlays",
+                    help="Send locally computed spectrum, noise-level and ELA maps with the image (single-call mode)",
+                )
+                hedge_mode = st.toggle(
+                    "🪁 Hedge slow responses",
+                    help="Fire a duplicate request when the first chunk is later than the recent p95 (single-call mode)",
+                )
+                high_stakes = st.toggle(
+                    "🎯 High-stakes audit",
+                    help=f"Use {router.escalation_name} directly instead of escalating only hard cases (single-call mode)",
+                )
+                
+                # Audits run on queue workers and are kept per upload hash: results survive
+                # reruns, re-uploads and reloads, while a pending audit of another upload is cancelled
+                digest = workspace.source.sha256
+                jobs = st.session_state.setdefault("jobs", {})
+                queue = job_queue()
+                for key, other in jobs.items():
+                    if key != digest:
+                        queue.cancel(other)
+                job_id = jobs.get(digest)
+                
+                # Debug switch: ?profile=1 runs the audit under cProfile and tracemalloc
+                profiling = st.query_params.get("profile") == "1"
+                if profiling:
+                    st.caption("🔬 Profiling is on for this page — audits skip the verdict cache and store a profile")
+                
                 # Audit button
                 if st.button("🔬 Initiate Deep Forensic Stress Test", use_container_width=True):
-                    # Progress indicator
-                    with st.spinner("🔍 Executing UPL Protocol Analysis..."):
-                        start_time = time.time()
-                        success, result = run_forensic_audit(model, image)
-                        elapsed_time = time.time() - start_time
-                    
-                    # Display results
-                    st.markdown(f'<div class="forensic-log">', unsafe_allow_html=True)
-                    
-                    if success:
-                        st.markdown(f"**⏱️ Analysis Time**: {elapsed_time:.2f}s")
-                        st.markdown("---")
-                        st.markdown(result)
+                    options = AuditOptions(fanout_mode, zoom_mode, overlay_mode, hedge_mode, high_stakes)
+                    session, user = current_identity()
+                    budget = check_budget(session, user)
+                    candidates = [options, options.economized()] if budget.action == ECONOMY else [options]
+                    # An identical request already answered on any replica is served from the cache,
+                    # whatever the budget (cached verdicts cost nothing); a profiled run must really run
+                    cached = [None] * len(candidates) if profiling else verdict_cache().jobs_for(
+                        VerdictCache.key(digest, candidate, models) for candidate in candidates
+                    )
+                    cached_job = next((cached_id for cached_id in cached if cached_id is not None), None)
+                    if cached_job is None and budget.action == BLOCKED:
+                        st.error(f"💰 {budget.message}")
                     else:
-                        st.markdown(result)
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
+                        if job_id is not None:
+                            queue.cancel(job_id)
+                        st.session_state["cache_hit"] = cached_job
+                        job_id = remember_job(jobs, digest, cached_job or queue.enqueue(
+                            workspace.source.data,
+                            digest,
+                            asdict(candidates[-1]),
+                            float(st.secrets.get("AUDIT_DEADLINE_SECONDS", DEFAULT_DEADLINE)),
+                            session,
+                            user,
+                            profiling,
+                        ))
+                        economized = budget.action == ECONOMY and cached[0] is None
+                        st.session_state["economy"] = (job_id, budget.message) if economized else None
+                        st.query_params["job"] = job_id
+                
+                if job_id is not None:
+                    render_job(job_id, model)
                 else:
                     # Placeholder message
                     st.markdown('<div class="forensic-log">', unsafe_allow_html=True)
@@ -1568,14 +1475,18 @@ def main():
                     """, unsafe_allow_html=True)
                     st.markdown('</div>', unsafe_allow_html=True)
     
+    render_cost_panel()
+    render_history()
+    
     # Footer
     st.markdown("---")
-    st.markdown("""
+    protocol = load_protocol()
+    st.markdown(f"""
         <div style="text-align: center; font-size: 0.9rem; padding: 2rem 0;">
         <span style="background: linear-gradient(90deg, #4285f4 0%, #9c27b0 50%, #f538a0 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 600;">Kinetic.AI</span> 
         <span style="color: #9aa0a6;">| Powered by</span> 
         <span style="color: #4285f4; font-weight: 600;">Gemini 2.5 Flash</span> 
-        <span style="color: #9aa0a6;">| Physics-First Analysis | Temperature: 0.0</span>
+        <span style="color: #9aa0a6;">| Physics-First Analysis | Temperature: 0.0 | UPL v{protocol.version} · ~{protocol.tokens:,} tokens · {protocol.sha256[:8]}</span>
         </div>
     """, unsafe_allow_html=True)
 
@@ -0,0 +1,4 @@
+"""
+⚡ Kinetic.AI forensic engine
+Local, UI-independent building blocks used by the Streamlit app.
+"""
@@ -0,0 +1,52 @@
+"""
+🔁 Shared Event Loop
+One long-lived asyncio loop on a daemon thread for all concurrent model calls.
+
+The SDK's async gRPC client binds to the loop it was first used on, so calling
+``asyncio.run`` per audit would break on the second audit. Synchronous code
+(Streamlit's script thread, worker processes) submits coroutines here instead.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Optional, TypeVar
+
+from kinetic.deadline import wait_for
+
+T = TypeVar("T")
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOCK = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Start the background loop on first use and return it."""
+    global _LOOP
+    with _LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="kinetic-aio", daemon=True)
+            thread.start()
+            _LOOP = loop
+        return _LOOP
+
+
+def submit(coro: Awaitable[T]) -> "Future[T]":
+    """
+    Schedule a coroutine on the shared loop.
+
+    Returns:
+        concurrent.futures.Future; ``cancel()`` on it cancels the asyncio task
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the shared loop and block for its result.
+
+    Under an audit deadline the task is cancelled as soon as the audit is
+    cancelled or times out (see ``kinetic.deadline.wait_for``).
+    """
+    return wait_for(submit(coro), timeout)
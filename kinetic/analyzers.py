@@ -0,0 +1,493 @@
+"""
+🧪 Local Forensic Analyzers & Process-Pool Scheduler
+CPU-bound pixel checks that run next to the model call, outside the GIL.
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kinetic.deadline import POLL_INTERVAL, current_deadline
+from kinetic.workspace import ImageWorkspace
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESULT TYPE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class AnalyzerReport:
+    """Outcome of one local analyzer. ``score`` is AI suspicion in [0, 1]."""
+    name: str
+    status: str = "ok"  # ok | timeout | error
+    score: Optional[float] = None
+    summary: str = ""
+    metrics: Dict[str, float] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+
+def _clamp(value: float) -> float:
+    return float(min(1.0, max(0.0, value)))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ANALYZERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def analyze_noise(workspace: ImageWorkspace) -> Tuple[float, str, Dict[str, float]]:
+    """
+    Photon shot-noise test (UPL 1.1).
+
+    For flat tiles, camera noise grows with √signal, so log(σ) vs log(μ) has a
+    slope near 0.5. Synthetic noise is flat (slope ≈ 0) or inverted.
+    """
+    size = 32
+    if min(workspace.luma.shape) < size * 2:
+        return 0.5, "Image too small for tile statistics", {}
+    means = workspace.tiles(size, plane="luma").mean(axis=(2, 3)).ravel()
+    sigmas = workspace.tiles(size, plane="residual").std(axis=(2, 3)).ravel()
+    texture = workspace.tiles(size, plane="gradient_magnitude").mean(axis=(2, 3)).ravel()
+
+    # Flat, unclipped tiles only: texture and saturation both mask sensor noise
+    usable = (texture <= np.percentile(texture, 40)) & (means > 12) & (means < 243) & (sigmas > 0.05)
+    if usable.sum() < 8:
+        return 0.5, "Too few flat tiles to fit the noise curve", {"tiles": float(usable.sum())}
+
+    slope = float(np.polyfit(np.log(means[usable]), np.log(sigmas[usable]), 1)[0])
+    dark = means[usable] < np.median(means[usable])
+    dark_rel = float(np.mean(sigmas[usable][dark] / np.sqrt(means[usable][dark])))
+    bright_rel = float(np.mean(sigmas[usable][~dark] / np.sqrt(means[usable][~dark])))
+
+    score = _clamp(1.0 - slope / 0.5)
+    verdict = "consistent with Poisson shot noise" if score < 0.5 else "noise does not scale with signal"
+    return score, f"Noise/signal slope {slope:.2f} (camera ≈ 0.5) — {verdict}", {
+        "slope": slope,
+        "dark_relative_noise": dark_rel,
+        "bright_relative_noise": bright_rel,
+        "tiles": float(usable.sum()),
+    }
+
+
+def analyze_cfa(workspace: ImageWorkspace) -> Tuple[float, str, Dict[str, float]]:
+    """
+    Bayer demosaicing trace test (UPL 1.2).
+
+    Interpolated green photosites are smoother than sampled ones, so green
+    residual variance differs between the two checkerboard lattices of a real
+    capture. Generated images show no lattice preference.
+    """
+    green = workspace.rgb_float[..., 1]
+    height, width = green.shape
+    height, width = height - height % 2, width - width % 2
+    if height < 64 or width < 64:
+        return 0.5, "Image too small for lattice statistics", {}
+    green = green[:height, :width]
+    residual = green[1:-1, 1:-1] - 0.25 * (green[:-2, 1:-1] + green[2:, 1:-1] + green[1:-1, :-2] + green[1:-1, 2:])
+
+    lattice_a = np.concatenate([residual[0::2, 0::2].ravel(), residual[1::2, 1::2].ravel()])
+    lattice_b = np.concatenate([residual[0::2, 1::2].ravel(), residual[1::2, 0::2].ravel()])
+    var_a, var_b = float(lattice_a.var()), float(lattice_b.var())
+    if min(var_a, var_b) < 1e-6:
+        return 0.5, "Flat green channel — lattice test not applicable", {}
+    strength = abs(float(np.log(var_a / var_b)))
+
+    channel_sigma = [float(workspace.rgb_float[..., c].std()) for c in range(3)]
+    score = _clamp(1.0 - strength / 0.08)
+    verdict = "demosaicing lattice present" if score < 0.5 else "no demosaicing lattice (also erased by heavy JPEG/resizing)"
+    return score, f"Green lattice asymmetry {strength:.3f} — {verdict}", {
+        "lattice_asymmetry": strength,
+        "sigma_r": channel_sigma[0],
+        "sigma_g": channel_sigma[1],
+        "sigma_b": channel_sigma[2],
+    }
+
+
+def analyze_spectrum(workspace: ImageWorkspace) -> Tuple[float, str, Dict[str, float]]:
+    """
+    Frequency-domain upsampling test (UPL 4.1 / 4.2).
+
+    Transposed-convolution and latent decoders leave isolated periodic peaks
+    far above the radial average of the spectrum.
+    """
+    spectrum = workspace.spectrum
+    height, width = spectrum.shape
+    if min(height, width) < 64:
+        return 0.5, "Image too small for spectral analysis", {}
+    yy, xx = np.indices(spectrum.shape)
+    radius = np.hypot((yy - height / 2) / (height / 2), (xx - width / 2) / (width / 2))
+    ring = np.minimum((radius * 64).astype(np.int32), 90)
+
+    counts = np.bincount(ring.ravel())
+    ring_mean = np.bincount(ring.ravel(), spectrum.ravel()) / np.maximum(counts, 1)
+    ring_sq = np.bincount(ring.ravel(), (spectrum ** 2).ravel()) / np.maximum(counts, 1)
+    ring_std = np.sqrt(np.maximum(ring_sq - ring_mean ** 2, 1e-6))
+
+    # Ignore DC neighbourhood and the axis cross produced by image borders
+    band = (radius > 0.1) & (radius < 1.0) & (np.abs(yy - height // 2) > 2) & (np.abs(xx - width // 2) > 2)
+    z = (spectrum - ring_mean[ring]) / ring_std[ring]
+    peaks = int(np.count_nonzero((z > 6.0) & band))
+    peak_ratio = peaks / max(int(band.sum()), 1)
+
+    # High-frequency falloff (MTF proxy): real optics roll off, decoders stay flat
+    falloff = float(ring_mean[6:16].mean() - ring_mean[48:64].mean()) if ring_mean.size > 64 else 0.0
+
+    score = _clamp(peak_ratio * 2000.0)
+    verdict = "periodic upsampling peaks present" if score >= 0.5 else "no periodic grid artifacts"
+    return score, f"{peaks} spectral peaks above 6σ — {verdict}", {
+        "peaks": float(peaks),
+        "peak_ratio": peak_ratio,
+        "hf_falloff": falloff,
+    }
+
+
+def analyze_copy_move(workspace: ImageWorkspace) -> Tuple[float, str, Dict[str, float]]:
+    """
+    Duplicated-region test (cloned textures, repeated crowd faces).
+
+    Luma is mean-pooled into 4×4 cells; every 4×4-cell window (16px block, 4px
+    stride) gets a quantized signature and identical textured signatures at a
+    distance are counted as clone candidates.
+    """
+    cell = 4
+    luma = workspace.luma
+    height, width = (luma.shape[0] // cell) * cell, (luma.shape[1] // cell) * cell
+    if height < 64 or width < 64:
+        return 0.5, "Image too small for block matching", {}
+    pooled = luma[:height, :width].reshape(height // cell, cell, width // cell, cell).mean(axis=(1, 3))
+
+    windows = np.lib.stride_tricks.sliding_window_view(pooled, (4, 4))
+    rows, cols = windows.shape[:2]
+    features = windows.reshape(rows * cols, 16)
+    spread = features.std(axis=1)
+    textured = spread > 4.0
+    if textured.sum() < 16:
+        return 0.0, "Too little texture for block matching", {"textured_blocks": float(textured.sum())}
+
+    positions = np.argwhere(textured.reshape(rows, cols))
+    signatures = features[textured]
+    signatures = np.round((signatures - signatures.mean(axis=1, keepdims=True)) / spread[textured, None] * 4).astype(np.int8)
+    _, inverse, group_sizes = np.unique(signatures, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+
+    # Small groups only: large groups are natural periodic texture (tiles, fabric)
+    candidate = (group_sizes[inverse] >= 2) & (group_sizes[inverse] <= 6)
+    matched = 0
+    members = np.flatnonzero(candidate)
+    if members.size:
+        members = members[np.argsort(inverse[members], kind="stable")]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(inverse[members])) + 1])
+        rows_in, cols_in = positions[members, 0], positions[members, 1]
+        # Max pairwise Chebyshev distance of a group == max of its row/col ranges
+        reach = np.maximum(
+            np.maximum.reduceat(rows_in, starts) - np.minimum.reduceat(rows_in, starts),
+            np.maximum.reduceat(cols_in, starts) - np.minimum.reduceat(cols_in, starts),
+        )
+        sizes = np.diff(np.concatenate([starts, [members.size]]))
+        matched = int(sizes[reach >= 8].sum())  # ≥ 32px apart: not just overlapping windows
+
+    ratio = matched / float(textured.sum())
+    score = _clamp(ratio * 50.0)
+    verdict = "cloned regions detected" if score >= 0.5 else "no significant cloned regions"
+    return score, f"{matched} blocks share a distant twin — {verdict}", {
+        "matched_blocks": float(matched),
+        "textured_blocks": float(textured.sum()),
+        "match_ratio": ratio,
+    }
+
+
+ANALYZERS: Dict[str, Callable[[ImageWorkspace], Tuple[float, str, Dict[str, float]]]] = {
+    "noise": analyze_noise,
+    "cfa": analyze_cfa,
+    "spectrum": analyze_spectrum,
+    "copy_move": analyze_copy_move,
+}
+
+
+def run_analyzer(name: str, workspace: ImageWorkspace) -> AnalyzerReport:
+    """
+    Run one analyzer in the current process, never raising.
+
+    Args:
+        name: Key in ``ANALYZERS``
+        workspace: Shared workspace for this audit
+
+    Returns:
+        AnalyzerReport with wall time measured around the analyzer only
+    """
+    start = time.perf_counter()
+    try:
+        score, summary, metrics = ANALYZERS[name](workspace)
+        return AnalyzerReport(name, "ok", score, summary, metrics, time.perf_counter() - start)
+    except Exception as e:
+        return AnalyzerReport(name, "error", None, f"{type(e).__name__}: {e}", {}, time.perf_counter() - start)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESS-POOL SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_TIMEOUT = 20.0
+START_BYTES = 8  # one float64 start time per analyzer at the head of the shared block
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+# perf_counter time by which every run submitted to a live pool is past its budget
+_BUSY_UNTIL: Dict[ProcessPoolExecutor, float] = {}
+
+
+def _get_pool(busy_until: float) -> ProcessPoolExecutor:
+    """
+    The pool new runs go to, started lazily; workers are reused across audits.
+
+    Args:
+        busy_until: ``perf_counter`` time at which the submitting run gives up
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn: Streamlit's server is multi-threaded, forking it is unsafe
+            _POOL = ProcessPoolExecutor(
+                max_workers=min(len(ANALYZERS), multiprocessing.cpu_count()),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _BUSY_UNTIL[_POOL] = 0.0
+        _BUSY_UNTIL[_POOL] = max(_BUSY_UNTIL[_POOL], busy_until)
+        return _POOL
+
+
+def _retire_pool(pool: Optional[ProcessPoolExecutor], drain: bool = True) -> None:
+    """
+    Replace a pool with a stuck (or crashed) worker.
+
+    New runs get a fresh pool at once. Other audits' analyzers on the old one
+    keep running until the last of their budgets ends (``drain``); only then
+    are its processes terminated, so a stuck analyzer cannot hold a worker forever.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if pool is None or pool not in _BUSY_UNTIL:
+            return  # already retired by another run
+        busy_until = _BUSY_UNTIL.pop(pool)
+        if _POOL is pool:
+            _POOL = None
+
+    def reap() -> None:
+        if drain:
+            time.sleep(max(busy_until - time.perf_counter(), 0.0))
+        # ProcessPoolExecutor has no public per-task kill; terminate workers directly
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    threading.Thread(target=reap, name="kinetic-pool-reaper", daemon=True).start()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block owned by the parent; only the parent unlinks it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Pool workers share the parent's resource tracker, so registering again is a no-op
+    return shared_memory.SharedMemory(name=name)
+
+
+def _pool_task(shm_name: str, shape: Tuple[int, ...], offset: int, slot: int, analyzer: str) -> AnalyzerReport:
+    """
+    Worker entry point: map the shared RGB buffer and run one analyzer on it.
+
+    The block starts with one start-time slot per analyzer (the frame follows at
+    ``offset``); the task stamps its own, so the parent measures each budget
+    from when the analyzer really began rather than from submission.
+    """
+    shm = _attach(shm_name)
+    try:
+        started = np.ndarray((1,), dtype=np.float64, buffer=shm.buf, offset=slot * START_BYTES)
+        started[0] = time.time()  # wall clock: comparable across processes
+        rgb = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+        workspace = ImageWorkspace.from_array(rgb)
+        report = run_analyzer(analyzer, workspace)
+        del workspace, rgb, started  # drop buffer exports before close()
+        return report
+    finally:
+        shm.close()
+
+
+class AnalyzerRun:
+    """
+    Handle for analyzers running in the background.
+
+    Submit with ``submit_analyzers`` before the model call and ``collect`` after
+    it, so local analysis overlaps network latency. Use it as a context manager
+    so an audit aborted before ``collect`` still frees the shared-memory block.
+    """
+
+    def __init__(self, workspace: ImageWorkspace, names: Sequence[str], timeout: float, use_processes: bool):
+        self.workspace = workspace
+        self.names = list(names)
+        self.timeout = timeout
+        self.started = time.perf_counter()
+        self.wall_time = 0.0
+        self._futures = {}
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if use_processes:
+            try:
+                self._submit()
+            except (OSError, BrokenProcessPool):
+                self._release()
+                _retire_pool(self._pool, drain=False)
+                self._futures = {}
+
+    def _submit(self) -> None:
+        rgb = self.workspace.rgb
+        # One copy into shared memory instead of pickling the frame once per task
+        offset = START_BYTES * len(self.names)
+        self._shm = shared_memory.SharedMemory(create=True, size=offset + max(rgb.nbytes, 1))
+        self._starts().fill(0.0)
+        np.ndarray(rgb.shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)[...] = rgb
+        self._pool = _get_pool(self.started + self.timeout)
+        for slot, name in enumerate(self.names):
+            self._futures[name] = self._pool.submit(_pool_task, self._shm.name, rgb.shape, offset, slot, name)
+
+    def _starts(self) -> np.ndarray:
+        """Wall-clock start time of each analyzer (0 until its worker picks it up)."""
+        return np.ndarray((len(self.names),), dtype=np.float64, buffer=self._shm.buf)
+
+    def _release(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self) -> None:
+        """Drop analyzers that have not started and free the shared block (idempotent)."""
+        for future in self._futures.values():
+            future.cancel()
+        self._release()
+
+    def __enter__(self) -> "AnalyzerRun":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def collect(self, timeout: Optional[float] = None) -> List[AnalyzerReport]:
+        """
+        Wait for all analyzers, honouring the per-analyzer timeout.
+
+        Each analyzer's budget runs from the moment a worker starts it, so time
+        queued behind other audits does not count. Only an analyzer overrunning
+        that budget retires the pool. A tighter ``timeout`` or the current audit
+        deadline (``kinetic.deadline``) just stops the wait: this run's queued
+        analyzers are dropped and the pool is left to other audits.
+
+        Args:
+            timeout: Tighter budget in seconds from submission (degraded mode)
+
+        Returns:
+            Reports in submission order (status "timeout" for overruns)
+        """
+        cutoff = self.started + timeout if timeout is not None else None
+        deadline = current_deadline()
+        reports: Dict[str, AnalyzerReport] = {}
+        pending = {}
+        for slot, name in enumerate(self.names):
+            future = self._futures.get(name)
+            if future is None:  # inline fallback (no pool available)
+                reports[name] = run_analyzer(name, self.workspace)
+            else:
+                pending[name] = (slot, future)
+        overran = crashed = False
+        try:
+            while pending:
+                starts, now = self._starts(), time.time()
+                for name, (slot, future) in list(pending.items()):
+                    if future.done():
+                        del pending[name]
+                        try:
+                            reports[name] = future.result()
+                        except BrokenProcessPool as e:
+                            crashed = True
+                            reports[name] = AnalyzerReport(name, "error", None, f"Worker crashed: {e}", {}, 0.0)
+                    elif starts[slot] and now - starts[slot] >= self.timeout:
+                        del pending[name]
+                        overran = True
+                        reports[name] = AnalyzerReport(
+                            name, "timeout", None, f"Exceeded {self.timeout:.0f}s budget", {}, float(now - starts[slot])
+                        )
+                del starts  # drop the buffer export before the block is released
+                if not pending:
+                    break
+                aborted = deadline is not None and (deadline.cancelled or deadline.expired)
+                if aborted or (cutoff is not None and time.perf_counter() >= cutoff):
+                    for name in pending:
+                        reports[name] = AnalyzerReport(
+                            name, "timeout", None, "Unfinished when the audit stopped waiting", {}, time.perf_counter() - self.started
+                        )
+                    self._watch(dict(pending))
+                    break
+                wait([future for _, future in pending.values()], POLL_INTERVAL, FIRST_COMPLETED)
+        finally:
+            if crashed or overran:
+                # Only this run's unstarted tasks are cancelled; other audits keep the old pool
+                for future in self._futures.values():
+                    future.cancel()
+                _retire_pool(self._pool, drain=not crashed)
+            self._release()
+        self.wall_time = time.perf_counter() - self.started
+        return [reports[name] for name in self.names]
+
+    def _watch(self, abandoned: Dict[str, Tuple[int, Future]]) -> None:
+        """
+        Let analyzers this run stopped waiting for finish in the background.
+
+        Unstarted ones are cancelled; if one already running overruns its own
+        budget, the pool is retired then, as ``collect`` would have done.
+        """
+        starts, now = self._starts(), time.time()
+        # Not yet started but already handed to a worker: its budget starts no earlier than now
+        limit = max([now] + [float(starts[slot]) for slot, _ in abandoned.values()]) + self.timeout
+        del starts
+        running = [future for _, future in abandoned.values() if not future.cancel()]
+        if not running:
+            return
+        pool = self._pool
+
+        def watch() -> None:
+            _, overrunning = wait(running, max(limit - time.time(), 0.0))
+            if overrunning:
+                _retire_pool(pool)
+
+        threading.Thread(target=watch, name="kinetic-analyzer-watch", daemon=True).start()
+
+
+def submit_analyzers(
+    workspace: ImageWorkspace,
+    names: Optional[Sequence[str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    use_processes: bool = True,
+) -> AnalyzerRun:
+    """
+    Start local analyzers in the process pool and return immediately.
+
+    Args:
+        workspace: Decoded image shared through ``multiprocessing.shared_memory``
+        names: Analyzer keys to run (all by default)
+        timeout: Per-analyzer budget in seconds, measured from when each analyzer starts
+        use_processes: Run inline in this process instead (workers, tests)
+
+    Returns:
+        AnalyzerRun whose ``collect()`` yields the reports
+    """
+    return AnalyzerRun(workspace, names or list(ANALYZERS), timeout, use_processes)
+
+
+def run_analyzers(workspace: ImageWorkspace, names: Optional[Sequence[str]] = None, timeout: float = DEFAULT_TIMEOUT) -> List[AnalyzerReport]:
+    """Blocking convenience wrapper around ``submit_analyzers(...).collect()``."""
+    return submit_analyzers(workspace, names, timeout).collect()
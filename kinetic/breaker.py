@@ -0,0 +1,174 @@
+"""
+🔌 Circuit Breaker
+Stops sending audits to a model endpoint that is failing or unusably slow, so
+analysts get an immediate, clearly labelled local-only verdict instead of
+waiting on a spinner for a call that will not succeed.
+
+Closed: calls flow and outcomes are recorded. Open: calls are refused until a
+cool-down passes. Half-open: a single probe call is let through; success
+closes the circuit, failure re-opens it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+from kinetic.verdicts import verdict_from_suspicion
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+WINDOW = 20  # recent attempts the error rate is computed over
+MIN_CALLS = 5  # never trip on fewer attempts than this
+ERROR_RATE = 0.5  # trip when at least this fraction of recent attempts failed
+SLOW_CALL = 60.0  # seconds; slower attempts count as failures
+OPEN_SECONDS = 30.0  # cool-down before a probe is allowed
+DEGRADED_DEADLINE = 8.0  # seconds from submission for local checks in degraded mode
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The model endpoint's circuit is open; the call was not sent."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BREAKER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CircuitBreaker:
+    """Error-rate / latency breaker for one model endpoint (thread-safe)."""
+
+    def __init__(
+        self,
+        window: int = WINDOW,
+        min_calls: int = MIN_CALLS,
+        error_rate: float = ERROR_RATE,
+        slow_call: float = SLOW_CALL,
+        open_seconds: float = OPEN_SECONDS,
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.reason: Optional[str] = None
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failed
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are refused: open and cooling down, or half-open with the probe in flight."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at < self.open_seconds
+            return self.state == HALF_OPEN and self._probing
+
+    def before_call(self) -> None:
+        """
+        Admit one attempt.
+
+        Raises:
+            CircuitOpenError: The circuit is open, or a half-open probe is already in flight
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state, self._probing = HALF_OPEN, False
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(f"Model endpoint circuit is {self.state} ({self.reason})")
+
+    def record(self, healthy: bool, latency: float) -> None:
+        """
+        Record one attempt's outcome.
+
+        Args:
+            healthy: False for errors that indicate provider trouble (5xx, 429, timeouts)
+            latency: Seconds the attempt took; slow attempts count as failures
+        """
+        failed = not healthy or latency > self.slow_call
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._trip("probe failed" if not healthy else f"probe took {latency:.0f}s")
+                else:
+                    self.state, self.reason = CLOSED, None
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(failed)
+            failures = sum(self._outcomes)
+            if (
+                self.state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.error_rate
+            ):
+                self._trip(f"{failures}/{len(self._outcomes)} recent calls failed or exceeded {self.slow_call:.0f}s")
+
+    def abandon(self) -> None:
+        """An admitted attempt ended without an outcome (cancelled); frees the probe slot."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def _trip(self, reason: str) -> None:
+        self.state, self.reason = OPEN, reason
+        self.opened_at = time.monotonic()
+        self.trips += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "reason": self.reason,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in": max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)) if self.state == OPEN else 0.0,
+            }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DEGRADED VERDICT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def local_only_report(suspicion: Optional[float], findings: Sequence[Tuple[str, str]], reason: Optional[str]) -> str:
+    """
+    Markdown report for an audit answered without the model.
+
+    Uses the UPL verdict/confidence labels so it parses like a model report,
+    under a banner that makes its provenance unmistakable.
+
+    Args:
+        suspicion: Local AI suspicion in [0, 1], or None if no check succeeded
+        findings: (check name, summary) pairs from the local analyzers
+        reason: Why the circuit is open
+    """
+    if suspicion is None:
+        verdict_line = "**VERDICT**: INCONCLUSIVE\n\nNo local check completed within the degraded-mode deadline."
+    else:
+        verdict = verdict_from_suspicion(suspicion)
+        verdict_line = (
+            f"**VERDICT**: {verdict.label}\n\n**CONFIDENCE**: {verdict.confidence:.0f}%\n\n"
+            f"Local AI suspicion: {suspicion:.0%}"
+        )
+    rows = "\n".join(f"- **{name}**: {summary}" for name, summary in findings)
+    return f"""## ⚠️ DEGRADED MODE — LOCAL-ONLY VERDICT
+
+The model endpoint is currently unavailable ({reason or "circuit open"}), so this result comes **only from
+on-device pixel statistics** and has not been reviewed by the model. Local checks cannot confirm camera
+capture; re-run the audit once the service recovers.
+
+{verdict_line}
+
+{rows}
+"""
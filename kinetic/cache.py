@@ -0,0 +1,120 @@
+"""
+♻️ Verdict Cache
+Finished audits keyed by what determines their result — upload bytes, audit
+options, configured models and protocol version — so an identical request is
+answered from the cache instead of a new model call, on whichever replica it lands.
+
+Two entries per audit on the shared backend: the request key points at the
+job that produced the result, and the job id holds the sealed (signed and
+compressed) outcome — also how a page reattaches to a job that finished on
+another replica. Only successful, model-reviewed outcomes are cached. Without
+``KINETIC_REDIS_URL`` the entries go to a SQLite file in the data directory,
+which every process on the host shares.
+"""
+
+import logging
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from kinetic.kv import KEY_PREFIX, REDIS_URL, NearCache, SQLiteKV, TamperedValue, seal, shared_backend, unseal
+from kinetic.pipeline import AuditModels, AuditOptions, AuditOutcome
+from kinetic.protocol import load_protocol
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TTL = 7 * 24 * 3600  # seconds an entry lives on the shared backend
+NEAR_KEYS = 1024  # request keys kept in the per-process near-cache
+NEAR_OUTCOMES = 16  # outcomes kept in the near-cache (they carry overlay images)
+NEAR_TTL = 300.0
+
+
+class VerdictCache:
+    """Request key → job id → outcome, on the shared backend with a near-cache in front."""
+
+    def __init__(self, backend: Any = None):
+        self.backend = backend if backend is not None else shared_backend()
+        self._keys = NearCache(NEAR_KEYS, NEAR_TTL)
+        self._outcomes = NearCache(NEAR_OUTCOMES, NEAR_TTL)
+
+    @staticmethod
+    def key(digest: str, options: AuditOptions, models: AuditModels) -> str:
+        """Cache key of one audit request (changes whenever the protocol or a configured model does)."""
+        toggles = ",".join(f"{name}={int(value)}" for name, value in sorted(asdict(options).items()))
+        return f"{KEY_PREFIX}verdict:{load_protocol().fingerprint}:{'+'.join(models.names)}:{toggles}:{digest}"
+
+    def jobs_for(self, keys: Iterable[str]) -> List[Optional[str]]:
+        """
+        Job ids holding cached results for several request keys.
+
+        Near-cache hits cost nothing; the remaining keys are fetched in one MGET.
+        """
+        keys = list(keys)
+        found: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in keys:
+            hit, job_id = self._keys.get(key)
+            if hit:
+                found[key] = job_id
+            else:
+                missing.append(key)
+        if missing:
+            for key, value in zip(missing, self.backend.mget(missing)):
+                found[key] = value.decode() if value is not None else None
+                if value is not None:
+                    self._keys.put(key, found[key])
+        return [found[key] for key in keys]
+
+    def job_for(self, key: str) -> Optional[str]:
+        return self.jobs_for([key])[0]
+
+    def outcome(self, job_id: str) -> Optional[AuditOutcome]:
+        """The cached outcome of a finished job, from any replica."""
+        hit, outcome = self._outcomes.get(job_id)
+        if hit:
+            return outcome
+        blob = self.backend.get(f"{KEY_PREFIX}job:{job_id}")
+        if blob is None:
+            return None
+        try:
+            outcome = unseal(blob)
+        except TamperedValue:
+            logger.warning("Ignoring cached outcome %s with a bad signature", job_id)
+            return None
+        self._outcomes.put(job_id, outcome)
+        return outcome
+
+    def put(self, key: str, job_id: str, outcome: AuditOutcome) -> bool:
+        """
+        Cache a finished audit (one pipelined round trip).
+
+        Returns:
+            False if the outcome is not cacheable (failed or local-only)
+        """
+        if not outcome.success or outcome.degraded:
+            return False
+        blob = seal(outcome)
+        pipe = self.backend.pipeline(transaction=False)
+        pipe.set(f"{KEY_PREFIX}job:{job_id}", blob, ex=TTL)
+        pipe.set(key, job_id, ex=TTL)
+        pipe.execute()
+        self._keys.put(key, job_id)
+        self._outcomes.put(job_id, outcome)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "keys": self._keys.snapshot(),
+            "outcomes": self._outcomes.snapshot(),
+        }
+
+
+@lru_cache(maxsize=None)
+def verdict_cache() -> VerdictCache:
+    """The process-wide verdict cache: on Redis when configured, else on the host's SQLite file."""
+    return VerdictCache(shared_backend() if REDIS_URL else SQLiteKV())
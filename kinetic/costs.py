@@ -0,0 +1,163 @@
+"""
+💰 Cost Accounting
+What each audit spent — prompt, image and output tokens, priced at the
+router's list prices — rolled up per session, per user per day and per day,
+and the budgets that move new audits to economy mode and then refuse them.
+
+Prompt and output counts come from each call's ``usage_metadata``; the SDK
+does not break out the image share of the prompt, so it is estimated per
+768px tile. Reports stopped by the output-token cap are flagged, so truncated
+audits show up in the history and the rollups.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from kinetic.router import estimate_cost, usage_by_model
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ECONOMY_AT = 0.8  # share of a budget after which new audits run in economy mode
+SPEND_TTL = 8 * 24 * 3600  # seconds a rollup lives on the shared backend
+TRUNCATED = "MAX_TOKENS"  # finish reason of a response cut off by max_output_tokens
+
+OK, ECONOMY, BLOCKED = "ok", "economy", "blocked"
+
+SCOPE_LABELS = {"session": "session", "user": "daily per-user", "day": "daily"}
+SCOPE_RESETS = {"session": "in a new session", "user": "at 00:00 UTC", "day": "at 00:00 UTC"}
+
+
+def finish_reason(response: Any) -> Optional[str]:
+    """Finish reason of a response's first candidate ("STOP", "MAX_TOKENS", …)."""
+    candidates = getattr(response, "candidates", None)
+    if not candidates:
+        return None
+    reason = getattr(candidates[0], "finish_reason", None)
+    if reason is None:
+        return None
+    return getattr(reason, "name", None) or str(reason)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SPEND
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Spend:
+    """Tokens and list-price cost of one audit, or a rollup of many."""
+    audits: int = 0
+    prompt_tokens: int = 0
+    image_tokens: int = 0  # estimated share of prompt_tokens
+    output_tokens: int = 0
+    cost: float = 0.0  # USD
+    truncated: int = 0  # reports cut off by the output-token cap
+
+    def add(self, model_name: Optional[str], usage: Mapping[str, Any]) -> None:
+        """Count one model call (``usage`` as filled by the audit calls)."""
+        prompt, output = usage.get("prompt_tokens") or 0, usage.get("output_tokens") or 0
+        self.prompt_tokens += prompt
+        self.output_tokens += output
+        self.image_tokens += usage.get("image_tokens") or 0
+        self.cost += sum(
+            estimate_cost(name, tokens, generated) or 0.0
+            for name, (tokens, generated) in usage_by_model(model_name, usage).items()
+        )
+        self.truncated += bool(usage.get("truncated"))
+
+
+def spend_scopes(session: Optional[str], user: Optional[str], when: Optional[float] = None) -> Dict[str, str]:
+    """
+    Rollup keys an audit counts toward: its session, its user's UTC day and the UTC day.
+
+    Args:
+        session: Browser session id
+        user: Signed-in user (None when anonymous)
+        when: Epoch seconds (defaults to now)
+    """
+    day = time.strftime("%Y-%m-%d", time.gmtime(when))
+    scopes = {"day": f"day:{day}"}
+    if user:
+        scopes["user"] = f"user:{user}:{day}"
+    if session:
+        scopes["session"] = f"session:{session}"
+    return scopes
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BUDGETS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class BudgetStatus:
+    """What a new audit may do under the budgets."""
+    action: str = OK  # OK | ECONOMY | BLOCKED
+    scope: Optional[str] = None  # budget that decided it
+    spent: float = 0.0
+    limit: Optional[float] = None
+
+    @property
+    def message(self) -> str:
+        if self.action == OK:
+            return ""
+        budget = f"{SCOPE_LABELS[self.scope]} budget (${self.spent:.2f} of ${self.limit:.2f})"
+        if self.action == BLOCKED:
+            return f"The {budget} is used up — audits resume {SCOPE_RESETS[self.scope]}"
+        return f"Economy mode: the {budget} is nearly used up"
+
+
+@dataclass(frozen=True)
+class BudgetPolicy:
+    """USD limits per rollup scope (None = unlimited)."""
+    session: Optional[float] = None
+    user: Optional[float] = None  # per user per UTC day
+    day: Optional[float] = None  # all users per UTC day
+    economy_at: float = ECONOMY_AT
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "BudgetPolicy":
+        """
+        Args:
+            config: ``st.secrets`` or any mapping with BUDGET_SESSION_USD,
+                BUDGET_USER_DAILY_USD, BUDGET_DAILY_USD and BUDGET_ECONOMY_AT
+        """
+        def limit(key: str) -> Optional[float]:
+            value = config.get(key)
+            return float(value) if value not in (None, "") else None
+
+        return cls(
+            session=limit("BUDGET_SESSION_USD"),
+            user=limit("BUDGET_USER_DAILY_USD"),
+            day=limit("BUDGET_DAILY_USD"),
+            economy_at=float(config.get("BUDGET_ECONOMY_AT") or ECONOMY_AT),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in (self.session, self.user, self.day))
+
+    def limit(self, scope: str) -> Optional[float]:
+        return getattr(self, scope)
+
+    def check(self, spend: Mapping[str, Spend]) -> BudgetStatus:
+        """
+        Decide for a new audit from the current rollups.
+
+        Args:
+            spend: Rollup per scope name ("session", "user", "day")
+
+        Returns:
+            BLOCKED once any budget is spent, ECONOMY past ``economy_at`` of one, else OK
+        """
+        status = BudgetStatus()
+        for scope, rollup in spend.items():
+            limit = self.limit(scope)
+            if limit is None:
+                continue
+            if rollup.cost >= limit:
+                return BudgetStatus(BLOCKED, scope, rollup.cost, limit)
+            if rollup.cost >= limit * self.economy_at and status.action == OK:
+                status = BudgetStatus(ECONOMY, scope, rollup.cost, limit)
+        return status
@@ -0,0 +1,59 @@
+"""
+🗄️ Embedded SQLite
+Shared connection handling for the on-disk stores (job queue, audit history).
+
+Databases run in WAL mode so readers never block the writer; every thread
+keeps its own connection, and writes take the lock up front so concurrent
+processes queue on it instead of failing mid-transaction.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DATA_DIR = Path(os.environ.get("KINETIC_DATA_DIR", ".kinetic"))
+BUSY_TIMEOUT = 30.0  # seconds a writer waits for another process's lock
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Autocommit connection in WAL mode with name-addressable rows."""
+    db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class Database:
+    """One SQLite file with a per-thread connection, created with ``schema`` on first use."""
+
+    def __init__(self, path: Path, schema: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(schema)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = connect(self.path)
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction, taking the write lock up front (BEGIN IMMEDIATE)."""
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
@@ -0,0 +1,201 @@
+"""
+⏳ Deadlines & Cancellation
+End-to-end time budget for one audit, carried in a context variable so frame
+decode, local analysis and every model call below it see the same deadline
+without threading it through each signature.
+
+Cancelling (or expiring) a deadline aborts the audit at the next stage
+boundary and cancels its in-flight model calls on the shared event loop, so an
+abandoned audit stops consuming quota. Time and tokens saved are tallied
+process-wide.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_DEADLINE = 120.0  # seconds from the button press to the rendered result
+POLL_INTERVAL = 0.1  # seconds between cancellation checks while blocked
+
+
+class AuditAborted(Exception):
+    """The audit was stopped before it finished."""
+
+
+class AuditCancelled(AuditAborted):
+    """The user cancelled the audit."""
+
+
+class DeadlineExceeded(AuditAborted):
+    """The audit ran out of time."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DEADLINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Deadline:
+    """Time budget plus cancel flag for one audit (safe to share across threads)."""
+
+    def __init__(self, seconds: Optional[float] = DEFAULT_DEADLINE, age: float = 0.0):
+        """
+        Args:
+            seconds: Budget (None = unlimited)
+            age: Seconds already spent before this object existed (e.g. waiting in the queue)
+        """
+        self.seconds = seconds
+        self.started = time.monotonic() - age
+        self.expires_at = self.started + seconds if seconds is not None else None
+        self.stage = "starting"
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (None = unlimited, 0 once cancelled) — usable directly as a timeout."""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self, stage: Optional[str] = None) -> None:
+        """
+        Enter ``stage`` (for progress display), or stop if the audit is aborted.
+
+        Raises:
+            AuditCancelled: The audit was cancelled
+            DeadlineExceeded: The deadline passed
+        """
+        if self.cancelled:
+            raise AuditCancelled(f"Cancelled during {self.stage}")
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.0f}s exceeded during {self.stage}")
+        if stage is not None:
+            self.stage = stage
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep that wakes up as soon as the audit is cancelled."""
+        remaining = self.remaining()
+        if remaining is not None and seconds > remaining:
+            self.check()
+            raise DeadlineExceeded(f"Waiting {seconds:.0f}s would exceed the deadline")
+        self._cancelled.wait(seconds)
+        self.check()
+
+
+_CURRENT: ContextVar[Optional[Deadline]] = ContextVar("kinetic_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the audit running in this context, if any."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Make ``deadline`` current for this thread/task and everything it schedules on the shared loop."""
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def wait_for(future: "Future[T]", timeout: Optional[float] = None) -> T:
+    """
+    Block on a concurrent future under the current deadline.
+
+    When the audit is cancelled or runs out of time the future is cancelled
+    (which cancels its asyncio task on the shared loop) and the abort raised.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return future.result(timeout)
+    limit = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        try:
+            return future.result(POLL_INTERVAL)
+        except FutureTimeout:
+            if deadline.cancelled or deadline.expired:
+                future.cancel()
+                deadline.check()
+            if limit is not None and time.monotonic() >= limit:
+                raise
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SAVINGS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CancellationStats:
+    """What cancellations and deadlines saved, shared by every session in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cancelled = 0
+        self.expired = 0
+        self.seconds_saved = 0.0
+        self.calls_aborted = 0  # model calls cancelled mid-request
+        self.calls_unsent = 0  # model calls dropped before being sent
+        self.input_tokens_unsent = 0
+
+    def record_audit(self, cancelled: bool, elapsed: float, expected: Optional[float]) -> None:
+        """
+        Args:
+            cancelled: True for a user cancel, False for an expired deadline
+            elapsed: Seconds the audit ran before stopping
+            expected: Typical duration of a complete audit, if known
+        """
+        with self._lock:
+            if cancelled:
+                self.cancelled += 1
+            else:
+                self.expired += 1
+            if expected is not None:
+                self.seconds_saved += max(0.0, expected - elapsed)
+
+    def record_call(self, sent: bool, tokens: int) -> None:
+        with self._lock:
+            if sent:
+                self.calls_aborted += 1
+            else:
+                self.calls_unsent += 1
+                self.input_tokens_unsent += tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cancelled": self.cancelled,
+                "expired": self.expired,
+                "seconds_saved": self.seconds_saved,
+                "calls_aborted": self.calls_aborted,
+                "calls_unsent": self.calls_unsent,
+                "input_tokens_unsent": self.input_tokens_unsent,
+            }
+
+
+SAVINGS = CancellationStats()
+
@@ -0,0 +1,306 @@
+"""
+🌐 Tier Fan-Out Orchestration
+Runs the UPL tiers as independent, concurrent, tier-focused model calls and
+stops early once the evidence already proves DEFINITELY AI.
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from kinetic import aio
+from kinetic.deadline import AuditAborted
+from kinetic.prompts import select_sections, text_before
+from kinetic.scheduler import estimate_request_tokens, scheduler_for
+from kinetic.verdicts import Verdict
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TIER DEFINITIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TIER_OUTPUT_TOKENS = 2048  # each tier writes a fraction of the monolithic report
+DEFINITELY_AI_FAILURES = 5  # "DEFINITELY AI - 5+ systematic failures"
+
+
+@dataclass(frozen=True)
+class TierSpec:
+    """One independently runnable tier: protocol sections it needs and its report title."""
+    key: str
+    title: str
+    headings: Tuple[str, ...]
+
+
+TIERS = (
+    TierSpec("tier_-1", "🔬 TIER -1: ULTRA-FINE PIXEL FORENSICS", (
+        "### 4. FREQUENCY DOMAIN ANALYSIS",
+        "### 🔬 TIER -1",
+    )),
+    TierSpec("tier_0", "🧮 TIER 0: MATHEMATICAL & PHYSICS ANALYSIS", (
+        "### 1. SENSOR PHYSICS",
+        "### 2. OPTICAL PHYSICS",
+        "### 3. LIGHTING PHYSICS",
+        "### 5. COMPRESSION",
+        "### 6. STATISTICAL DISTRIBUTION",
+        "### 🧮 TIER 0",
+    )),
+    TierSpec("tier_1", "🔬 TIER 1: MICROSCOPIC ANALYSIS", (
+        "### 1.1 NOISE PATTERN",
+        "### 1.2 MICRO-DETAIL COHERENCE",
+        "### 1.3 BIOMETRIC PRECISION TESTS",
+        "### 1.4 SPECTRAL COHERENCE",
+        "### 🔬 TIER 1",
+    )),
+    TierSpec("tier_2", "🎯 TIER 2: SEMANTIC ANALYSIS", (
+        "## 🟡 TIER 2",
+        "### 🎯 TIER 2",
+    )),
+    TierSpec("tier_3", "📐 TIER 3: STATISTICAL ANALYSIS", (
+        "## 🔴 TIER 3",
+        "### 📐 TIER 3",
+    )),
+)
+
+_PREAMBLE_END = "## 📐 FUNDAMENTAL PHYSICS TESTS"
+
+TIER_OUTPUT_INSTRUCTIONS = """
+---
+
+## 📊 OUTPUT (JSON ONLY)
+
+Run ONLY the tests above. Respond with a single JSON object:
+{
+  "systematic_failures": <int, definitive AI failures found in this tier>,
+  "camera_markers": <int, positive camera-capture markers confirmed in this tier>,
+  "findings": [
+    {"test": "<test name>", "result": "PASS|FAIL|SUSPICIOUS", "evidence": "<measured evidence>", "location": "<region or [x, y]>"}
+  ],
+  "summary": "<one sentence>"
+}
+Count a failure as systematic only if it is a definitive, measurable violation.
+"""
+
+
+def build_tier_prompt(protocol: str, spec: TierSpec) -> str:
+    """
+    Assemble a tier-focused prompt: shared mission preamble + the tier's sections.
+
+    Args:
+        protocol: Full UPL protocol text
+        spec: Tier to build
+
+    Returns:
+        Prompt text for one tier call
+    """
+    preamble = text_before(protocol, _PREAMBLE_END)
+    body = select_sections(protocol, spec.headings)
+    return f"{preamble}\n## FOCUS: {spec.title}\n\n{body}{TIER_OUTPUT_INSTRUCTIONS}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESULTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class TierResult:
+    """Structured outcome of one tier call."""
+    spec: TierSpec
+    status: str = "ok"  # ok | error | cancelled
+    systematic_failures: int = 0
+    camera_markers: int = 0
+    findings: List[Dict[str, Any]] = field(default_factory=list)
+    summary: str = ""
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class FanoutResult:
+    """All tier results plus the aggregated verdict."""
+    tiers: List[TierResult]
+    early_exit: bool
+    wall_time: float
+
+    @property
+    def systematic_failures(self) -> int:
+        return sum(tier.systematic_failures for tier in self.tiers if tier.status == "ok")
+
+    @property
+    def camera_markers(self) -> int:
+        return sum(tier.camera_markers for tier in self.tiers if tier.status == "ok")
+
+    @property
+    def succeeded(self) -> bool:
+        return any(tier.status == "ok" for tier in self.tiers)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(tier.prompt_tokens + tier.output_tokens for tier in self.tiers)
+
+    def verdict(self) -> Verdict:
+        """
+        Aggregate tier counts using the UPL scoring bands.
+
+        Missing tiers (errors) can only keep the verdict away from AUTHENTIC.
+        """
+        failures, markers = self.systematic_failures, self.camera_markers
+        complete = all(tier.status == "ok" for tier in self.tiers)
+        if failures >= DEFINITELY_AI_FAILURES:
+            return Verdict("DEFINITELY AI", min(99.0, 80.0 + 3 * failures), source="fanout")
+        if failures >= 3:
+            return Verdict("LIKELY AI", 60.0 + 5 * failures, source="fanout")
+        if failures == 0 and markers >= 7 and complete:
+            return Verdict("AUTHENTIC", min(95.0, 85.0 + markers), source="fanout")
+        if failures <= 1 and markers >= 5 and complete:
+            return Verdict("LIKELY AUTHENTIC", 75.0 + 2 * markers - 10 * failures, source="fanout")
+        return Verdict("INCONCLUSIVE", 55.0, source="fanout")
+
+    def to_markdown(self) -> str:
+        """Render in the same shape as the monolithic report so downstream parsing works."""
+        verdict = self.verdict()
+        lines = [
+            f"### 🚨 FORENSIC VERDICT: {verdict.label}",
+            "",
+            f"### 📈 CONFIDENCE SCORE: {verdict.confidence:.0f}%",
+            "",
+            f"**Systematic failures**: {self.systematic_failures} · **Camera markers**: {self.camera_markers}",
+        ]
+        if self.early_exit:
+            lines.append(
+                f"\n> ⚡ Early exit: {DEFINITELY_AI_FAILURES}+ systematic failures reached; remaining tiers were cancelled."
+            )
+        for tier in self.tiers:
+            lines += ["", f"### {tier.spec.title}"]
+            if tier.status != "ok":
+                lines.append(f"*{tier.status}*{': ' + tier.summary if tier.summary else ''}")
+                continue
+            for finding in tier.findings:
+                location = f" ({finding.get('location')})" if finding.get("location") else ""
+                lines.append(
+                    f"- **{finding.get('test', '?')}**: {finding.get('result', '?')} — {finding.get('evidence', '')}{location}"
+                )
+            lines.append(f"**RED FLAGS FOUND**: {tier.systematic_failures}")
+            if tier.summary:
+                lines.append(f"*{tier.summary}*")
+        return "\n".join(lines)
+
+
+def _parse_tier_json(text: str) -> Dict[str, Any]:
+    """Parse the tier JSON, tolerating code fences around it."""
+    cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    data = json.loads(cleaned)
+    if not isinstance(data, dict):
+        raise ValueError("Tier response is not a JSON object")
+    return data
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ORCHESTRATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def run_tier(model, protocol: str, spec: TierSpec, image: Any) -> TierResult:
+    """
+    Issue one tier-focused call and parse its structured result.
+
+    Args:
+        model: Gemini model (its async client is used)
+        protocol: Full UPL protocol text
+        spec: Tier to run
+        image: Image part (PIL Image or inline blob)
+
+    Returns:
+        TierResult (status "error" instead of raising)
+
+    Raises:
+        AuditAborted: The audit was cancelled or cannot finish before its deadline
+    """
+    start = time.perf_counter()
+    result = TierResult(spec)
+    try:
+        contents = [build_tier_prompt(protocol, spec), image]
+        response = await scheduler_for(model).call_async(
+            lambda: model.generate_content_async(
+                contents,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "max_output_tokens": TIER_OUTPUT_TOKENS,
+                },
+            ),
+            estimate_request_tokens(contents),
+        )
+        data = _parse_tier_json(response.text)
+        result.systematic_failures = int(data.get("systematic_failures", 0))
+        result.camera_markers = int(data.get("camera_markers", 0))
+        result.findings = [finding for finding in data.get("findings", []) if isinstance(finding, dict)]
+        result.summary = str(data.get("summary", ""))
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            result.prompt_tokens = usage.prompt_token_count
+            result.output_tokens = usage.candidates_token_count
+    except AuditAborted:
+        raise
+    except Exception as e:
+        result.status = "error"
+        result.summary = f"{type(e).__name__}: {e}"
+    result.latency = time.perf_counter() - start
+    return result
+
+
+async def fan_out(
+    model,
+    protocol: str,
+    image: Any,
+    tiers: Sequence[TierSpec] = TIERS,
+    early_exit_failures: Optional[int] = DEFINITELY_AI_FAILURES,
+) -> FanoutResult:
+    """
+    Run all tiers concurrently, cancelling the rest once the verdict is settled.
+
+    Args:
+        model: Gemini model
+        protocol: Full UPL protocol text
+        image: Image part shared by every tier call
+        tiers: Tiers to run
+        early_exit_failures: Systematic failures that settle DEFINITELY AI (None disables)
+
+    Returns:
+        FanoutResult with tiers in protocol order
+    """
+    start = time.perf_counter()
+    tasks = {asyncio.ensure_future(run_tier(model, protocol, spec, image)): spec for spec in tiers}
+    results: Dict[str, TierResult] = {}
+    pending = set(tasks)
+    early_exit = False
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task].key] = task.result()
+            failures = sum(result.systematic_failures for result in results.values() if result.status == "ok")
+            if early_exit_failures is not None and pending and failures >= early_exit_failures:
+                early_exit = True
+                for task in pending:
+                    task.cancel()  # aborts the in-flight HTTP/gRPC call
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in pending:
+                    results[tasks[task].key] = TierResult(tasks[task], status="cancelled", summary="verdict already settled")
+                pending = set()
+    finally:
+        # Cancelled or aborted (Cancel button, deadline, a tier's AuditAborted): stop every tier still
+        # running, and retrieve sibling aborts so none is logged as "exception never retrieved"
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    ordered = [results[spec.key] for spec in tiers]
+    return FanoutResult(ordered, early_exit, time.perf_counter() - start)
+
+
+def run_tier_fanout(model, protocol: str, image: Any, **kwargs) -> FanoutResult:
+    """Blocking wrapper for synchronous callers (runs on the shared event loop)."""
+    return aio.run(fan_out(model, protocol, image, **kwargs))
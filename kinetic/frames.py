@@ -0,0 +1,198 @@
+"""
+🎞️ Multi-Frame Analysis (GIF / WebP / APNG)
+Stream frames, drop near-duplicates by hash, audit a representative subset.
+"""
+
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from kinetic.analyzers import AnalyzerReport, submit_analyzers
+from kinetic.deadline import current_deadline
+from kinetic.loader import ImageSource
+from kinetic.verdicts import local_suspicion
+from kinetic.workspace import ImageWorkspace
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FRAME_BUDGET = 8  # frames sent to the model and local analyzers
+DUPLICATE_DISTANCE = 6  # dHash bits; ≤ this is "the same picture"
+MAX_SCANNED_FRAMES = 2000  # hashing stops here for pathological files
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FRAME HASHING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def frame_hash(frame: Image.Image) -> int:
+    """
+    64-bit difference hash: sign of horizontal gradients on a 9×8 thumbnail.
+
+    Robust to palette dithering and re-encoding, and costs one tiny resize.
+    """
+    small = np.asarray(frame.convert("L").resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class FramePlan:
+    """Result of the hashing pass: what exists, what is unique, what gets audited."""
+    total_frames: int
+    unique_indices: List[int]
+    selected_indices: List[int]
+    truncated: bool = False
+
+    @property
+    def duplicates_dropped(self) -> int:
+        return self.total_frames - len(self.unique_indices)
+
+
+def select_representative(indices: Sequence[int], budget: int) -> List[int]:
+    """Evenly spaced subset (always keeping first and last) of at most ``budget`` items."""
+    if len(indices) <= budget:
+        return list(indices)
+    if budget <= 1:
+        return [indices[0]]
+    positions = np.linspace(0, len(indices) - 1, budget).round().astype(int)
+    return [indices[position] for position in sorted(set(positions.tolist()))]
+
+
+def plan_frames(
+    source: ImageSource,
+    budget: int = FRAME_BUDGET,
+    threshold: int = DUPLICATE_DISTANCE,
+) -> FramePlan:
+    """
+    Hash every frame once and pick the frames to audit.
+
+    Only the current frame and a list of integers are alive at any time, so
+    memory does not grow with the frame count.
+
+    Args:
+        source: Animated upload
+        budget: Maximum frames to audit
+        threshold: Hamming distance at or below which a frame repeats the last kept one
+
+    Returns:
+        FramePlan with selected frame indices in playback order
+    """
+    unique: List[int] = []
+    last_hash: Optional[int] = None
+    total = 0
+    truncated = False
+    with source.open() as handle:
+        for index, frame in enumerate(ImageSequence.Iterator(handle)):
+            if index >= MAX_SCANNED_FRAMES:
+                truncated = True
+                break
+            total += 1
+            current = frame_hash(frame)
+            if last_hash is None or hamming(current, last_hash) > threshold:
+                unique.append(index)
+                last_hash = current
+    return FramePlan(total, unique, select_representative(unique, budget), truncated)
+
+
+def iter_frames(source: ImageSource, indices: Sequence[int]) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Decode only the requested frames, in order, one at a time.
+
+    Args:
+        source: Animated upload
+        indices: Frame indices (ascending)
+
+    Yields:
+        (index, RGB frame) pairs; each frame is an independent copy
+    """
+    wanted = sorted(set(indices))
+    with source.open() as handle:
+        for index in wanted:
+            handle.seek(index)
+            yield index, handle.convert("RGB")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MULTI-FRAME LOCAL AUDIT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class FrameAudit:
+    """Local analyzer results for one audited frame."""
+    index: int
+    reports: List[AnalyzerReport] = field(default_factory=list)
+
+    @property
+    def suspicion(self) -> Optional[float]:
+        return local_suspicion(self.reports)
+
+
+def analyze_frames(source: ImageSource, indices: Sequence[int]) -> List[FrameAudit]:
+    """
+    Run the local analyzers frame by frame.
+
+    One workspace is alive at a time; each frame's analyzers still run in
+    parallel in the process pool. The current audit deadline is checked before
+    every frame, so a cancelled audit stops decoding.
+
+    Raises:
+        AuditAborted: The audit was cancelled or ran out of time
+    """
+    deadline = current_deadline()
+    audits = []
+    for index, frame in iter_frames(source, indices):
+        if deadline is not None:
+            deadline.check()
+        workspace = ImageWorkspace(frame)
+        with submit_analyzers(workspace) as run:
+            audits.append(FrameAudit(index, run.collect()))
+        del workspace, frame
+    return audits
+
+
+def submit_frame_analysis(source: ImageSource, indices: Sequence[int]) -> Future:
+    """
+    Start ``analyze_frames`` on a helper thread so it overlaps the model call.
+
+    The thread runs in a copy of the caller's context, so it sees the audit's
+    deadline and cancel flag (and its trace).
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frames")
+    future = executor.submit(contextvars.copy_context().run, analyze_frames, source, indices)
+    executor.shutdown(wait=False)
+    return future
+
+
+def combined_suspicion(audits: Sequence[FrameAudit]) -> Optional[float]:
+    """A clip is as suspicious as its worst frame."""
+    scores = [audit.suspicion for audit in audits if audit.suspicion is not None]
+    return max(scores) if scores else None
+
+
+def frames_prompt_addendum(plan: FramePlan, source_format: str) -> str:
+    """Instructions appended to the UPL prompt for a multi-frame request."""
+    frame_list = ", ".join(f"#{index}" for index in plan.selected_indices)
+    scanned = f"{plan.total_frames}+" if plan.truncated else str(plan.total_frames)
+    return f"""
+---
+
+## 🎞️ MULTI-FRAME INPUT
+
+The following {len(plan.selected_indices)} images are frames {frame_list} (in playback order) of an
+animated {source_format} with {scanned} frames; {plan.duplicates_dropped} near-duplicate frames were removed.
+
+- Apply the protocol to every frame and reference findings by frame number.
+- Add TEMPORAL checks: identity/feature drift, texture "boiling", noise that is re-synthesised per frame, lighting that jumps between frames.
+- A single AI-generated frame makes the whole animation AI-GENERATED.
+- Produce ONE overall verdict in the mandatory output format.
+"""
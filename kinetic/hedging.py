@@ -0,0 +1,267 @@
+"""
+🪁 Hedged Requests
+Cuts tail latency of the model call: when a streamed response has not started
+within a percentile of recently observed time-to-first-chunk, a duplicate
+request is fired (optionally to an alternate model) and whichever finishes
+first wins; the loser is cancelled.
+
+Hedges are capped to a fraction of requests so a slow backend is not hit with
+double load.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from kinetic import aio
+from kinetic.costs import finish_reason
+from kinetic.prompts import estimate_tokens
+from kinetic.scheduler import estimate_request_tokens, model_name, scheduler_for
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HEDGE_PERCENTILE = 0.95  # hedge when first chunk is later than this TTFT percentile
+MIN_SAMPLES = 20  # below this, use the fallback delay
+FALLBACK_DELAY = 12.0  # seconds
+MIN_DELAY, MAX_DELAY = 2.0, 45.0
+MAX_HEDGE_RATE = 0.10  # at most 10% of recent requests may be hedged
+WINDOW = 200  # recent requests kept for percentiles and the rate cap
+
+
+@dataclass
+class Completion:
+    """One finished streamed call."""
+    text: str
+    prompt_tokens: Optional[int]
+    output_tokens: Optional[int]
+    ttft: float  # seconds until the first chunk
+    latency: float
+    finish_reason: Optional[str] = None
+    model: str = ""  # bare name of the model that ran it
+
+
+@dataclass
+class HedgedResponse:
+    """Winning completion plus how it was obtained."""
+    completion: Completion
+    hedged: bool  # a duplicate request was fired
+    winner: str  # "primary" | "hedge"
+    delay: float  # hedge delay that applied
+    losers: List[Completion] = field(default_factory=list)  # cancelled calls, with the tokens billed so far
+
+    @property
+    def text(self) -> str:
+        return self.completion.text
+
+
+def tokens_by_model(completions: Iterable[Completion]) -> Dict[str, Tuple[int, int]]:
+    """(prompt, output) tokens per model over several calls, e.g. a hedge winner and its loser."""
+    tokens: Dict[str, Tuple[int, int]] = {}
+    for completion in completions:
+        prompt, output = tokens.get(completion.model, (0, 0))
+        tokens[completion.model] = (prompt + (completion.prompt_tokens or 0), output + (completion.output_tokens or 0))
+    return tokens
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POLICY & METRICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HedgePolicy:
+    """Percentile-based hedge delay, hedge-rate cap and win metrics (shared per process)."""
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        max_hedge_rate: float = MAX_HEDGE_RATE,
+        window: int = WINDOW,
+    ):
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self._lock = threading.Lock()
+        self._ttft: Deque[float] = deque(maxlen=window)
+        self._hedged: Deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.capped = 0  # hedges suppressed by the rate cap
+
+    def delay(self) -> float:
+        """Current hedge delay in seconds."""
+        with self._lock:
+            samples = sorted(self._ttft)
+        if len(samples) < MIN_SAMPLES:
+            return FALLBACK_DELAY
+        index = min(len(samples) - 1, int(self.percentile * len(samples)))
+        return min(MAX_DELAY, max(MIN_DELAY, samples[index]))
+
+    def allow_hedge(self) -> bool:
+        """True if one more hedge keeps the recent hedge rate under the cap."""
+        with self._lock:
+            allowed = (sum(self._hedged) + 1) / (len(self._hedged) + 1) <= self.max_hedge_rate
+            if not allowed:
+                self.capped += 1
+            return allowed
+
+    def record(self, ttft: Optional[float], hedged: bool, hedge_won: bool) -> None:
+        with self._lock:
+            if ttft is not None:
+                self._ttft.append(ttft)
+            self._hedged.append(hedged)
+            self.requests += 1
+            self.hedges += hedged
+            self.hedge_wins += hedge_won
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "capped": self.capped,
+                "samples": len(self._ttft),
+            }
+
+
+POLICY = HedgePolicy()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEDGED CALL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def stream_completion(
+    model,
+    contents,
+    first_chunk: Optional[asyncio.Event] = None,
+    cancelled: Optional[List[Completion]] = None,
+    **kwargs,
+) -> Completion:
+    """
+    Stream one response to completion, signalling when the first chunk arrives.
+
+    Waits for the model's RPM/TPM budget and retries 429/5xx like every scheduled
+    call; ``kwargs`` go to ``generate_content_async`` (e.g. ``generation_config``).
+    If the stream is cancelled once the request was accepted, an estimate of the
+    tokens already billed (the prompt and the chunks received) is appended to
+    ``cancelled``.
+    """
+    start = time.perf_counter()
+    ttft = None
+    response = await scheduler_for(model).call_async(
+        lambda: model.generate_content_async(contents, stream=True, **kwargs), estimate_request_tokens(contents)
+    )
+    received = []
+    try:
+        async for chunk in response:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+                if first_chunk is not None:
+                    first_chunk.set()
+            if cancelled is not None:
+                try:
+                    received.append(chunk.text)
+                except ValueError:  # a chunk without text parts (e.g. only a finish reason)
+                    pass
+    except asyncio.CancelledError:
+        if cancelled is not None:
+            elapsed = time.perf_counter() - start
+            partial = "".join(received)
+            cancelled.append(Completion(
+                partial, estimate_request_tokens(contents), estimate_tokens(partial),
+                ttft if ttft is not None else elapsed, elapsed, "CANCELLED", model_name(model),
+            ))
+        raise
+    usage = getattr(response, "usage_metadata", None)
+    return Completion(
+        text=response.text,
+        prompt_tokens=usage.prompt_token_count if usage is not None else None,
+        output_tokens=usage.candidates_token_count if usage is not None else None,
+        ttft=ttft if ttft is not None else time.perf_counter() - start,
+        latency=time.perf_counter() - start,
+        finish_reason=finish_reason(response),
+        model=model_name(model),
+    )
+
+
+async def hedged_generate(
+    model,
+    contents: list,
+    alternate: Optional[Any] = None,
+    policy: HedgePolicy = POLICY,
+    **kwargs,
+) -> HedgedResponse:
+    """
+    Generate with a hedge if the first chunk is late.
+
+    Args:
+        model: Primary Gemini model
+        contents: generate_content contents
+        alternate: Model for the duplicate request (defaults to ``model``)
+        policy: Delay, rate cap and metrics
+        **kwargs: Passed to both calls' ``generate_content_async`` (e.g. ``generation_config``)
+
+    Returns:
+        HedgedResponse with the first successful completion; once a hedge ran,
+        ``losers`` holds the tokens the other call was billed for
+
+    Raises:
+        Exception: The primary's error when no hedge ran or both calls failed
+    """
+    delay = policy.delay()
+    primary_started = asyncio.Event()
+    losers: List[Completion] = []
+    primary = asyncio.ensure_future(stream_completion(model, contents, primary_started, losers, **kwargs))
+    tasks = [primary]
+    try:
+        started = asyncio.ensure_future(primary_started.wait())
+        await asyncio.wait({primary, started}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        started.cancel()
+
+        if primary.done() or primary_started.is_set() or not policy.allow_hedge():
+            try:
+                completion = await primary
+            except Exception:
+                policy.record(None, hedged=False, hedge_won=False)
+                raise
+            policy.record(completion.ttft, hedged=False, hedge_won=False)
+            return HedgedResponse(completion, hedged=False, winner="primary", delay=delay)
+
+        hedge = asyncio.ensure_future(stream_completion(alternate or model, contents, None, losers, **kwargs))
+        tasks.append(hedge)
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            for task in done:
+                if task.exception() is not None:
+                    error = error or task.exception()
+            if succeeded:
+                # Both may finish in the same step: the other one was billed in full
+                won = primary if primary in succeeded else hedge
+                losers.extend(task.result() for task in succeeded if task is not won)
+                winner = "hedge" if won is hedge else "primary"
+                completion = won.result()
+                policy.record(completion.ttft, hedged=True, hedge_won=winner == "hedge")
+                # The cancelled loser adds its estimate to ``losers`` in the finally below
+                return HedgedResponse(completion, hedged=True, winner=winner, delay=delay, losers=losers)
+        policy.record(None, hedged=True, hedge_won=False)
+        raise error
+    finally:
+        # Losers and abandoned calls are cancelled, which aborts their streams
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def generate_hedged(model, contents: list, alternate: Optional[Any] = None, **kwargs) -> HedgedResponse:
+    """Blocking wrapper for synchronous callers (runs on the shared event loop)."""
+    return aio.run(hedged_generate(model, contents, alternate, **kwargs))
@@ -0,0 +1,303 @@
+"""
+📬 Durable Audit Queue
+SQLite-backed job queue between the UI and the audit workers.
+
+The Streamlit script only enqueues an upload with its options and polls the
+job row; workers (``python -m kinetic.worker``, or embedded threads) claim
+jobs, run the pipeline and write the outcome back. Jobs survive browser
+reloads and server restarts, and workers scale independently of UI sessions.
+
+A claimed job holds a lease renewed by its worker's heartbeat; jobs whose
+worker died are re-queued (up to ``MAX_ATTEMPTS``). Cancellation is a flag on
+the row that the owning worker picks up on its next heartbeat.
+"""
+
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from kinetic.db import DATA_DIR, Database
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DB_PATH = DATA_DIR / "jobs.db"
+LEASE_SECONDS = 30.0  # a running job whose heartbeat is older than this is re-queued
+HEARTBEAT_SECONDS = 2.0  # how often workers renew leases and pick up cancel requests
+MAX_ATTEMPTS = 2  # claims per job before it is failed instead of re-queued
+RETENTION_SECONDS = 7 * 24 * 3600.0  # finished jobs older than this are purged
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED, EXPIRED = "queued", "running", "done", "failed", "cancelled", "expired"
+FINISHED = (DONE, FAILED, CANCELLED, EXPIRED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    options TEXT NOT NULL,
+    payload BLOB,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT '',
+    deadline REAL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    heartbeat REAL,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    result BLOB,
+    error TEXT,
+    session TEXT,
+    user TEXT,
+    profile INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created);
+CREATE INDEX IF NOT EXISTS jobs_digest ON jobs (digest, created);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    jobs_done INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Everything but the payload and result blobs
+JOB_COLUMNS = (
+    "id, digest, options, status, stage, deadline, created, started, finished,"
+    " worker, attempts, cancel_requested, error, session, user, profile"
+)
+
+
+@dataclass
+class Job:
+    """One queued audit as stored (without its upload bytes)."""
+    id: str
+    digest: str
+    options: Dict[str, Any]
+    status: str
+    stage: str
+    deadline: Optional[float]  # seconds from enqueue
+    created: float
+    started: Optional[float]
+    finished: Optional[float]
+    worker: Optional[str]
+    attempts: int
+    cancel_requested: bool
+    error: Optional[str]
+    session: Optional[str] = None  # browser session that asked for it (spend rollups)
+    user: Optional[str] = None
+    profile: bool = False  # run under cProfile and tracemalloc
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        job = cls(**{key: row[key] for key in row.keys() if key in cls.__dataclass_fields__})
+        job.options = json.loads(job.options)
+        job.cancel_requested, job.profile = bool(job.cancel_requested), bool(job.profile)
+        return job
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since enqueue, up to completion."""
+        return (self.finished or time.time()) - self.created
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUEUE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class JobQueue(Database):
+    """
+    Audit jobs in one SQLite database (safe across threads and processes).
+
+    Claims run in ``BEGIN IMMEDIATE`` transactions, so two workers never take
+    the same job.
+    """
+
+    def __init__(self, path: Path = DB_PATH):
+        super().__init__(path, SCHEMA)
+
+    # ── UI side ────────────────────────────────────────────────────────────────
+
+    def enqueue(
+        self,
+        payload: bytes,
+        digest: str,
+        options: Dict[str, Any],
+        deadline: Optional[float],
+        session: Optional[str] = None,
+        user: Optional[str] = None,
+        profile: bool = False,
+    ) -> str:
+        """
+        Queue one audit.
+
+        Args:
+            payload: Upload bytes (re-validated by the worker)
+            digest: SHA-256 of ``payload``
+            options: ``AuditOptions`` as a dict
+            deadline: End-to-end seconds, counted from now
+            session: Browser session the spend is charged to
+            user: Signed-in user the spend is charged to
+            profile: Capture a cProfile/tracemalloc profile of the run
+
+        Returns:
+            The job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO jobs (id, digest, options, payload, status, deadline, created, session, user, profile)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, digest, json.dumps(options), payload, QUEUED, deadline, time.time(), session, user, profile),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def outcome(self, job_id: str) -> Any:
+        """The unpickled result of a finished job (None if it produced none)."""
+        row = self._connect().execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return pickle.loads(row["result"]) if row is not None and row["result"] is not None else None
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a queued job outright; ask the worker of a running one to stop."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, payload = NULL, error = 'Cancelled before it started'"
+                " WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED),
+            )
+            db.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?", (job_id, RUNNING))
+
+    def position(self, job_id: str) -> int:
+        """Jobs queued ahead of this one."""
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ? AND created < (SELECT created FROM jobs WHERE id = ?)",
+            (QUEUED, job_id),
+        ).fetchone()
+        return row[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Job counts by status and the number of live workers."""
+        db = self._connect()
+        counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        workers = db.execute(
+            "SELECT COUNT(*) FROM workers WHERE heartbeat >= ?", (time.time() - LEASE_SECONDS,)
+        ).fetchone()[0]
+        return {"counts": counts, "workers": workers}
+
+    # ── Worker side ────────────────────────────────────────────────────────────
+
+    def register_worker(self, worker_id: str) -> None:
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO workers (id, host, pid, started, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                (worker_id, socket.gethostname(), os.getpid(), now, now),
+            )
+
+    def unregister_worker(self, worker_id: str) -> None:
+        with self._transaction() as db:
+            db.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def claim(self, worker_id: str) -> Optional[Tuple[Job, bytes]]:
+        """
+        Take the oldest queued job, first re-queueing jobs whose worker stopped heartbeating.
+
+        Returns:
+            Tuple of (job, upload bytes), or None when the queue is empty
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker_id))
+            self._reclaim(db, now)
+            row = db.execute(
+                f"SELECT {JOB_COLUMNS}, payload FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started = ?, heartbeat = ?, attempts = attempts + 1, stage = ''"
+                " WHERE id = ?",
+                (RUNNING, worker_id, now, now, row["id"]),
+            )
+        job = Job.from_row(row)
+        job.status, job.worker, job.started, job.attempts = RUNNING, worker_id, now, job.attempts + 1
+        return job, row["payload"]
+
+    @staticmethod
+    def _reclaim(db: sqlite3.Connection, now: float) -> None:
+        stale = now - LEASE_SECONDS
+        db.execute(
+            "UPDATE jobs SET status = ?, finished = ?, payload = NULL, error = 'Worker stopped responding'"
+            " WHERE status = ? AND heartbeat < ? AND attempts >= ?",
+            (FAILED, now, RUNNING, stale, MAX_ATTEMPTS),
+        )
+        db.execute(
+            "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND heartbeat < ?",
+            (QUEUED, RUNNING, stale),
+        )
+        db.execute("DELETE FROM workers WHERE heartbeat < ?", (stale,))
+        db.execute(
+            "DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?", (now - RETENTION_SECONDS,)
+        )
+
+    def heartbeat(self, job_id: str, worker_id: str, stage: str) -> bool:
+        """
+        Renew the lease and publish the current stage.
+
+        Returns:
+            True if the job should stop (cancel requested, or the lease was lost)
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker_id))
+            updated = db.execute(
+                "UPDATE jobs SET heartbeat = ?, stage = ? WHERE id = ? AND worker = ? AND status = ?",
+                (now, stage, job_id, worker_id, RUNNING),
+            ).rowcount
+            row = db.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return not updated or row is None or bool(row["cancel_requested"])
+
+    def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        stage: str = "",
+    ) -> None:
+        """Record a job's final state; the upload bytes are dropped."""
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL) if result is not None else None
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, stage = ?, finished = ?, payload = NULL"
+                " WHERE id = ? AND worker = ? AND status = ?",
+                (status, blob, error, stage, time.time(), job_id, worker_id, RUNNING),
+            )
+            db.execute("UPDATE workers SET jobs_done = jobs_done + 1 WHERE id = ?", (worker_id,))
+
+
+@lru_cache(maxsize=None)
+def job_queue(path: Path = DB_PATH) -> JobQueue:
+    """The process-wide queue handle for ``path``."""
+    return JobQueue(path)
@@ -0,0 +1,261 @@
+"""
+🔑 API Key Pool
+Spreads model calls over several project API keys, each with its own clients
+and quota view, so aggregate throughput scales with the number of keys.
+
+Every call goes to the key with the most remaining request/token budget. A key
+that is rate-limited is quarantined for the server's retry delay and the call
+fails over to the next key; only when every key is exhausted does the error
+reach the scheduler's backoff loop.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+
+from kinetic.deadline import current_deadline
+from kinetic.scheduler import (
+    DEFAULT_LIMITS,
+    FALLBACK_LIMITS,
+    TokenBucket,
+    estimate_request_tokens,
+    model_name,
+    retry_after,
+    status_code,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_QUARANTINE = 30.0  # seconds, when a 429 carries no retry delay
+MAX_QUARANTINE = 300.0
+
+
+def parse_keys(value: Union[str, Sequence[str], None]) -> List[str]:
+    """API keys from a secrets value: a list, or a comma-separated string."""
+    if not value:
+        return []
+    keys = value.split(",") if isinstance(value, str) else value
+    return list(dict.fromkeys(key.strip() for key in keys if key and key.strip()))
+
+
+@dataclass
+class KeyStats:
+    """Usage of one key across every model."""
+    requests: int = 0
+    tokens: int = 0  # estimated input tokens
+    rate_limited: int = 0
+    errors: int = 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POOLED KEY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PooledKey:
+    """One API key: its clients, per-model budgets and quarantine state."""
+
+    def __init__(self, key_id: str, api_key: str):
+        self.key_id = key_id
+        self.label = f"{key_id} (…{api_key[-4:]})"
+        self._api_key = api_key
+        self._client: Optional[glm.GenerativeServiceClient] = None
+        self._async_client: Optional[glm.GenerativeServiceAsyncClient] = None
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self.quarantined_until = 0.0
+        self.stats = KeyStats()
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> glm.GenerativeServiceClient:
+        with self._lock:
+            if self._client is None:
+                self._client = glm.GenerativeServiceClient(client_options={"api_key": self._api_key})
+            return self._client
+
+    @property
+    def async_client(self) -> glm.GenerativeServiceAsyncClient:
+        """Created on first use, i.e. on the shared event loop that will drive it."""
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = glm.GenerativeServiceAsyncClient(client_options={"api_key": self._api_key})
+            return self._async_client
+
+    def buckets(self, name: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            if name not in self._buckets:
+                rpm, tpm = DEFAULT_LIMITS.get(name, FALLBACK_LIMITS)
+                self._buckets[name] = (TokenBucket(rpm), TokenBucket(tpm))
+            return self._buckets[name]
+
+    def headroom(self, name: str) -> float:
+        """Fraction of this key's budget for ``name`` still available (the scarcer of RPM and TPM)."""
+        requests, tokens = self.buckets(name)
+        return min(requests.available() / requests.capacity, tokens.available() / tokens.capacity)
+
+    def quarantine(self, seconds: float) -> None:
+        with self._lock:
+            self.quarantined_until = max(self.quarantined_until, time.monotonic() + seconds)
+            self.stats.rate_limited += 1
+
+
+class KeyPool:
+    """Process-wide set of API keys that model calls are balanced over."""
+
+    def __init__(self, api_keys: Sequence[str]):
+        if not api_keys:
+            raise ValueError("Key pool needs at least one API key")
+        self.keys = [PooledKey(f"key-{number}", api_key) for number, api_key in enumerate(api_keys, 1)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def acquire(self, name: str, tokens: int, exclude: Sequence[str] = ()) -> Optional[Tuple[PooledKey, float]]:
+        """
+        Pick the key for one call and charge its budget.
+
+        Args:
+            name: Bare model name
+            tokens: Estimated input tokens of the call
+            exclude: Key ids already tried for this call
+
+        Returns:
+            Tuple of (key, seconds to wait before using it), or None when every
+            key has been tried. The wait is non-zero only when all remaining
+            keys are quarantined or out of budget.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [key for key in self.keys if key.key_id not in exclude]
+            if not candidates:
+                return None
+            available = [key for key in candidates if key.quarantined_until <= now]
+            if available:
+                key = max(available, key=lambda candidate: candidate.headroom(name))
+            else:
+                key = min(candidates, key=lambda candidate: candidate.quarantined_until)
+            requests, token_bucket = key.buckets(name)
+            wait = max(requests.reserve(1), token_bucket.reserve(tokens), key.quarantined_until - now)
+            with key._lock:
+                key.stats.requests += 1
+                key.stats.tokens += tokens
+            return key, wait
+
+    def report(self, key: PooledKey, exc: BaseException) -> bool:
+        """
+        Record a failed call; quarantine the key if it was rate-limited.
+
+        Returns:
+            True if the call should fail over to another key
+        """
+        if status_code(exc) == 429:
+            key.quarantine(min(MAX_QUARANTINE, retry_after(exc) or DEFAULT_QUARANTINE))
+            return True
+        with key._lock:
+            key.stats.errors += 1
+        return False
+
+    def model(self, name: str, generation_config: Optional[dict] = None) -> "PooledModel":
+        return PooledModel(self, name, generation_config)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        rows = []
+        for key in self.keys:
+            with key._lock:
+                stats = KeyStats(**vars(key.stats))
+                quarantine = max(0.0, key.quarantined_until - now)
+                models = list(key._buckets)
+            rows.append({
+                "key": key.label,
+                "stats": stats,
+                "quarantined": quarantine,
+                "headroom": {name: key.headroom(name) for name in models},
+            })
+        return rows
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POOLED MODEL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PooledModel:
+    """
+    Drop-in for ``genai.GenerativeModel`` whose calls are balanced over a key pool.
+
+    Exposes ``model_name``, ``generate_content`` and ``generate_content_async``
+    with the same arguments; ``key_count`` lets the scheduler size the model's
+    aggregate budget to the pool.
+    """
+
+    def __init__(self, pool: KeyPool, name: str, generation_config: Optional[dict] = None):
+        self.pool = pool
+        self.generation_config = generation_config
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self._lock = threading.Lock()
+        self.model_name = name if "/" in name else f"models/{name}"
+        self.name = model_name(self)
+
+    @property
+    def key_count(self) -> int:
+        return len(self.pool)
+
+    def _bound(self, key: PooledKey) -> genai.GenerativeModel:
+        """This model on ``key``'s sync client (the async client is attached per call)."""
+        with self._lock:
+            if key.key_id not in self._models:
+                self._models[key.key_id] = genai.GenerativeModel(self.model_name, generation_config=self.generation_config)
+            return self._models[key.key_id]
+
+    def _failover(self, key: PooledKey, exc: BaseException, tried: List[str]) -> None:
+        """Re-raise ``exc`` unless the call can move to another key."""
+        if not self.pool.report(key, exc) or len(tried) + 1 == len(self.pool):
+            raise exc
+        tried.append(key.key_id)
+
+    def generate_content(self, contents, **kwargs):
+        tokens, tried, error = estimate_request_tokens(contents), [], None
+        # Waiting for a quarantined key wakes on cancel and fails fast past the deadline
+        deadline = current_deadline()
+        pause = deadline.sleep if deadline is not None else time.sleep
+        while True:
+            key, wait = self.pool.acquire(self.name, tokens, tried)
+            if error is not None and wait > 0:
+                raise error  # every other key is rate-limited too; the scheduler backs off
+            pause(wait)
+            model = self._bound(key)
+            model._client = key.client
+            try:
+                return model.generate_content(contents, **kwargs)
+            except Exception as e:
+                self._failover(key, e, tried)
+                error = e
+
+    async def generate_content_async(self, contents, **kwargs):
+        tokens, tried, error = estimate_request_tokens(contents), [], None
+        while True:
+            key, wait = self.pool.acquire(self.name, tokens, tried)
+            if error is not None and wait > 0:
+                raise error
+            await asyncio.sleep(wait)
+            model = self._bound(key)
+            model._async_client = key.async_client
+            try:
+                return await model.generate_content_async(contents, **kwargs)
+            except Exception as e:
+                self._failover(key, e, tried)
+                error = e
+
+
+@lru_cache(maxsize=None)
+def key_pool(api_keys: Tuple[str, ...]) -> KeyPool:
+    """The process-wide pool for a set of keys (shared by every session)."""
+    return KeyPool(api_keys)
@@ -0,0 +1,382 @@
+"""
+🧰 Shared Key-Value Backend
+The verdict cache and audit history can live on a Redis-protocol server, so
+every app replica behind the load balancer sees the same entries.
+
+Set ``KINETIC_REDIS_URL`` (e.g. ``redis://cache:6379/0``; needs the optional
+``redis`` package) to share them. Without it, the verdict cache lives in
+``SQLiteKV`` on the local data directory (so standalone workers and the UI on
+one host still share it), and ``shared_backend()`` falls back to ``LocalKV``,
+an in-process stand-in for the same command subset.
+
+Reads go through a small per-process near-cache first; misses are fetched in
+one pipelined round trip.
+
+Pickled values (cached outcomes, profiles) are sealed with an HMAC, so a
+client that can write to the server cannot make replicas unpickle its bytes.
+With Redis every replica and worker needs the same ``KINETIC_SIGNING_KEY``;
+without it a key is generated once in the data directory.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import threading
+import time
+import zlib
+from bisect import insort
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from kinetic.db import DATA_DIR, Database
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+REDIS_URL = os.environ.get("KINETIC_REDIS_URL")
+SIGNING_KEY = os.environ.get("KINETIC_SIGNING_KEY")
+KEY_PREFIX = "kinetic:"
+KEY_FILE = DATA_DIR / "signing.key"  # generated signing key when no shared one is configured
+CACHE_PATH = DATA_DIR / "cache.db"  # verdict cache without Redis, shared by local processes
+TAG_BYTES = hashlib.sha256().digest_size
+
+Score = Union[float, int, str]  # redis-py score bounds: numbers, "+inf", "-inf", "(123" (exclusive)
+
+
+def _bound(value: Score) -> Tuple[float, bool]:
+    """Parse a score bound into (value, exclusive)."""
+    if isinstance(value, str):
+        exclusive = value.startswith("(")
+        return float(value[1:] if exclusive else value), exclusive
+    return float(value), False
+
+
+def _encode(value: Any) -> bytes:
+    """Values come back as bytes, as from a Redis server."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOCAL STAND-IN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class LocalKV:
+    """
+    In-process implementation of the Redis commands Kinetic uses.
+
+    Strings (get, set with ``ex``/``nx``, mget, incr, incrbyfloat, expire) and
+    sorted sets (zadd, zrevrangebyscore, zcount), plus ``pipeline``.
+    Thread-safe; data lives only as long as the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._strings: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._zsets: Dict[str, Dict[bytes, float]] = {}
+        self._ordered: Dict[str, List[Tuple[float, bytes]]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._strings.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._strings[key]
+            return None
+        return value
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(name)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, name: str, value: Any, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(name) is not None:
+                return None
+            self._strings[name] = (_encode(value), time.monotonic() + ex if ex is not None else None)
+            return True
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._live(name) or 0) + amount
+            self._strings[name] = (_encode(value), None)
+            return value
+
+    def incrbyfloat(self, name: str, amount: float = 1.0) -> float:
+        """Like Redis, keeps the key's expiry."""
+        with self._lock:
+            current = self._live(name)
+            expires_at = self._strings[name][1] if current is not None else None
+            value = float(current or 0) + amount
+            self._strings[name] = (_encode(value), expires_at)
+            return value
+
+    def expire(self, name: str, seconds: float) -> bool:
+        with self._lock:
+            current = self._live(name)
+            if current is None:
+                return False
+            self._strings[name] = (current, time.monotonic() + seconds)
+            return True
+
+    def zadd(self, name: str, mapping: Dict[Any, float]) -> int:
+        with self._lock:
+            members = self._zsets.setdefault(name, {})
+            ordered = self._ordered.setdefault(name, [])
+            added = 0
+            for member, score in mapping.items():
+                member = _encode(member)
+                if member in members:
+                    ordered.remove((members[member], member))
+                else:
+                    added += 1
+                members[member] = float(score)
+                insort(ordered, (float(score), member))
+            return added
+
+    def _range(self, name: str, low: Score, high: Score) -> List[Tuple[float, bytes]]:
+        (low, low_open), (high, high_open) = _bound(low), _bound(high)
+        return [
+            (score, member) for score, member in self._ordered.get(name, [])
+            if (score > low if low_open else score >= low) and (score < high if high_open else score <= high)
+        ]
+
+    def zrevrangebyscore(
+        self, name: str, max: Score, min: Score, start: Optional[int] = None, num: Optional[int] = None
+    ) -> List[bytes]:
+        with self._lock:
+            members = [member for _, member in reversed(self._range(name, min, max))]
+        if start is not None:
+            members = members[start:start + num if num is not None else None]
+        return members
+
+    def zcount(self, name: str, min: Score, max: Score) -> int:
+        with self._lock:
+            return len(self._range(name, min, max))
+
+    def pipeline(self, transaction: bool = False) -> "_LocalPipeline":
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    """Queues commands and runs them together on ``execute``, like a redis-py pipeline."""
+
+    def __init__(self, kv: Union[LocalKV, "SQLiteKV"]):
+        self._kv = kv
+        self._calls: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, command: str):
+        if not hasattr(self._kv, command):
+            raise AttributeError(command)
+
+        def queue(*args, **kwargs) -> "_LocalPipeline":
+            self._calls.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        calls, self._calls = self._calls, []
+        with self._kv._lock:
+            return [getattr(self._kv, command)(*args, **kwargs) for command, args, kwargs in calls]
+
+    def __enter__(self) -> "_LocalPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._calls = []
+
+
+PURGE_SECONDS = 3600.0  # how often writes delete expired rows from the SQLite file
+
+STRINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS strings_expires ON strings (expires);
+"""
+
+
+class SQLiteKV(Database):
+    """
+    The string commands (get, set with ``ex``/``nx``, mget) on a SQLite file.
+
+    Stands in for Redis where every process on one host must see the same
+    entries — the UI and standalone workers share the verdict cache through it.
+    Expired rows are misses on every read; they are deleted when the file is
+    opened and, at most every ``PURGE_SECONDS``, by a write.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        super().__init__(path, STRINGS_SCHEMA)
+        self._lock = threading.RLock()  # held by pipelines
+        self._purged = time.time()
+        with self._transaction() as db:
+            db.execute("DELETE FROM strings WHERE expires < ?", (self._purged,))
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        rows = self._connect().execute(
+            f"SELECT key, value FROM strings WHERE key IN ({','.join('?' * len(keys))})"
+            " AND (expires IS NULL OR expires > ?)",
+            (*keys, time.time()),
+        )
+        found = {row["key"]: bytes(row["value"]) for row in rows}
+        return [found.get(key) for key in keys]
+
+    def get(self, name: str) -> Optional[bytes]:
+        return self.mget([name])[0]
+
+    def set(self, name: str, value: Any, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        now = time.time()
+        with self._transaction() as db:
+            if now - self._purged >= PURGE_SECONDS:
+                self._purged = now
+                db.execute("DELETE FROM strings WHERE expires < ?", (now,))
+            if nx and db.execute(
+                "SELECT 1 FROM strings WHERE key = ? AND (expires IS NULL OR expires > ?)", (name, now)
+            ).fetchone():
+                return None
+            db.execute(
+                "INSERT OR REPLACE INTO strings (key, value, expires) VALUES (?, ?, ?)",
+                (name, _encode(value), now + ex if ex is not None else None),
+            )
+            return True
+
+    def pipeline(self, transaction: bool = False) -> "_LocalPipeline":
+        return _LocalPipeline(self)
+
+
+def _import_redis():
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError("KINETIC_REDIS_URL is set but the redis package is missing: pip install redis")
+    return redis
+
+
+@lru_cache(maxsize=None)
+def shared_backend(url: Optional[str] = REDIS_URL):
+    """
+    The process-wide backend: a Redis client for ``url``, else the local stand-in.
+
+    Both expose the same commands, including ``pipeline()`` for batching.
+    """
+    if url:
+        if not SIGNING_KEY:
+            raise RuntimeError("KINETIC_REDIS_URL is set but KINETIC_SIGNING_KEY is not (the same secret on every replica)")
+        return _import_redis().Redis.from_url(url)
+    return LocalKV()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SIGNED VALUES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TamperedValue(ValueError):
+    """A sealed value whose HMAC does not match (written without the signing key)."""
+
+
+@lru_cache(maxsize=None)
+def signing_key() -> bytes:
+    """``KINETIC_SIGNING_KEY``, else a random key created once in the data directory."""
+    if SIGNING_KEY:
+        return SIGNING_KEY.encode("utf-8")
+    if not KEY_FILE.exists():
+        KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and linked into place, so no process ever reads a partial key
+        partial = KEY_FILE.with_name(f"{KEY_FILE.name}.{os.getpid()}.{threading.get_ident()}")
+        with os.fdopen(os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as file:
+            file.write(secrets.token_bytes(32))
+        try:
+            os.link(partial, KEY_FILE)
+        except FileExistsError:
+            pass  # another process made it first
+        finally:
+            partial.unlink()
+    return KEY_FILE.read_bytes()
+
+
+def seal(value: Any) -> bytes:
+    """Pickle, compress and sign a value for the backend."""
+    blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return hmac.new(signing_key(), blob, hashlib.sha256).digest() + blob
+
+
+def unseal(sealed: bytes) -> Any:
+    """
+    Inverse of ``seal``; the signature is checked before anything is unpickled.
+
+    Raises:
+        TamperedValue: Missing or wrong signature
+    """
+    tag, blob = sealed[:TAG_BYTES], sealed[TAG_BYTES:]
+    if not hmac.compare_digest(tag, hmac.new(signing_key(), blob, hashlib.sha256).digest()):
+        raise TamperedValue("signature mismatch")
+    return pickle.loads(zlib.decompress(blob))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NEAR-CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class NearCache:
+    """
+    Small per-process LRU with a TTL, in front of the shared backend.
+
+    Only immutable entries (finished audits, stored records) are near-cached,
+    so the TTL bounds memory and staleness of deletions, not of updates.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,165 @@
+"""
+📥 Bomb-Safe Lazy Image Loader
+Sniff, bound and defer: nothing is decoded until something actually needs pixels.
+"""
+
+import hashlib
+import io
+import warnings
+from functools import cached_property
+from typing import Optional, Tuple, Union
+
+from PIL import Image
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LIMITS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024  # Gemini inline-data limit
+MAX_PIXELS = 50_000_000  # ~50MP covers every consumer sensor; anything larger is a bomb
+PREVIEW_SIDE = 1280
+
+# Formats the model accepts as-is; anything else is re-encoded by the SDK
+PASSTHROUGH_MIME = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+SUPPORTED_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+
+
+class ImageLoadError(ValueError):
+    """Upload rejected before or during decode; message is safe to show users."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FORMAT SNIFFING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """
+    Identify the container from magic bytes, ignoring the filename.
+
+    Args:
+        data: Leading bytes of the file (at least 12)
+
+    Returns:
+        PIL format name ("JPEG", "PNG", "GIF", "WEBP") or None if unrecognised
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LAZY SOURCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ImageSource:
+    """
+    Validated upload whose pixels are decoded on demand.
+
+    Only the header is parsed at construction. ``preview`` decodes at reduced
+    resolution (JPEG DCT draft scaling), ``image`` performs the one full decode.
+    """
+
+    def __init__(self, data: bytes, image_format: str, size: Tuple[int, int], animated: bool = False):
+        self.data = data
+        self.format = image_format
+        self.size = size
+        self.animated = animated
+
+    @cached_property
+    def sha256(self) -> str:
+        """Content hash of the upload bytes (keys cached decodes and results)."""
+        return hashlib.sha256(self.data).hexdigest()
+
+    def open(self) -> Image.Image:
+        """Fresh, undecoded PIL handle over the in-memory bytes."""
+        return Image.open(io.BytesIO(self.data), formats=[self.format])
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """Full-resolution decode (first frame for animations)."""
+        image = self.open()
+        image.load()
+        return image
+
+    @cached_property
+    def preview(self) -> Image.Image:
+        """
+        Display-sized RGB decode, at most ``PREVIEW_SIDE`` per side.
+
+        JPEGs use draft mode so the decoder skips DCT coefficients instead of
+        decoding full resolution and downscaling.
+        """
+        if "image" in self.__dict__:
+            image = self.image.copy()
+        else:
+            image = self.open()
+            if self.format == "JPEG":
+                image.draft("RGB", (PREVIEW_SIDE, PREVIEW_SIDE))
+        image.thumbnail((PREVIEW_SIDE, PREVIEW_SIDE))
+        return image if image.mode in ("RGB", "RGBA", "L") else image.convert("RGB")
+
+    def model_part(self) -> Union[dict, Image.Image]:
+        """
+        Payload for ``generate_content``.
+
+        JPEG/PNG/WebP stills are sent as their original bytes — no decode and no
+        lossless re-encode. Other inputs fall back to the decoded first frame.
+        """
+        if self.format in PASSTHROUGH_MIME and not self.animated:
+            return {"mime_type": PASSTHROUGH_MIME[self.format], "data": self.data}
+        return self.image
+
+
+def load_image(
+    data: bytes,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    max_pixels: int = MAX_PIXELS,
+) -> ImageSource:
+    """
+    Validate raw upload bytes without decoding pixel data.
+
+    Checks run cheapest-first: byte size, magic bytes, then header dimensions
+    against a pixel budget (decompression bombs are tiny files with huge headers).
+
+    Args:
+        data: Complete file contents
+        max_bytes: Maximum accepted file size
+        max_pixels: Maximum width × height of a single frame
+
+    Returns:
+        ImageSource ready for lazy decoding
+
+    Raises:
+        ImageLoadError: If the upload is rejected
+    """
+    if len(data) > max_bytes:
+        raise ImageLoadError(f"Image too large. Maximum size: {max_bytes // (1024 * 1024)}MB")
+
+    image_format = sniff_format(data[:16])
+    if image_format not in SUPPORTED_FORMATS:
+        raise ImageLoadError(f"Unrecognised image data. Supported: {', '.join(SUPPORTED_FORMATS)}")
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            header = Image.open(io.BytesIO(data), formats=[image_format])
+            width, height = header.size
+            animated = bool(getattr(header, "is_animated", False))  # GIF/APNG/WebP: reads at most 2 frames
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning):
+        raise ImageLoadError("Image rejected: pixel dimensions exceed the decompression-bomb limit")
+    except Exception as e:
+        raise ImageLoadError(f"Corrupt or unreadable {image_format} header: {e}")
+
+    if width * height > max_pixels:
+        raise ImageLoadError(
+            f"Image rejected: {width} × {height} exceeds the {max_pixels / 1e6:.0f}MP decode budget"
+        )
+
+    return ImageSource(data, image_format, (width, height), animated)
@@ -0,0 +1,144 @@
+"""
+🗺️ Forensic Overlays
+Locally computed diagnostic images — Fourier spectrum, noise-level map, error
+level analysis — attached to the model call so it reads measured evidence
+instead of estimating it from raw pixels.
+"""
+
+import io
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+from PIL import Image, ImageChops
+
+from kinetic.workspace import ImageWorkspace
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+OVERLAY_SIDE = 384  # ≤384px per side costs the minimum image tokens per overlay
+TOKENS_PER_OVERLAY = 258
+ELA_QUALITY = 90
+
+
+@dataclass
+class Overlay:
+    """One rendered diagnostic image and how the model should read it."""
+    name: str
+    image: Image.Image
+    legend: str
+
+
+@dataclass
+class OverlaySet:
+    """Rendered overlays plus their local cost."""
+    overlays: List[Overlay] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def images(self) -> List[Image.Image]:
+        return [overlay.image for overlay in self.overlays]
+
+    @property
+    def estimated_tokens(self) -> int:
+        return TOKENS_PER_OVERLAY * len(self.overlays)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RENDERING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _to_image(plane: np.ndarray, low: float = 1.0, high: float = 99.5) -> Image.Image:
+    """Percentile-stretch a 2-D plane to 8-bit grayscale at overlay size."""
+    lo, hi = np.percentile(plane, [low, high])
+    scaled = np.clip((plane - lo) / max(hi - lo, 1e-6), 0.0, 1.0)
+    image = Image.fromarray((scaled * 255).astype(np.uint8))
+    image.thumbnail((OVERLAY_SIDE, OVERLAY_SIDE), Image.BILINEAR)
+    return image
+
+
+def _block_reduce(plane: np.ndarray, reducer: Callable) -> np.ndarray:
+    """Reduce blocks so the longest side fits ``OVERLAY_SIDE`` (keeps local extremes visible)."""
+    block = max(1, -(-max(plane.shape[:2]) // OVERLAY_SIDE))
+    rows, cols = plane.shape[0] // block, plane.shape[1] // block
+    blocks = plane[:rows * block, :cols * block].reshape(rows, block, cols, block, *plane.shape[2:])
+    return reducer(blocks, axis=(1, 3))
+
+
+def spectrum_overlay(workspace: ImageWorkspace) -> Overlay:
+    return Overlay(
+        "spectrum",
+        _to_image(workspace.spectrum),
+        "Centred log-magnitude Fourier spectrum of the central crop. Natural photos fall off smoothly (1/f) "
+        "from the centre; isolated bright off-axis peaks or a regular lattice indicate upsampling or latent-grid "
+        "artifacts. A bright horizontal/vertical cross is normal (image borders).",
+    )
+
+
+def noise_overlay(workspace: ImageWorkspace) -> Overlay:
+    return Overlay(
+        "noise",
+        _to_image(_block_reduce(workspace.residual, np.std)),
+        "Noise-level map: high-pass residual standard deviation per block (brighter = noisier). Camera noise "
+        "is signal-dependent and fairly uniform within a surface; flat black patches, sharp-edged noise regions "
+        "or shadows cleaner than highlights are suspicious.",
+    )
+
+
+def ela_overlay(workspace: ImageWorkspace) -> Overlay:
+    original = Image.fromarray(workspace.rgb)
+    buffer = io.BytesIO()
+    original.save(buffer, format="JPEG", quality=ELA_QUALITY)
+    buffer.seek(0)
+    error = np.asarray(ImageChops.difference(original, Image.open(buffer)).convert("L"))
+    return Overlay(
+        "ela",
+        _to_image(_block_reduce(error, np.max).astype(np.float32), low=0.0),
+        f"Error level analysis (re-saved at JPEG Q{ELA_QUALITY}, brighter = larger error). Consistent "
+        f"compression history gives error that follows edges and texture evenly; regions with clearly "
+        f"different brightness and sharp boundaries suggest edits or composites.",
+    )
+
+
+OVERLAYS: Dict[str, Callable[[ImageWorkspace], Overlay]] = {
+    "spectrum": spectrum_overlay,
+    "noise": noise_overlay,
+    "ela": ela_overlay,
+}
+
+
+def render_overlays(workspace: ImageWorkspace, names: Sequence[str] = tuple(OVERLAYS)) -> OverlaySet:
+    """
+    Render the requested overlays, then drop the planes only they needed.
+
+    Args:
+        workspace: Shared decoded image
+        names: Overlay names from ``OVERLAYS``
+
+    Returns:
+        OverlaySet in the requested order
+    """
+    start = time.perf_counter()
+    overlays = [OVERLAYS[name](workspace) for name in names]
+    workspace.release("luma", "residual", "spectrum")
+    return OverlaySet(overlays, time.perf_counter() - start)
+
+
+def overlays_prompt_addendum(overlay_set: OverlaySet) -> str:
+    """Prompt text describing the attached overlays, in attachment order."""
+    listing = "\n".join(
+        f"{number}. **{overlay.name}** — {overlay.legend}" for number, overlay in enumerate(overlay_set.overlays, 1)
+    )
+    return f"""
+---
+
+## 🗺️ FORENSIC OVERLAYS
+
+The LAST {len(overlay_set.overlays)} attached images are diagnostic overlays computed locally from the full-resolution image (not photographs), in this order:
+{listing}
+
+Use them as measured evidence for the frequency, noise and compression tests, and cite them when you do.
+"""
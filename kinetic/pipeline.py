@@ -0,0 +1,499 @@
+"""
+🧪 Audit Pipeline
+One image audit end to end — decode, local analyzers, payload build, routed
+model call, zoom verification — with no Streamlit calls, so it runs the same
+on a queue worker process as on an embedded worker thread.
+
+The Analysis tab only chooses ``AuditOptions`` and renders the resulting
+``AuditOutcome``; both are plain dataclasses that survive a trip through the
+job queue.
+"""
+
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field, replace
+from typing import Any, List, Mapping, Optional, Tuple, Union
+
+import google.generativeai as genai
+from PIL import Image
+
+from kinetic import aio
+from kinetic.analyzers import AnalyzerReport, submit_analyzers
+from kinetic.breaker import DEGRADED_DEADLINE, local_only_report
+from kinetic.costs import TRUNCATED, Spend
+from kinetic.deadline import AuditAborted, Deadline, wait_for
+from kinetic.fanout import run_tier_fanout
+from kinetic.frames import (
+    FrameAudit,
+    FramePlan,
+    combined_suspicion,
+    frames_prompt_addendum,
+    iter_frames,
+    plan_frames,
+    submit_frame_analysis,
+)
+from kinetic.hedging import Completion, generate_hedged, stream_completion, tokens_by_model
+from kinetic.keypool import PooledModel, key_pool, parse_keys
+from kinetic.overlays import OverlaySet, overlays_prompt_addendum, render_overlays
+from kinetic.protocol import load_protocol
+from kinetic.regions import crops_prompt_addendum, propose_regions, region_crops
+from kinetic.router import DEFAULT_MODEL, ESCALATION_MODEL, STATS, ModelRouter, RoutedResult
+from kinetic.scene import SceneProfile, assemble_prompt, classify_scene
+from kinetic.scheduler import breaker_for, estimate_request_tokens, model_name
+from kinetic.singleflight import FLIGHTS, content_key
+from kinetic.tracing import Span, record, span
+from kinetic.verdicts import Verdict, combine_verdicts, local_suspicion, parse_verdict
+from kinetic.workspace import ImageWorkspace
+from kinetic.zoom import ZoomVerification, coordinate_instruction, submit_zoom_verification
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Generation config for deterministic, objective analysis
+GENERATION_CONFIG = {
+    "temperature": 0.0,  # Deterministic output
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+}
+
+# Economy mode (budget nearly spent): a short structured report under a lower cap
+ECONOMY_OUTPUT_TOKENS = 2048
+ECONOMY_ADDENDUM = """
+
+## ECONOMY MODE
+Keep the report short and structured: the FINAL VERDICT block first, then one
+line per tier with its red-flag count and the single strongest finding. No
+narrative and no per-check commentary.
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MODELS & OPTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class ModelSettings:
+    """Which keys and models an audit uses, read from secrets or the environment."""
+    api_keys: Tuple[str, ...]
+    model: str = DEFAULT_MODEL
+    escalation_model: str = ESCALATION_MODEL
+    hedge_model: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "ModelSettings":
+        """
+        Args:
+            config: ``st.secrets`` or any mapping with the same keys (GEMINI_API_KEYS
+                or GEMINI_API_KEY, GEMINI_MODEL, GEMINI_ESCALATION_MODEL, GEMINI_HEDGE_MODEL)
+        """
+        return cls(
+            api_keys=tuple(parse_keys(config.get("GEMINI_API_KEYS") or config.get("GEMINI_API_KEY"))),
+            model=config.get("GEMINI_MODEL") or DEFAULT_MODEL,
+            escalation_model=config.get("GEMINI_ESCALATION_MODEL") or ESCALATION_MODEL,
+            hedge_model=config.get("GEMINI_HEDGE_MODEL") or None,
+        )
+
+
+@dataclass
+class AuditModels:
+    """Pooled models one audit may call."""
+    model: PooledModel
+    router: ModelRouter
+    hedge_model: Optional[PooledModel] = None
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Primary, escalation and hedge model names (empty when there is no hedge model)."""
+        hedge = model_name(self.hedge_model) if self.hedge_model is not None else ""
+        return model_name(self.model), self.router.escalation_name, hedge
+
+
+def build_models(settings: ModelSettings) -> AuditModels:
+    """
+    Pooled models for ``settings`` (clients are shared per key set within the process).
+
+    Raises:
+        ValueError: No API key is configured
+    """
+    pool = key_pool(settings.api_keys)
+    model = pool.model(settings.model, generation_config=GENERATION_CONFIG)
+    escalation = pool.model(settings.escalation_model, generation_config=GENERATION_CONFIG)
+    hedge_model = pool.model(settings.hedge_model, generation_config=GENERATION_CONFIG) if settings.hedge_model else None
+    return AuditModels(model, ModelRouter(model, escalation), hedge_model)
+
+
+@dataclass(frozen=True)
+class AuditOptions:
+    """The analyst's toggles for one audit (JSON-serializable for the job queue)."""
+    fanout: bool = False  # concurrent tier calls with early exit
+    zoom: bool = True  # re-check cited coordinates on native-resolution crops
+    overlays: bool = False  # attach spectrum/noise/ELA maps (single-call mode)
+    hedge: bool = False  # duplicate late requests (single-call mode)
+    high_stakes: bool = False  # go straight to the escalation model
+    economy: bool = False  # budget mode: fast model only, display-sized image, short report
+
+    def economized(self) -> "AuditOptions":
+        """The cheapest variant: one fast-model call on a smaller payload, no extra passes."""
+        return replace(self, fanout=False, zoom=False, overlays=False, hedge=False, high_stakes=False, economy=True)
+
+
+def typical_audit_time(router: ModelRouter) -> Optional[float]:
+    """Mean latency of the default route so far (used to value cancellations)."""
+    for name, route in STATS.snapshot():
+        if name == router._name(router.primary) and route.calls:
+            return route.mean_latency
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MODEL CALLS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_forensic_audit(
+    model: genai.GenerativeModel,
+    image: Union[Image.Image, dict, List[Union[Image.Image, dict]]],
+    prompt_suffix: str = "",
+    prompt: Optional[str] = None,
+    usage: Optional[dict] = None,
+    hedge: bool = False,
+    hedge_model: Optional[genai.GenerativeModel] = None,
+    max_output_tokens: Optional[int] = None,
+) -> Tuple[bool, str]:
+    """
+    Execute the forensic audit using Gemini 1.5 Pro with UPL protocol.
+
+    Args:
+        model: Initialized Gemini model
+        image: PIL Image or inline blob ({"mime_type", "data"}) to analyze,
+            or a list of them (animation frames, detail crops)
+        prompt_suffix: Extra instructions appended to the UPL prompt
+        prompt: Protocol to use instead of the full UPL prompt
+        usage: If given, filled with prompt/image/output tokens of the call and
+            whether the report hit the output cap (``truncated``)
+        hedge: Stream the call and fire a duplicate if the first chunk is late
+        hedge_model: Model for the duplicate request (defaults to ``model``)
+        max_output_tokens: Lower output cap than the model's (single-call mode)
+
+    Returns:
+        Tuple of (success: bool, result: str)
+    """
+    try:
+        # Prepare the prompt
+        upl_prompt = (prompt or load_protocol().text) + prompt_suffix
+        images = image if isinstance(image, list) else [image]
+        contents = [upl_prompt, *images]
+        config = {"generation_config": {"max_output_tokens": max_output_tokens}} if max_output_tokens else {}
+
+        def generate() -> Tuple[Completion, List[Completion], Optional[str]]:
+            if hedge:
+                hedged = generate_hedged(model, contents, hedge_model, **config)
+                return hedged.completion, hedged.losers, hedged.winner if hedged.hedged else None
+            # Streamed so time-to-first-token is measured; waits for RPM/TPM budget and
+            # retries 429/5xx, on the shared loop so a cancelled audit aborts the request
+            return aio.run(stream_completion(model, contents, **config)), [], None
+
+        # Identical concurrent requests (same bytes, same protocol version) share one call
+        key = content_key(load_protocol().fingerprint, model.model_name, str(max_output_tokens or ""), contents)
+        (completion, losers, hedge_winner), shared = FLIGHTS.do(key, generate)
+        text = completion.text
+        if not shared:
+            began = time.perf_counter() - completion.latency
+            record("model_ttft", completion.ttft, completion.model, began)
+            record("model_total", completion.latency, completion.model, began)
+
+        if usage is not None:
+            # Followers spent nothing; the leader's session accounts for the tokens
+            if shared:
+                usage["prompt_tokens"], usage["output_tokens"] = 0, 0
+            else:
+                # Priced per model that ran: a hedge may win on another model, and its loser was billed too
+                usage["models"] = tokens_by_model([completion, *losers])
+                usage["prompt_tokens"] = sum(prompt for prompt, _ in usage["models"].values())
+                usage["output_tokens"] = sum(output for _, output in usage["models"].values())
+            usage["image_tokens"] = 0 if shared else estimate_request_tokens(images) * (1 + len(losers))
+            usage["truncated"] = completion.finish_reason == TRUNCATED
+            usage["coalesced"] = shared
+            if hedge:
+                usage["hedge"] = hedge_winner
+
+        if not text:
+            return False, "⚠️ No response received from the model. The image may be blocked by safety filters."
+
+        return True, text
+
+    except AuditAborted:
+        raise
+
+    except Exception as e:
+        error_msg = f"❌ **Forensic Audit Failed**\n\n**Error Type**: {type(e).__name__}\n\n**Details**: {str(e)}"
+        return False, error_msg
+
+
+def run_fanout_audit(
+    model: genai.GenerativeModel,
+    image: Union[Image.Image, dict],
+    prompt: Optional[str] = None,
+    usage: Optional[dict] = None,
+) -> Tuple[bool, str]:
+    """
+    Execute the UPL protocol as concurrent tier-focused calls with early exit.
+
+    Args:
+        model: Initialized Gemini model
+        image: PIL Image or inline blob ({"mime_type", "data"}) to analyze
+        prompt: Protocol to split instead of the full UPL prompt
+        usage: If given, filled with prompt/image/output tokens summed over the tier calls
+
+    Returns:
+        Tuple of (success: bool, result: str)
+    """
+    try:
+        with span("model_total", model_name(model)):
+            fanout = run_tier_fanout(model, prompt or load_protocol().text, image)
+        if usage is not None:
+            usage["prompt_tokens"] = sum(tier.prompt_tokens for tier in fanout.tiers)
+            usage["output_tokens"] = sum(tier.output_tokens for tier in fanout.tiers)
+            usage["image_tokens"] = estimate_request_tokens([image]) * sum(tier.prompt_tokens > 0 for tier in fanout.tiers)
+
+        if not fanout.succeeded:
+            failures = "\n".join(f"- {tier.spec.title}: {tier.summary}" for tier in fanout.tiers)
+            return False, f"❌ **Forensic Audit Failed**\n\nNo tier returned a result:\n\n{failures}"
+
+        skipped = sum(tier.status == "cancelled" for tier in fanout.tiers)
+        header = (
+            f"*⚡ {len(fanout.tiers)} parallel tier calls · {fanout.total_tokens:,} tokens"
+            + (f" · {skipped} cancelled by early exit*" if skipped else "*")
+        )
+        return True, f"{header}\n\n{fanout.to_markdown()}"
+
+    except AuditAborted:
+        raise
+
+    except Exception as e:
+        error_msg = f"❌ **Forensic Audit Failed**\n\n**Error Type**: {type(e).__name__}\n\n**Details**: {str(e)}"
+        return False, error_msg
+
+
+def build_still_request(
+    workspace: ImageWorkspace, economy: bool = False
+) -> Tuple[str, List[Union[Image.Image, dict]], str, SceneProfile]:
+    """
+    Assemble protocol, image parts and prompt suffix for a still image.
+
+    The scene router trims the protocol to the sections that apply to the
+    image; detected faces/hands are attached as native-resolution crops.
+
+    Args:
+        workspace: Shared workspace of the upload
+        economy: Send the display-sized preview and no crops (fewer image tiles)
+
+    Returns:
+        Tuple of (protocol, image parts, prompt suffix, scene profile)
+    """
+    parts = [workspace.preview if economy else workspace.source.model_part()]
+    suffix = ""
+
+    regions = propose_regions(workspace)
+    profile = classify_scene(workspace, regions)
+    protocol = assemble_prompt(load_protocol().text, profile)
+    if regions and not economy:
+        crops = region_crops(workspace.image, regions)
+        parts += [crop for _, crop in crops]
+        suffix += crops_prompt_addendum(crops)
+
+    return protocol, parts, suffix, profile
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AUDIT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class AuditOutcome:
+    """Everything the Analysis tab renders for one finished image audit."""
+    success: bool
+    result: str
+    elapsed_time: float
+    animated: bool = False
+    routed: Optional[RoutedResult] = None
+    degraded_reason: Optional[str] = None  # set when the circuit was open and no model was consulted
+    fanout: bool = False
+    profile: Optional[SceneProfile] = None
+    protocol: Optional[str] = None
+    overlay_set: Optional[OverlaySet] = None
+    local_reports: List[AnalyzerReport] = field(default_factory=list)
+    local_wall_time: float = 0.0
+    zoom_result: Optional[ZoomVerification] = None
+    zoom_time: float = 0.0
+    plan: Optional[FramePlan] = None
+    frame_audits: List[FrameAudit] = field(default_factory=list)
+    model_name: Optional[str] = None  # model that produced the final report
+    fanout_usage: dict = field(default_factory=dict)
+    routed_usage: List[Tuple[str, dict]] = field(default_factory=list)  # (model, usage) per routed call so far
+    trace: List[Span] = field(default_factory=list)  # stage timings (set by the worker)
+    profiled: bool = False  # a cProfile/tracemalloc capture is stored under the job id
+
+    @property
+    def degraded(self) -> bool:
+        return self.degraded_reason is not None
+
+    @property
+    def model_report(self) -> str:
+        """The model's report text ("" if the call failed or the verdict is local-only)."""
+        return self.result if self.success and not self.degraded else ""
+
+    def verdict(self) -> Optional[Verdict]:
+        """Final verdict as shown to the analyst (animations fold in per-frame local evidence)."""
+        if self.animated:
+            return combine_verdicts(parse_verdict(self.model_report), combined_suspicion(self.frame_audits))
+        return parse_verdict(self.result) if self.success else None
+
+    def spend(self) -> Spend:
+        """Tokens and list-price cost over every model call of the audit, zoom pass included."""
+        spend = Spend(audits=1)
+        # Calls the router finished count even if the audit was aborted before it returned
+        calls = (
+            [(attempt.model_name, attempt.usage) for attempt in self.routed.attempts]
+            if self.routed is not None else self.routed_usage
+        )
+        for name, usage in calls:
+            spend.add(name, usage)
+        if self.fanout_usage:
+            spend.add(self.model_name, self.fanout_usage)
+        if self.zoom_result is not None:
+            spend.add(self.zoom_result.model_name, vars(self.zoom_result))
+        return spend
+
+
+def execute_audit(
+    workspace: ImageWorkspace,
+    models: AuditModels,
+    options: AuditOptions,
+    deadline: Deadline,
+    outcome: Optional[AuditOutcome] = None,
+) -> AuditOutcome:
+    """
+    Run one image audit end to end (on a queue worker, without Streamlit calls).
+
+    Every stage boundary checks ``deadline``; model calls below pick it up from
+    the context and are cancelled with it.
+
+    Args:
+        workspace: Decoded upload
+        models: Default model, router and hedge model
+        options: Analyst's audit toggles
+        deadline: End-to-end budget (also current via ``deadline_scope``)
+        outcome: If given, filled in place — after an abort it still holds the
+            usage of the model calls that finished, so they can be charged
+
+    Raises:
+        AuditAborted: The audit was cancelled or ran out of time
+    """
+    model, router, hedge_model = models.model, models.router, models.hedge_model
+    fanout_mode, zoom_mode, overlay_mode = options.fanout, options.zoom, options.overlays
+    hedge_mode, high_stakes = options.hedge, options.high_stakes
+    output_cap = None
+    if options.economy:
+        # Budget nearly spent: no escalation, and a short report under a lower cap
+        router, output_cap = ModelRouter(router.primary), ECONOMY_OUTPUT_TOKENS
+    start_time = time.time()
+    outcome = outcome if outcome is not None else AuditOutcome(False, "", 0.0)
+    outcome.animated, outcome.fanout = workspace.source.animated, fanout_mode
+
+    def routed_call(routed_model, usage: dict, image, prompt_suffix: str, prompt: Optional[str]) -> Tuple[bool, str]:
+        outcome.routed_usage.append((model_name(routed_model), usage))  # filled once the call completes
+        return run_forensic_audit(routed_model, image, prompt_suffix, prompt, usage, hedge_mode, hedge_model, output_cap)
+    # While the endpoint's circuit is open, answer from local checks instead of waiting
+    breaker = breaker_for(router.escalation if high_stakes and router.escalation is not None else model)
+    if workspace.source.animated:
+        # Hash pass first, then only the representative frames are decoded
+        deadline.check("frame hashing")
+        with span("frame_hashing"):
+            plan = outcome.plan = plan_frames(workspace.source)
+        frame_run = submit_frame_analysis(workspace.source, plan.selected_indices)
+        deadline.check("frame decode")
+        with span("decode"):
+            frames = [frame for _, frame in iter_frames(workspace.source, plan.selected_indices)]
+        addendum = frames_prompt_addendum(plan, workspace.source.format) + (ECONOMY_ADDENDUM if options.economy else "")
+        deadline.check("model call")
+        if not breaker.is_open:
+            outcome.routed = router.run(
+                lambda routed_model, usage: routed_call(routed_model, usage, frames, addendum, None), high_stakes
+            )
+            outcome.success, outcome.result = outcome.routed.success, outcome.routed.text
+            outcome.model_name = outcome.routed.final.model_name
+        degraded = not outcome.success and breaker.is_open
+        del frames
+        outcome.elapsed_time = time.time() - start_time
+        deadline.check("frame analysis")
+        try:
+            with span("local_analyzers"):
+                outcome.frame_audits = wait_for(frame_run, DEGRADED_DEADLINE if degraded else None)
+        except FutureTimeout:
+            outcome.frame_audits = []
+        if degraded:
+            findings = [
+                (f"Frame #{audit.index}", f"suspicion {audit.suspicion:.0%}")
+                for audit in outcome.frame_audits if audit.suspicion is not None
+            ]
+            outcome.success, outcome.degraded_reason = True, breaker.reason or "circuit open"
+            outcome.result = local_only_report(combined_suspicion(outcome.frame_audits), findings, breaker.reason)
+        return outcome
+
+    deadline.check("payload")
+    # Local checks run in worker processes while the model call is in flight. Leaving
+    # the block early (abort, error) frees their shared memory and cancels the zoom call
+    zoom_run = None
+    with submit_analyzers(workspace) as local_run:
+        try:
+            with span("payload_build"):
+                protocol, parts, suffix, outcome.profile = build_still_request(workspace, options.economy)
+            outcome.protocol = protocol
+            deadline.check("model call")
+            if breaker.is_open:
+                pass
+            elif fanout_mode:
+                outcome.success, outcome.result = run_fanout_audit(model, parts[0], protocol, outcome.fanout_usage)
+                outcome.model_name = model.name
+            else:
+                if overlay_mode:
+                    with span("overlays"):
+                        outcome.overlay_set = render_overlays(workspace)
+                if outcome.overlay_set is not None:
+                    parts += outcome.overlay_set.images
+                    suffix += overlays_prompt_addendum(outcome.overlay_set)
+                if zoom_mode:
+                    suffix += coordinate_instruction(workspace.size)
+                if options.economy:
+                    suffix += ECONOMY_ADDENDUM
+                outcome.routed = router.run(
+                    lambda routed_model, usage: routed_call(routed_model, usage, parts, suffix, protocol), high_stakes
+                )
+                outcome.success, outcome.result = outcome.routed.success, outcome.routed.text
+                outcome.model_name = outcome.routed.final.model_name
+            degraded = not outcome.success and breaker.is_open
+            # Second pass overlaps the remaining local analysis
+            zoom_run = (
+                submit_zoom_verification(model, workspace.image, outcome.result)
+                if outcome.success and zoom_mode else None
+            )
+            outcome.elapsed_time = time.time() - start_time
+            deadline.check("local analysis")
+            outcome.local_reports = local_run.collect(DEGRADED_DEADLINE if degraded else None)
+            outcome.local_wall_time = local_run.wall_time
+            record("local_analyzers", local_run.wall_time, started=local_run.started)
+            if degraded:
+                findings = [(report.name, report.summary) for report in outcome.local_reports if report.status == "ok"]
+                outcome.success, outcome.degraded_reason = True, breaker.reason or "circuit open"
+                outcome.result = local_only_report(local_suspicion(outcome.local_reports), findings, breaker.reason)
+            deadline.check("zoom verification")
+            outcome.zoom_result = wait_for(zoom_run) if zoom_run is not None else None
+            outcome.zoom_time = time.time() - start_time
+            if outcome.zoom_result is not None:
+                record("zoom_verify", outcome.zoom_result.latency, outcome.zoom_result.model_name)
+            return outcome
+        finally:
+            if zoom_run is not None and not zoom_run.done():
+                zoom_run.cancel()
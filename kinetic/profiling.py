@@ -0,0 +1,202 @@
+"""
+🔬 Audit Profiling
+Debug switch that runs one audit under cProfile and tracemalloc, for images
+that are slow or blow up memory in ways that do not reproduce locally.
+
+Turn it on per request with ``?profile=1`` in the page URL, or for every
+audit a worker runs with ``KINETIC_PROFILE=1``. The capture — a pstats dump,
+the same profile as collapsed stacks for flame graphs, the top allocation
+sites and peak traced memory — is stored with the audit record. When the
+switch is off no profiler or allocation tracing is started at all.
+
+cProfile sees the worker thread (decode, payload build, local-analysis and
+model waits); work on the shared event loop and analyzer processes shows up
+as time spent waiting on them. tracemalloc is process-wide. Only one audit
+per process is profiled at a time (Python 3.12+ allows a single active
+profiler); one that asks while another is profiled runs unprofiled.
+"""
+
+import cProfile
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import StringIO
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PROFILE_ALL = os.environ.get("KINETIC_PROFILE", "") not in ("", "0")
+TOP_ALLOCATIONS = 25  # allocation sites kept per profile
+TOP_FUNCTIONS = 30  # rows of the cumulative-time summary
+MAX_STACK_DEPTH = 64
+MIN_STACK_SECONDS = 0.0005  # collapsed stacks cheaper than this are dropped
+
+_PROFILER_LOCK = threading.Lock()  # held by the one profiled audit of this process
+_TRACEMALLOC_LOCK = threading.Lock()
+_TRACEMALLOC_USERS = 0  # concurrent profiled audits in this process
+
+FunctionKey = Tuple[str, int, str]  # pstats (file, line, function)
+
+
+@dataclass
+class AllocationSite:
+    """Memory still allocated from one source line when the audit finished."""
+    location: str  # file:line
+    size: int  # bytes
+    count: int  # blocks
+
+
+@dataclass
+class AuditProfile:
+    """Everything captured for one profiled audit."""
+    pstats: bytes  # marshal dump, loads with pstats.Stats(path), snakeviz, flameprof
+    folded: str  # collapsed stacks in microseconds (flamegraph.pl, speedscope)
+    summary: str  # top functions by cumulative time
+    allocations: List[AllocationSite] = field(default_factory=list)
+    peak_memory: int = 0  # bytes traced at the peak
+    wall_time: float = 0.0
+
+
+class ProfileCapture:
+    """Filled with the ``AuditProfile`` when the profiled block exits."""
+
+    def __init__(self):
+        self.profile: Optional[AuditProfile] = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAPTURE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _start_tracemalloc() -> None:
+    global _TRACEMALLOC_USERS
+    with _TRACEMALLOC_LOCK:
+        if _TRACEMALLOC_USERS == 0:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+        _TRACEMALLOC_USERS += 1
+
+
+def _stop_tracemalloc() -> Tuple[tracemalloc.Snapshot, int]:
+    """Snapshot and peak, stopping tracemalloc once the last profiled audit is done."""
+    global _TRACEMALLOC_USERS
+    with _TRACEMALLOC_LOCK:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _TRACEMALLOC_USERS -= 1
+        if _TRACEMALLOC_USERS == 0:
+            tracemalloc.stop()
+    return snapshot, peak
+
+
+@contextmanager
+def profile_scope(enabled: bool) -> Iterator[Optional[ProfileCapture]]:
+    """
+    Profile the enclosed block when ``enabled`` (yields None and does nothing otherwise).
+
+    The capture is filled even if the block raises, so failed and expired
+    audits can be profiled too. While another audit in this process is being
+    profiled the block runs unprofiled (yields None) and a warning is logged.
+    """
+    if not enabled:
+        yield None
+        return
+    if not _PROFILER_LOCK.acquire(blocking=False):
+        logger.warning("Another audit is already being profiled in this process; running this one unprofiled")
+        yield None
+        return
+    try:
+        capture = ProfileCapture()
+        _start_tracemalloc()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            yield capture
+        finally:
+            profiler.disable()
+            wall_time = time.perf_counter() - started
+            snapshot, peak = _stop_tracemalloc()
+            capture.profile = build_profile(profiler, snapshot, peak, wall_time)
+    finally:
+        _PROFILER_LOCK.release()
+
+
+def build_profile(profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot, peak: int, wall_time: float) -> AuditProfile:
+    stats = pstats.Stats(profiler)
+    summary = StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ])
+    allocations = [
+        AllocationSite(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    ]
+    return AuditProfile(
+        pstats=marshal.dumps(stats.stats),
+        folded=fold_stacks(stats.stats),
+        summary=summary.getvalue(),
+        allocations=allocations,
+        peak_memory=peak,
+        wall_time=wall_time,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COLLAPSED STACKS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _label(function: FunctionKey) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name  # built-in
+    return f"{os.path.splitext(os.path.basename(filename))[0]}:{name}:{line}"
+
+
+def fold_stacks(stats: Dict[FunctionKey, tuple]) -> str:
+    """
+    Collapsed stacks ("a;b;c microseconds" per line) from a pstats call graph.
+
+    cProfile keeps caller → callee edges, not whole stacks, so each function's
+    time is split over its callers in proportion to the time spent under each
+    (the approach flameprof takes); recursion is cut at the first repeat.
+    """
+    callees: Dict[FunctionKey, Dict[FunctionKey, float]] = defaultdict(dict)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][function] = edge[3]
+    folded: Dict[str, float] = defaultdict(float)
+
+    def walk(function: FunctionKey, stack: Tuple[FunctionKey, ...], seconds: float) -> None:
+        if seconds < MIN_STACK_SECONDS or len(stack) >= MAX_STACK_DEPTH:
+            return
+        _, _, own, cumulative, _ = stats[function]
+        stack += (function,)
+        scale = seconds / cumulative if cumulative else 0.0
+        folded[";".join(_label(frame) for frame in stack)] += own * scale
+        for callee, under in callees[function].items():
+            if callee not in stack and callee in stats:
+                walk(callee, stack, under * scale)
+
+    for function, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(function, (), cumulative)
+    return "\n".join(
+        f"{stack} {round(seconds * 1e6)}" for stack, seconds in folded.items() if round(seconds * 1e6) > 0
+    )
@@ -0,0 +1,104 @@
+"""
+📝 Prompt Sections
+Markdown-heading aware slicing of the UPL protocol so callers can send only the
+parts a request needs.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+@dataclass
+class PromptSection:
+    """A heading and everything under it up to the next heading of the same or higher level."""
+    heading: str
+    level: int
+    start: int  # line index of the heading
+    end: int  # line index one past the section
+
+
+def split_sections(text: str) -> List[PromptSection]:
+    """
+    Index every markdown heading of a prompt.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Sections in document order (nested sections overlap their parents)
+    """
+    lines = text.splitlines()
+    headings = []
+    for index, line in enumerate(lines):
+        match = _HEADING.match(line)
+        if match:
+            headings.append((index, len(match.group(1)), line.strip()))
+    sections = []
+    for position, (start, level, heading) in enumerate(headings):
+        end = len(lines)
+        for next_start, next_level, _ in headings[position + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+        sections.append(PromptSection(heading, level, start, end))
+    return sections
+
+
+def _matches(heading: str, prefixes: Sequence[str]) -> bool:
+    return any(heading.startswith(prefix) for prefix in prefixes)
+
+
+def select_sections(text: str, prefixes: Sequence[str]) -> str:
+    """
+    Keep only the sections whose heading starts with one of ``prefixes``.
+
+    Args:
+        text: Prompt text
+        prefixes: Heading prefixes including the hashes, e.g. "### 1.3 BIOMETRIC"
+
+    Returns:
+        Selected sections joined in document order
+    """
+    lines = text.splitlines()
+    keep = [False] * len(lines)
+    for section in split_sections(text):
+        if _matches(section.heading, prefixes):
+            for index in range(section.start, section.end):
+                keep[index] = True
+    return "\n".join(line for line, kept in zip(lines, keep) if kept).strip() + "\n"
+
+
+def remove_sections(text: str, prefixes: Sequence[str]) -> str:
+    """
+    Drop the sections whose heading starts with one of ``prefixes``.
+
+    Args:
+        text: Prompt text
+        prefixes: Heading prefixes including the hashes
+
+    Returns:
+        Prompt without those sections (everything else untouched)
+    """
+    lines = text.splitlines()
+    drop = [False] * len(lines)
+    for section in split_sections(text):
+        if _matches(section.heading, prefixes):
+            for index in range(section.start, section.end):
+                drop[index] = True
+    return "\n".join(line for line, dropped in zip(lines, drop) if not dropped) + "\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for logging and comparisons."""
+    return (len(text) + 3) // 4
+
+
+def text_before(text: str, prefix: str) -> str:
+    """Everything before the first heading that starts with ``prefix`` (whole text if absent)."""
+    for section in split_sections(text):
+        if section.heading.startswith(prefix):
+            return "\n".join(text.splitlines()[:section.start]).strip() + "\n"
+    return text
@@ -0,0 +1,179 @@
+"""
+📜 Protocol Compiler
+Builds the UPL prompt from its versioned, sectioned markdown source into a
+deduplicated, minimized form with a token estimate and content hash.
+
+The hash is the prompt's identity: cache keys derived from it change only when
+the compiled text changes, not when comments or whitespace in the source do.
+Run ``python -m kinetic.protocol`` to print the budget report (exit code 1 when
+the compiled prompt is over budget).
+"""
+
+import hashlib
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple
+
+from kinetic.prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PROTOCOL_DIR = Path(__file__).parent / "protocols"
+DEFAULT_PROTOCOL = "upl.md"
+TOKEN_BUDGET = 11500  # compiled prompt, estimated tokens
+MIN_DEDUPE_CHARS = 80  # shorter paragraphs (template rows) legitimately repeat
+
+_VERSION = re.compile(r"<!--\s*upl-protocol version:\s*([\w.]+)\s*-->")
+_SECTION = re.compile(r"^<!--\s*section:\s*([\w-]+)\s*-->\s*$")
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_RULE = re.compile(r"^\s*-{3,}\s*$")
+
+
+class ProtocolError(ValueError):
+    """The protocol source is malformed."""
+
+
+@dataclass(frozen=True)
+class CompiledProtocol:
+    """Compiled prompt plus the numbers tracked as its performance budget."""
+    version: str
+    text: str
+    sha256: str
+    tokens: int
+    source_tokens: int
+    sections: Tuple[str, ...]
+    duplicates_removed: int
+
+    @property
+    def fingerprint(self) -> str:
+        """Short identity for cache keys and logs."""
+        return f"upl-{self.version}-{self.sha256[:12]}"
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens > TOKEN_BUDGET
+
+    def summary(self) -> str:
+        saved = self.source_tokens - self.tokens
+        return (
+            f"UPL protocol v{self.version} · ~{self.tokens:,} tokens (budget {TOKEN_BUDGET:,}, "
+            f"{saved:,} saved by compilation) · {len(self.sections)} sections · "
+            f"{self.duplicates_removed} duplicate paragraphs removed · sha256 {self.sha256[:12]}"
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMPILATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_source(source: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split a protocol source into its version and named sections.
+
+    Args:
+        source: Markdown with a ``<!-- upl-protocol version: X -->`` header and
+            ``<!-- section: id -->`` markers
+
+    Returns:
+        Tuple of (version, [(section id, body)]) in source order
+
+    Raises:
+        ProtocolError: Missing version, content outside a section, or duplicate ids
+    """
+    version = _VERSION.search(source)
+    if version is None:
+        raise ProtocolError("Protocol source has no version header")
+    body = source[version.end():]
+
+    sections: List[Tuple[str, List[str]]] = []
+    for line in body.splitlines():
+        match = _SECTION.match(line)
+        if match:
+            if any(name == match.group(1) for name, _ in sections):
+                raise ProtocolError(f"Duplicate protocol section: {match.group(1)}")
+            sections.append((match.group(1), []))
+        elif sections:
+            sections[-1][1].append(line)
+        elif line.strip():
+            raise ProtocolError("Protocol content before the first section marker")
+    return version.group(1), [(name, "\n".join(lines)) for name, lines in sections]
+
+
+def _minimize(text: str) -> str:
+    """Drop comments and horizontal rules, trailing whitespace and blank-line runs."""
+    lines = []
+    for line in _COMMENT.sub("", text).splitlines():
+        line = line.rstrip()
+        if _RULE.match(line):
+            continue
+        if not line and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _dedupe(paragraphs: List[str], seen: set) -> Tuple[List[str], int]:
+    """Drop long paragraphs already emitted earlier in the prompt."""
+    kept, removed = [], 0
+    for paragraph in paragraphs:
+        key = " ".join(paragraph.split())
+        if len(key) >= MIN_DEDUPE_CHARS and key in seen:
+            removed += 1
+            continue
+        seen.add(key)
+        kept.append(paragraph)
+    return kept, removed
+
+
+def compile_protocol(source: str) -> CompiledProtocol:
+    """
+    Compile a protocol source.
+
+    Args:
+        source: Protocol markdown (see ``parse_source``)
+
+    Returns:
+        CompiledProtocol
+    """
+    version, sections = parse_source(source)
+    seen: set = set()
+    blocks, removed = [], 0
+    for _, body in sections:
+        paragraphs, dropped = _dedupe(_minimize(body).split("\n\n"), seen)
+        removed += dropped
+        blocks.append("\n\n".join(paragraph for paragraph in paragraphs if paragraph))
+    text = "\n\n".join(block for block in blocks if block) + "\n"
+    return CompiledProtocol(
+        version=version,
+        text=text,
+        sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        tokens=estimate_tokens(text),
+        source_tokens=estimate_tokens(source),
+        sections=tuple(name for name, _ in sections),
+        duplicates_removed=removed,
+    )
+
+
+@lru_cache(maxsize=None)
+def load_protocol(name: str = DEFAULT_PROTOCOL) -> CompiledProtocol:
+    """Compile a bundled protocol once per process and report its budget."""
+    compiled = compile_protocol((PROTOCOL_DIR / name).read_text(encoding="utf-8"))
+    if compiled.over_budget:
+        logger.warning("%s — OVER BUDGET", compiled.summary())
+    else:
+        logger.info(compiled.summary())
+    return compiled
+
+
+if __name__ == "__main__":
+    protocol = load_protocol(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PROTOCOL)
+    print(protocol.summary())
+    sys.exit(1 if protocol.over_budget else 0)
@@ -0,0 +1,208 @@
+"""
+🖐️ Face & Hand Region Proposer
+CPU-only detection of the regions Tier 1.3 biometric tests care about, so the
+model gets native-resolution crops instead of a few dozen downsampled pixels.
+
+Faces come from the Haar cascades bundled inside the OpenCV wheel (no network,
+no downloaded weights). Hands come from skin-tone blobs with finger-like
+concavity that do not overlap a face.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from kinetic.workspace import ImageWorkspace
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DETECT_SIDE = 1024  # detection runs on a downscaled copy
+CROP_SIDE = 384  # ≤384px per side = minimum image tokens per crop
+TOKENS_PER_CROP = 258  # Gemini image cost for a ≤384px image
+CROP_TOKEN_BUDGET = 6 * TOKENS_PER_CROP
+CROP_PADDING = 0.2
+
+BIOMETRIC_HEADINGS = ("### 1.3 BIOMETRIC PRECISION TESTS",)
+SKIN_CR = (135, 175)  # YCrCb skin-tone box (inclusive), shared with the scene router
+SKIN_CB = (80, 125)
+
+_CASCADES = ("haarcascade_frontalface_default.xml", "haarcascade_profileface.xml")
+_DETECTORS = None
+
+
+@dataclass
+class Region:
+    """A proposed region in native pixel coordinates."""
+    kind: str  # face | hand
+    box: Tuple[int, int, int, int]  # left, top, right, bottom
+    score: float = 1.0
+
+    @property
+    def area(self) -> int:
+        return (self.box[2] - self.box[0]) * (self.box[3] - self.box[1])
+
+
+def _load_detectors():
+    """Load bundled cascades once per process; None when OpenCV is unavailable."""
+    global _DETECTORS
+    if _DETECTORS is None:
+        try:
+            import cv2
+            detectors = [cv2.CascadeClassifier(cv2.data.haarcascades + name) for name in _CASCADES]
+            _DETECTORS = (cv2, [detector for detector in detectors if not detector.empty()])
+        except (ImportError, AttributeError):
+            _DETECTORS = (None, [])
+    return _DETECTORS
+
+
+def detector_available() -> bool:
+    cv2, detectors = _load_detectors()
+    return cv2 is not None and bool(detectors)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DETECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _overlaps(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _suppress(regions: List[Region]) -> List[Region]:
+    """Keep the larger of any overlapping same-kind detections."""
+    kept: List[Region] = []
+    for region in sorted(regions, key=lambda r: r.area, reverse=True):
+        if not any(region.kind == other.kind and _overlaps(region.box, other.box) for other in kept):
+            kept.append(region)
+    return kept
+
+
+def _detect_faces(cv2, detectors, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    boxes = []
+    min_side = max(24, min(gray.shape) // 40)
+    for detector in detectors:
+        for x, y, w, h in detector.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=6, minSize=(min_side, min_side)):
+            boxes.append((int(x), int(y), int(x + w), int(y + h)))
+    return boxes
+
+
+def _detect_hands(cv2, rgb: np.ndarray, faces: Sequence[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    """Skin blobs whose convex-hull solidity indicates separated fingers."""
+    ycrcb = cv2.cvtColor(rgb, cv2.COLOR_RGB2YCrCb)
+    mask = cv2.inRange(ycrcb, (0, SKIN_CR[0], SKIN_CB[0]), (255, SKIN_CR[1], SKIN_CB[1]))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    image_area = rgb.shape[0] * rgb.shape[1]
+    boxes = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if not 0.001 * image_area <= area <= 0.08 * image_area:
+            continue
+        hull_area = cv2.contourArea(cv2.convexHull(contour))
+        solidity = area / hull_area if hull_area else 1.0
+        if not 0.5 <= solidity <= 0.88:  # palms alone are convex; fingers leave gaps
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        box = (x, y, x + w, y + h)
+        if any(_overlaps(box, face) for face in faces):
+            continue
+        boxes.append(box)
+    return boxes
+
+
+def propose_regions(workspace: ImageWorkspace) -> Optional[List[Region]]:
+    """
+    Find faces and hands.
+
+    Args:
+        workspace: Shared decoded image
+
+    Returns:
+        Regions in native coordinates (faces first, largest first), or None if
+        no detector is available (callers must then assume people may be present)
+    """
+    cv2, detectors = _load_detectors()
+    if cv2 is None or not detectors:
+        return None
+
+    width, height = workspace.size
+    scale = min(1.0, DETECT_SIDE / max(width, height))
+    rgb = workspace.rgb
+    if scale < 1.0:
+        rgb = np.asarray(Image.fromarray(rgb).resize((int(width * scale), int(height * scale)), Image.BILINEAR))
+    gray = cv2.equalizeHist(cv2.cvtColor(np.ascontiguousarray(rgb), cv2.COLOR_RGB2GRAY))
+
+    faces = _detect_faces(cv2, detectors, gray)
+    hands = _detect_hands(cv2, np.ascontiguousarray(rgb), faces)
+
+    def native(box):
+        return tuple(int(round(value / scale)) for value in box)
+
+    regions = [Region("face", native(box)) for box in faces] + [Region("hand", native(box), 0.5) for box in hands]
+    regions = _suppress(regions)
+    return sorted(regions, key=lambda r: (r.kind != "face", -r.area))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CROPS & PROMPT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def region_crops(
+    image: Image.Image,
+    regions: Sequence[Region],
+    token_budget: int = CROP_TOKEN_BUDGET,
+) -> List[Tuple[Region, Image.Image]]:
+    """
+    Native-resolution crops, padded, capped at ``CROP_SIDE`` and a token budget.
+
+    Args:
+        image: Full-resolution image
+        regions: Proposed regions in priority order
+        token_budget: Maximum image tokens spent on crops
+
+    Returns:
+        (region, crop) pairs
+    """
+    crops = []
+    for region in regions[: token_budget // TOKENS_PER_CROP]:
+        left, top, right, bottom = region.box
+        pad_x, pad_y = int((right - left) * CROP_PADDING), int((bottom - top) * CROP_PADDING)
+        crop = image.crop((
+            max(0, left - pad_x),
+            max(0, top - pad_y),
+            min(image.width, right + pad_x),
+            min(image.height, bottom + pad_y),
+        ))
+        if crop.mode not in ("RGB", "L"):
+            crop = crop.convert("RGB")
+        crop.thumbnail((CROP_SIDE, CROP_SIDE))
+        crops.append((region, crop))
+    return crops
+
+
+def crops_prompt_addendum(crops: Sequence[Tuple[Region, Image.Image]]) -> str:
+    """Prompt text describing the attached crops, in attachment order."""
+    listing = "\n".join(
+        f"{number}. {region.kind} at {list(region.box)}" for number, (region, _) in enumerate(crops, 1)
+    )
+    return f"""
+---
+
+## 🖐️ BIOMETRIC CROPS
+
+After the main image, {len(crops)} native-resolution crops are attached (locally detected, in this order):
+{listing}
+
+Run the Tier 1.3 biometric precision tests (finger count, nails, iris, teeth, ears) on these crops.
+"""
+
+
+NO_PEOPLE_NOTE = (
+    "**BIOMETRIC TESTS**: Local face/hand detection found no people and no skin tones in this image. "
+    "Mark all biometric checks N/A."
+)
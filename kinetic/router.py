@@ -0,0 +1,212 @@
+"""
+🧭 Model Router
+Runs audits on the fast model and escalates only the hard cases —
+INCONCLUSIVE, low-confidence or unparseable verdicts, and requests flagged as
+high-stakes — to the stronger model. Per-route latency, tokens, cost and the
+escalation rate are recorded process-wide.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kinetic.verdicts import Verdict, parse_verdict
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+ESCALATION_MODEL = "gemini-2.5-pro"
+ESCALATION_CONFIDENCE = 70.0  # verdicts below this confidence go to the stronger model
+
+# List prices in USD per 1M tokens (input, output); update when pricing changes
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+AuditCall = Callable[[Any, dict], Tuple[bool, str]]
+
+
+def estimate_cost(model_name: str, prompt_tokens: Optional[int], output_tokens: Optional[int]) -> Optional[float]:
+    """USD cost of one call, or None when the model or token counts are unknown."""
+    if model_name not in PRICES or prompt_tokens is None or output_tokens is None:
+        return None
+    input_price, output_price = PRICES[model_name]
+    return (prompt_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def usage_by_model(model_name: str, usage: dict) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """(prompt, output) tokens of one call per model that ran it (a hedged call may span two)."""
+    return usage.get("models") or {model_name: (usage.get("prompt_tokens"), usage.get("output_tokens"))}
+
+
+def escalation_reason(verdict: Optional[Verdict], threshold: float = ESCALATION_CONFIDENCE) -> Optional[str]:
+    """
+    Why a fast-model verdict needs a second opinion.
+
+    Returns:
+        Human-readable reason, or None when the verdict can stand
+    """
+    if verdict is None:
+        return "no parseable verdict"
+    if verdict.label == "INCONCLUSIVE":
+        return "inconclusive"
+    if verdict.confidence is not None and verdict.confidence < threshold:
+        return f"low confidence ({verdict.confidence:.0f}%)"
+    return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STATISTICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class RouteStats:
+    """Running totals for one model route."""
+    calls: int = 0
+    failures: int = 0
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.calls if self.calls else 0.0
+
+
+class RouterStats:
+    """Thread-safe per-route totals shared by every session in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[str, RouteStats] = {}
+        self.audits = 0
+        self.escalations = 0
+        self.high_stakes = 0
+
+    def record_call(self, model_name: str, success: bool, latency: float, usage: dict) -> None:
+        with self._lock:
+            route = self.routes.setdefault(model_name, RouteStats())
+            route.calls += 1
+            route.failures += not success
+            route.latency += latency
+            for name, (prompt, output) in usage_by_model(model_name, usage).items():
+                ran = self.routes.setdefault(name, RouteStats())
+                ran.prompt_tokens += prompt or 0
+                ran.output_tokens += output or 0
+                ran.cost += estimate_cost(name, prompt, output) or 0.0
+
+    def record_audit(self, escalated: bool, high_stakes: bool) -> None:
+        with self._lock:
+            self.audits += 1
+            self.escalations += escalated
+            self.high_stakes += high_stakes
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.audits if self.audits else 0.0
+
+    def snapshot(self) -> List[Tuple[str, RouteStats]]:
+        with self._lock:
+            return [(name, RouteStats(**vars(route))) for name, route in self.routes.items()]
+
+
+STATS = RouterStats()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROUTING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class RouteAttempt:
+    """One model call made while routing an audit."""
+    model_name: str
+    success: bool
+    latency: float
+    usage: dict = field(default_factory=dict)
+
+
+@dataclass
+class RoutedResult:
+    """Final audit text plus how it was obtained."""
+    success: bool
+    text: str
+    attempts: List[RouteAttempt]
+    reason: Optional[str] = None  # why the audit was escalated
+
+    @property
+    def escalated(self) -> bool:
+        return len(self.attempts) > 1
+
+    @property
+    def final(self) -> RouteAttempt:
+        return self.attempts[-1]
+
+    def describe(self) -> str:
+        route = " → ".join(f"{attempt.model_name} {attempt.latency:.1f}s" for attempt in self.attempts)
+        return route + (f" ({self.reason})" if self.reason else "")
+
+
+class ModelRouter:
+    """Fast model by default, stronger model for hard or high-stakes audits."""
+
+    def __init__(
+        self,
+        primary: Any,
+        escalation: Optional[Any] = None,
+        threshold: float = ESCALATION_CONFIDENCE,
+        stats: RouterStats = STATS,
+    ):
+        self.primary = primary
+        self.escalation = escalation
+        self.threshold = threshold
+        self.stats = stats
+
+    @staticmethod
+    def _name(model: Any) -> str:
+        return getattr(model, "model_name", str(model)).split("/")[-1]
+
+    @property
+    def escalation_name(self) -> str:
+        return self._name(self.escalation) if self.escalation is not None else self._name(self.primary)
+
+    def _attempt(self, model: Any, call: AuditCall) -> Tuple[RouteAttempt, str]:
+        usage: dict = {}
+        start = time.perf_counter()
+        success, text = call(model, usage)
+        attempt = RouteAttempt(self._name(model), success, time.perf_counter() - start, usage)
+        self.stats.record_call(attempt.model_name, success, attempt.latency, usage)
+        return attempt, text
+
+    def run(self, call: AuditCall, high_stakes: bool = False) -> RoutedResult:
+        """
+        Route one audit.
+
+        Args:
+            call: ``call(model, usage) -> (success, text)``; fills ``usage`` with token counts
+            high_stakes: Skip the fast model and go straight to the stronger one
+
+        Returns:
+            RoutedResult; if the escalated call fails the fast-model result is kept
+        """
+        if high_stakes and self.escalation is not None:
+            attempt, text = self._attempt(self.escalation, call)
+            self.stats.record_audit(escalated=False, high_stakes=True)
+            return RoutedResult(attempt.success, text, [attempt], "high-stakes")
+
+        attempt, text = self._attempt(self.primary, call)
+        result = RoutedResult(attempt.success, text, [attempt])
+        reason = escalation_reason(parse_verdict(text), self.threshold) if attempt.success else None
+        if reason is not None and self.escalation is not None:
+            second, second_text = self._attempt(self.escalation, call)
+            result.attempts.append(second)
+            result.reason = reason
+            if second.success:
+                result.text = second_text
+        self.stats.record_audit(escalated=result.escalated, high_stakes=False)
+        return result
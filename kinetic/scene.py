@@ -0,0 +1,246 @@
+"""
+🧭 Scene-Type Router
+Fast local classification of an upload (photo, screenshot, document,
+illustration; people present; text present) and a cached prompt assembler that
+keeps only the UPL sections that apply to that kind of image.
+
+Every heuristic errs towards keeping a section: a missed drop costs tokens, a
+wrong drop costs detection. A non-photo kind needs several synthetic cues to
+agree (exact flat runs, a small palette, no sensor noise in textured areas);
+anything in between is treated as a photo and keeps the full protocol.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from kinetic.prompts import remove_sections
+from kinetic.regions import BIOMETRIC_HEADINGS, NO_PEOPLE_NOTE, SKIN_CB, SKIN_CR, Region
+from kinetic.workspace import ImageWorkspace
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCENE_KINDS = ("photo", "screenshot", "document", "illustration")
+
+SAMPLE_SIDE = 1024  # features run on a strided subsample (exact pixel values kept)
+TEXT_TILE = 16
+# Synthetic images need all of these; clipped highlights or a white backdrop alone are not enough
+FLAT_SYNTHETIC_MIN = 0.45  # share of exactly-equal horizontal neighbours
+PALETTE_SYNTHETIC_MAX = 4096  # distinct colours in the sample (photos have tens of thousands)
+NOISY_EDGE_MAX = 0.25  # share of textured pixels off by ±1..3 from a neighbour (sensor noise)
+DOCUMENT_PAPER_MIN = 0.55  # share of near-white, near-grey pixels on a page
+SCREENSHOT_STRAIGHT_MIN = 0.5  # UI edges are mostly long horizontal/vertical lines
+TEXT_RUNS_MIN = 6  # horizontally adjacent glyph tile pairs
+GLYPH_BIMODAL_MIN = 0.8  # share of a glyph tile's pixels near its ink or paper level
+# The face/hand detectors miss profiles, small, occluded and stylised people, so
+# "no people" also needs (almost) no skin-tone pixels — about a 12px face at 1024px
+NO_SKIN_MAX = 0.0002
+
+CAMERA_HEADINGS = (
+    "### 1. SENSOR PHYSICS",
+    "### 2. OPTICAL PHYSICS",
+)
+SCENE_PHYSICS_HEADINGS = (
+    "### 3. LIGHTING PHYSICS",
+    "### 2.2 TEMPORAL & LOGICAL",
+    "### 2.4 SHADOW & REFLECTION",
+)
+TEXT_HEADINGS = ("### 2.1 TEXT & LANGUAGE",)
+CULTURAL_HEADINGS = ("### 2.3 SOCIAL & CULTURAL",)
+
+_KIND_NOTES = {
+    "screenshot": "a screen capture (UI rendering, no camera optics)",
+    "document": "a scanned or rendered document page",
+    "illustration": "a drawn or rendered illustration (no camera optics)",
+}
+
+
+@dataclass(frozen=True)
+class SceneProfile:
+    """
+    What the image is. ``people`` and ``text`` are None when unknown (only a
+    confident False drops sections); ``kind`` is "photo" unless the synthetic cues agree.
+    """
+    kind: str = "photo"
+    people: Optional[bool] = None
+    text: Optional[bool] = None
+
+    def describe(self) -> str:
+        people = {True: "people", False: "no people", None: "people unknown"}[self.people]
+        text = {True: "text", False: "no text", None: "text unknown"}[self.text]
+        return f"{self.kind} · {people} · {text}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASSIFICATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _sample(rgb: np.ndarray, side: int = SAMPLE_SIDE) -> np.ndarray:
+    step = max(1, -(-max(rgb.shape[:2]) // side))
+    return rgb[::step, ::step]
+
+
+def _text_present(luma: np.ndarray) -> Optional[bool]:
+    """
+    Rows of small two-tone tiles with dense, high-contrast strokes (glyph runs).
+
+    Returns:
+        True for validated glyph runs, False when no tile even has stroke-like
+        contrast, None in between (noise and texture pass the contrast test but
+        are not two-tone like ink on paper)
+    """
+    rows, cols = luma.shape[0] // TEXT_TILE, luma.shape[1] // TEXT_TILE
+    if rows == 0 or cols < 2:
+        return False
+    tiles = luma[:rows * TEXT_TILE, :cols * TEXT_TILE].reshape(rows, TEXT_TILE, cols, TEXT_TILE)
+    low, high = tiles.min(axis=(1, 3)), tiles.max(axis=(1, 3))
+    contrast = high - low
+    edges = np.abs(np.diff(tiles, axis=3)) > 48
+    density = edges.mean(axis=(1, 3))
+    strokes = (contrast > 96) & (density > 0.04) & (density < 0.35)
+    if not strokes.any():
+        return False
+    # Ink and paper: nearly every pixel sits close to the tile's darkest or brightest level
+    band = contrast[:, None, :, None] / 4
+    near = (tiles - low[:, None, :, None] <= band) | (high[:, None, :, None] - tiles <= band)
+    glyphs = strokes & (near.mean(axis=(1, 3)) >= GLYPH_BIMODAL_MIN)
+    runs = np.count_nonzero(glyphs[:, 1:] & glyphs[:, :-1])
+    return True if runs >= TEXT_RUNS_MIN else None
+
+
+def _straight_edge_ratio(luma: np.ndarray, run: int = 6) -> float:
+    """Share of strong edges lying on long horizontal or vertical runs (UI chrome, boxes)."""
+    horizontal = np.abs(np.diff(luma, axis=0)) > 24
+    vertical = np.abs(np.diff(luma, axis=1)) > 24
+    strong = np.count_nonzero(horizontal) + np.count_nonzero(vertical)
+    if not strong:
+        return 0.0
+    rows = np.logical_and.reduce([horizontal[:, offset:horizontal.shape[1] - run + offset] for offset in range(run)])
+    cols = np.logical_and.reduce([vertical[offset:vertical.shape[0] - run + offset, :] for offset in range(run)])
+    return float(np.count_nonzero(rows) + np.count_nonzero(cols)) / strong
+
+
+def _noisy_edge_ratio(luma: np.ndarray) -> float:
+    """Share of non-flat neighbour steps that are tiny (±1..3): sensor noise, absent in rendered art."""
+    step = np.abs(np.diff(luma, axis=1))
+    moving = step > 0
+    if not moving.any():
+        return 0.0
+    return float(np.count_nonzero(moving & (step <= 3))) / np.count_nonzero(moving)
+
+
+def _palette_size(rgb: np.ndarray) -> int:
+    packed = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    return int(np.unique(packed).size)
+
+
+def _skin_share(rgb: np.ndarray) -> float:
+    """Share of pixels in the skin-tone box the hand detector uses (BT.601 YCrCb, as OpenCV)."""
+    luma = rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+    cr = (rgb[..., 0] - luma) * 0.713 + 128
+    cb = (rgb[..., 2] - luma) * 0.564 + 128
+    skin = (cr >= SKIN_CR[0]) & (cr <= SKIN_CR[1]) & (cb >= SKIN_CB[0]) & (cb <= SKIN_CB[1])
+    return float(np.mean(skin))
+
+
+def classify_scene(workspace: ImageWorkspace, regions: Optional[Sequence[Region]] = None) -> SceneProfile:
+    """
+    Classify an image from cheap pixel statistics.
+
+    Only a confident call leaves "photo": exact flat runs, a small palette and
+    no sensor-noise steps must all agree before camera sections are trimmed.
+
+    Args:
+        workspace: Shared decoded image
+        regions: ``propose_regions`` output (None = detector unavailable)
+
+    Returns:
+        SceneProfile
+    """
+    rgb = _sample(workspace.rgb).astype(np.int32)
+    luma = (rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114) // 1000
+
+    flat = float(np.mean(np.all(rgb[:, 1:] == rgb[:, :-1], axis=-1)))
+    text = _text_present(luma)
+    synthetic = (
+        flat >= FLAT_SYNTHETIC_MIN
+        and _noisy_edge_ratio(luma) <= NOISY_EDGE_MAX
+        and _palette_size(rgb) <= PALETTE_SYNTHETIC_MAX
+    )
+
+    kind = "photo"
+    if synthetic:
+        chroma = rgb.max(axis=-1) - rgb.min(axis=-1)
+        paper = float(np.mean((luma > 215) & (chroma < 24)))
+        if paper > DOCUMENT_PAPER_MIN and text:
+            kind = "document"
+        elif _straight_edge_ratio(luma) > SCREENSHOT_STRAIGHT_MIN:
+            kind = "screenshot"
+        else:
+            kind = "illustration"
+
+    # A detection proves people; its absence only counts when there is no skin to miss
+    if regions:
+        people = True
+    elif regions is not None and _skin_share(rgb) < NO_SKIN_MAX:
+        people = False
+    else:
+        people = None
+    return SceneProfile(kind, people, text)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROMPT ASSEMBLY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def dropped_headings(profile: SceneProfile) -> Tuple[str, ...]:
+    """UPL sections that cannot apply to ``profile``."""
+    drop = []
+    if profile.people is False:
+        drop += BIOMETRIC_HEADINGS
+    if profile.text is False:
+        drop += TEXT_HEADINGS
+        if profile.people is False:
+            drop += CULTURAL_HEADINGS  # signage, uniforms and plates need text or people
+    if profile.kind != "photo":
+        drop += CAMERA_HEADINGS
+    if profile.kind in ("screenshot", "document"):
+        drop += SCENE_PHYSICS_HEADINGS
+    return tuple(drop)
+
+
+def _scene_note(profile: SceneProfile) -> str:
+    lines = []
+    if profile.people is False:
+        lines.append(NO_PEOPLE_NOTE)
+    if profile.kind != "photo":
+        lines.append(
+            f"**IMAGE TYPE**: Local analysis classifies this as {_KIND_NOTES[profile.kind]}; the camera "
+            f"sensor/optics sections were left out. Apply every remaining test as usual."
+        )
+    if profile.text is False:
+        lines.append("**TEXT**: No legible text was found locally. Mark text checks N/A.")
+    return "\n---\n\n" + "\n\n".join(lines) + "\n" if lines else ""
+
+
+@lru_cache(maxsize=64)
+def assemble_prompt(protocol: str, profile: SceneProfile) -> str:
+    """
+    Protocol trimmed to the sections that apply to ``profile`` (cached per variant).
+
+    Args:
+        protocol: Full UPL protocol text
+        profile: Scene classification
+
+    Returns:
+        Prompt text
+    """
+    drop = dropped_headings(profile)
+    if not drop:
+        return protocol
+    return remove_sections(protocol, drop) + _scene_note(profile)
+
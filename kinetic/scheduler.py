@@ -0,0 +1,331 @@
+"""
+🚦 Request Scheduler
+Shared requests-per-minute / tokens-per-minute token buckets plus a
+quota-aware retry loop for every model call.
+
+Callers wait for budget instead of failing: a 429 pauses the whole bucket for
+the server's retry delay so concurrent callers queue behind it, and retryable
+errors (429, 5xx, timeouts) are retried with jittered exponential backoff
+until the retry budget runs out.
+"""
+
+import asyncio
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from kinetic.breaker import CircuitBreaker
+from kinetic.deadline import SAVINGS, Deadline, DeadlineExceeded, current_deadline
+from kinetic.prompts import estimate_tokens
+
+T = TypeVar("T")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# (requests per minute, input tokens per minute); paid tier 1 defaults
+DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gemini-2.5-flash": (1000, 1_000_000),
+    "gemini-2.5-pro": (150, 2_000_000),
+}
+FALLBACK_LIMITS = (60, 250_000)
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+BACKOFF_BASE, BACKOFF_CAP = 1.0, 32.0  # seconds
+RETRY_BUDGET = 120.0  # total seconds spent waiting on retries before giving up
+
+TOKENS_PER_IMAGE_TILE = 258  # ≤384px images cost one tile; larger ones are tiled at 768px
+IMAGE_TILE = 768
+INLINE_IMAGE_TOKENS = 4 * TOKENS_PER_IMAGE_TILE  # undecoded inline blobs: assume a typical photo
+
+_RETRY_IN = re.compile(r"retry in\s*([\d.]+)\s*s", re.IGNORECASE)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TOKEN BUCKET
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TokenBucket:
+    """
+    Per-minute budget refilled continuously.
+
+    ``reserve`` always succeeds and returns how long the caller must wait, so
+    callers queue in arrival order rather than racing for refills.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` (may go negative) and return the wait in seconds before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            amount = min(amount, self.capacity)  # an oversized request must still be able to run
+            self.level -= amount
+            deficit = max(0.0, -self.level) / self.rate
+            return max(deficit, self.paused_until - now)
+
+    def refund(self, amount: float) -> None:
+        """Give back a reservation that will not be used."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def available(self) -> float:
+        """Budget left right now (negative while callers are queued)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.level
+
+    def pause(self, seconds: float) -> None:
+        """Block new reservations for ``seconds`` (server-side quota exhausted)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RETRY POLICY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "code", None)  # google.api_core exceptions carry the HTTP status
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429, 5xx and timeouts are retried; everything else fails fast."""
+    return status_code(exc) in RETRYABLE_CODES or isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError))
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Server-suggested retry delay in seconds, if the error carries one.
+
+    Looks at an HTTP ``Retry-After`` header, a ``google.rpc.RetryInfo`` detail,
+    then the "Please retry in 13.2s" hint Gemini puts in the message.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if "Retry-After" in headers:
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+    for detail in getattr(exc, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    match = _RETRY_IN.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+def backoff_delay(attempt: int, hint: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's hint."""
+    jittered = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    return max(jittered, hint + random.uniform(0, 1.0)) if hint is not None else jittered
+
+
+def estimate_request_tokens(contents: Any) -> int:
+    """
+    Input-token estimate of generate_content contents for the TPM bucket.
+
+    Strings use the character heuristic; images are costed per 768px tile.
+    """
+    parts = contents if isinstance(contents, (list, tuple)) else [contents]
+    total = 0
+    for part in parts:
+        if isinstance(part, str):
+            total += estimate_tokens(part)
+        elif hasattr(part, "size") and isinstance(getattr(part, "size"), tuple):
+            width, height = part.size
+            if max(width, height) <= 384:
+                total += TOKENS_PER_IMAGE_TILE
+            else:
+                total += TOKENS_PER_IMAGE_TILE * math.ceil(width / IMAGE_TILE) * math.ceil(height / IMAGE_TILE)
+        else:
+            total += INLINE_IMAGE_TOKENS
+    return total
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class SchedulerStats:
+    """Counters for one scheduler."""
+    calls: int = 0
+    queued: int = 0  # calls that had to wait for budget
+    queued_seconds: float = 0.0
+    retries: int = 0
+    quota_pauses: int = 0
+    failures: int = 0
+
+
+class Scheduler:
+    """RPM/TPM buckets, the retry loop and the circuit breaker for one model."""
+
+    def __init__(self, rpm: int, tpm: int, retry_budget: float = RETRY_BUDGET):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.retry_budget = retry_budget
+        self.breaker = CircuitBreaker()
+        self.stats = SchedulerStats()
+        self._lock = threading.Lock()
+
+    def _admit(self, tokens: int, deadline: Optional[Deadline]) -> float:
+        """Reserve budget and return the wait, refusing waits the audit's deadline cannot cover."""
+        if deadline is not None:
+            deadline.check()  # before reserving: an aborted audit takes no budget
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and wait > remaining:
+            # Refused calls never run: give their budget back so later calls do not queue behind them
+            self.requests.refund(1)
+            self.tokens.refund(tokens)
+            raise DeadlineExceeded(f"Quota wait of {wait:.0f}s exceeds the audit deadline")
+        with self._lock:
+            self.stats.calls += 1
+            if wait > 0:
+                self.stats.queued += 1
+                self.stats.queued_seconds += wait
+        return wait
+
+    def _on_error(self, exc: BaseException, attempt: int, waited: float, deadline: Optional[Deadline] = None) -> float:
+        """Delay before the next attempt, or re-raise when the error is final."""
+        if not is_retryable(exc):
+            with self._lock:
+                self.stats.failures += 1
+            raise exc
+        hint = retry_after(exc)
+        delay = backoff_delay(attempt, hint)
+        remaining = deadline.remaining() if deadline is not None else None
+        if waited + delay > self.retry_budget or (remaining is not None and delay > remaining):
+            with self._lock:
+                self.stats.failures += 1
+            raise exc
+        with self._lock:
+            self.stats.retries += 1
+            if status_code(exc) == 429:
+                self.stats.quota_pauses += 1
+        if status_code(exc) == 429:
+            # Everyone on this bucket waits out the quota window, not just this caller
+            self.requests.pause(delay)
+        return delay
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Run a blocking model call under the budgets, retrying retryable errors.
+
+        Args:
+            fn: Zero-argument callable issuing the request
+            tokens: Estimated input tokens (see ``estimate_request_tokens``)
+
+        Returns:
+            ``fn()``'s result
+
+        Raises:
+            CircuitOpenError: The model's circuit is open (no retry is attempted)
+            AuditAborted: The current audit was cancelled or cannot finish before its deadline
+        """
+        attempt, waited = 0, 0.0
+        deadline = current_deadline()
+        pause = deadline.sleep if deadline is not None else time.sleep
+        while True:
+            pause(self._admit(tokens, deadline))
+            self.breaker.before_call()
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                self.breaker.record(not is_retryable(e), time.perf_counter() - start)
+                delay = self._on_error(e, attempt, waited, deadline)
+            except BaseException:
+                self.breaker.abandon()
+                raise
+            else:
+                self.breaker.record(True, time.perf_counter() - start)
+                return result
+            attempt, waited = attempt + 1, waited + delay
+            pause(delay)
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        Async twin of ``call`` for coroutines on the shared event loop.
+
+        Cancelling the task (audit cancelled or past its deadline) aborts the
+        in-flight request; what that saved is tallied in ``SAVINGS``.
+        """
+        attempt, waited, sent = 0, 0.0, False
+        deadline = current_deadline()
+        try:
+            while True:
+                await asyncio.sleep(self._admit(tokens, deadline))
+                self.breaker.before_call()
+                start, sent = time.perf_counter(), True
+                try:
+                    result = await fn()
+                except Exception as e:
+                    self.breaker.record(not is_retryable(e), time.perf_counter() - start)
+                    delay = self._on_error(e, attempt, waited, deadline)
+                except BaseException:
+                    self.breaker.abandon()  # cancelled (audit, hedge loser, early exit): no verdict on health
+                    raise
+                else:
+                    self.breaker.record(True, time.perf_counter() - start)
+                    return result
+                attempt, waited, sent = attempt + 1, waited + delay, False
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            SAVINGS.record_call(sent, tokens)
+            raise
+
+
+_SCHEDULERS: Dict[str, Scheduler] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def model_name(model: Any) -> str:
+    """Bare model name ("models/gemini-2.5-flash" → "gemini-2.5-flash")."""
+    return getattr(model, "model_name", str(model)).split("/")[-1]
+
+
+def scheduler_for(model: Any) -> Scheduler:
+    """
+    The process-wide scheduler of a model, created with its default limits.
+
+    Models balanced over a key pool (``key_count`` > 1) get the pool's
+    aggregate budget; each key's own share is enforced by the pool.
+    """
+    name = model_name(model)
+    keys = getattr(model, "key_count", 1)
+    with _REGISTRY_LOCK:
+        if name not in _SCHEDULERS:
+            rpm, tpm = DEFAULT_LIMITS.get(name, FALLBACK_LIMITS)
+            _SCHEDULERS[name] = Scheduler(rpm * keys, tpm * keys)
+        return _SCHEDULERS[name]
+
+
+def breaker_for(model: Any) -> CircuitBreaker:
+    """The circuit breaker guarding a model's endpoint."""
+    return scheduler_for(model).breaker
+
+
+def scheduler_stats() -> Dict[str, SchedulerStats]:
+    with _REGISTRY_LOCK:
+        return {name: SchedulerStats(**vars(scheduler.stats)) for name, scheduler in _SCHEDULERS.items()}
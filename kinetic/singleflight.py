@@ -0,0 +1,123 @@
+"""
+🔗 Single-Flight Coalescing
+Concurrent identical audits share one model call: the first request for a key
+runs it, every identical request that arrives while it is in flight waits for
+and receives the same result.
+
+Keys combine the prompt version with a hash of the exact request contents
+(prompt text and image bytes), so only byte-identical requests coalesce.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from kinetic.deadline import POLL_INTERVAL, AuditAborted, current_deadline
+
+T = TypeVar("T")
+
+
+def content_key(*parts: Any) -> str:
+    """
+    SHA-256 over request parts: strings, bytes, inline blobs and PIL images.
+
+    Lists and tuples are hashed element by element in order.
+    """
+    digest = hashlib.sha256()
+
+    def feed(part: Any) -> None:
+        if isinstance(part, (list, tuple)):
+            for item in part:
+                feed(item)
+        elif isinstance(part, str):
+            digest.update(b"s" + part.encode("utf-8"))
+        elif isinstance(part, (bytes, bytearray, memoryview)):
+            digest.update(b"b" + bytes(part))
+        elif isinstance(part, dict):  # inline blob {"mime_type", "data"}
+            digest.update(b"d" + str(part.get("mime_type")).encode() + bytes(part.get("data", b"")))
+        elif hasattr(part, "tobytes") and hasattr(part, "size"):  # PIL image
+            digest.update(f"i{part.mode}{part.size}".encode() + part.tobytes())
+        else:
+            digest.update(b"r" + repr(part).encode())
+
+    feed(parts)
+    return digest.hexdigest()
+
+
+@dataclass
+class _Flight(Generic[T]):
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[T] = None
+    error: Optional[BaseException] = None
+    followers: int = 0
+
+
+class SingleFlight:
+    """Process-wide registry of in-flight calls keyed by request identity."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Followers honour their own audit deadline while waiting. If the leader's
+        audit is cancelled, waiting followers retry instead of inheriting the
+        cancellation (one of them becomes the new leader).
+
+        Args:
+            key: Request identity (see ``content_key``)
+            fn: The call to make when no identical call is in flight
+
+        Returns:
+            Tuple of (result, shared) — ``shared`` is True for followers
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        joined = False
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.leaders += 1
+                else:
+                    flight.followers += 1
+                    self.coalesced += not joined
+                    joined = True
+
+            if leader:
+                try:
+                    flight.result = fn()
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+                return flight.result, False
+
+            deadline = current_deadline()
+            while not flight.done.wait(POLL_INTERVAL):
+                if deadline is not None:
+                    deadline.check()
+            if isinstance(flight.error, AuditAborted):
+                continue  # the leader's audit was stopped, not ours
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+FLIGHTS = SingleFlight()
@@ -0,0 +1,473 @@
+"""
+🗂️ Audit Store
+Every finished audit, recorded for lookup, history and analytics.
+
+Audits go to SQLite on local disk by default, or — with ``KINETIC_REDIS_URL``
+set — to the shared Redis-protocol backend so every replica sees one history.
+
+A row holds the upload's content hash and perceptual hash, the verdict and
+confidence, red flags per tier, the model and protocol version that produced
+it, and latency, token usage and cost. The indexes cover exact-content lookup,
+near-duplicate lookup and verdict/time queries. History pages use keyset
+pagination (``id < cursor``), so a page costs the same at row 10 or row
+10,000,000.
+
+Recording an audit also adds its spend to running rollups per session, per
+user per day and per day, so budget checks read a few counters instead of
+summing history. Profiles of audits run with the debug switch are kept next to
+their records, keyed by job id, for ``PROFILE_RETENTION``.
+"""
+
+import json
+import logging
+import pickle
+import time
+import zlib
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from kinetic.costs import SPEND_TTL, Spend, spend_scopes
+from kinetic.db import DATA_DIR, Database
+from kinetic.frames import frame_hash
+from kinetic.kv import KEY_PREFIX, REDIS_URL, NearCache, TamperedValue, seal, shared_backend, unseal
+from kinetic.pipeline import AuditOptions, AuditOutcome
+from kinetic.profiling import AuditProfile
+from kinetic.protocol import load_protocol
+from kinetic.verdicts import MANIPULATED, VERDICTS, local_suspicion, parse_tiers
+from kinetic.workspace import ImageWorkspace
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DB_PATH = DATA_DIR / "audits.db"
+PAGE_SIZE = 25
+NEAR_RECORDS = 2048  # stored records kept in the per-process near-cache
+NEAR_TTL = 600.0
+NO_VERDICT = "none"  # index name for audits whose report had no parseable verdict
+SPEND_FIELDS = tuple(spend_field.name for spend_field in fields(Spend))
+PROFILE_RETENTION = 7 * 24 * 3600  # seconds a stored profile is kept
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT UNIQUE,
+    created REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    phash INTEGER,
+    format TEXT,
+    width INTEGER,
+    height INTEGER,
+    verdict TEXT,
+    confidence REAL,
+    tiers TEXT NOT NULL DEFAULT '{}',
+    local_suspicion REAL,
+    model TEXT,
+    escalated INTEGER NOT NULL DEFAULT 0,
+    degraded INTEGER NOT NULL DEFAULT 0,
+    prompt_version TEXT NOT NULL,
+    latency REAL,
+    total_time REAL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    options TEXT NOT NULL DEFAULT '{}',
+    image_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    session TEXT,
+    user TEXT,
+    profiled INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS audits_sha256 ON audits (sha256, id);
+CREATE INDEX IF NOT EXISTS audits_phash ON audits (phash, id);
+CREATE INDEX IF NOT EXISTS audits_verdict ON audits (verdict, id);
+CREATE INDEX IF NOT EXISTS audits_created ON audits (created);
+CREATE TABLE IF NOT EXISTS spend (
+    scope TEXT PRIMARY KEY,
+    audits INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    image_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    truncated INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    job_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    profile BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_created ON profiles (created);
+"""
+
+
+def _signed(value: int) -> int:
+    """64-bit unsigned hash as the signed integer SQLite stores."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+@dataclass
+class AuditRecord:
+    """One stored audit."""
+    sha256: str
+    prompt_version: str
+    created: float = field(default_factory=time.time)
+    job_id: Optional[str] = None
+    phash: Optional[int] = None  # dHash of the preview (signed 64-bit)
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    verdict: Optional[str] = None
+    confidence: Optional[float] = None
+    tiers: Dict[str, Optional[int]] = field(default_factory=dict)  # red flags per tier
+    local_suspicion: Optional[float] = None
+    model: Optional[str] = None
+    escalated: bool = False
+    degraded: bool = False
+    latency: Optional[float] = None  # seconds until the model report
+    total_time: Optional[float] = None  # seconds from enqueue to the stored result
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    options: Dict[str, Any] = field(default_factory=dict)
+    image_tokens: int = 0  # estimated share of prompt_tokens
+    cost: float = 0.0  # USD at list prices
+    truncated: bool = False  # the report hit the output-token cap
+    session: Optional[str] = None
+    user: Optional[str] = None
+    profiled: bool = False  # a profile is stored under job_id
+    id: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row) -> "AuditRecord":
+        record = cls(**{key: row[key] for key in row.keys()})
+        record.tiers = json.loads(record.tiers)
+        record.options = json.loads(record.options)
+        record.escalated, record.degraded = bool(record.escalated), bool(record.degraded)
+        record.truncated, record.profiled = bool(record.truncated), bool(record.profiled)
+        return record
+
+    @property
+    def spend(self) -> Spend:
+        return Spend(1, self.prompt_tokens, self.image_tokens, self.output_tokens, self.cost, int(self.truncated))
+
+    @property
+    def scopes(self) -> Dict[str, str]:
+        """Spend rollups this audit counts toward."""
+        return spend_scopes(self.session, self.user, self.created)
+
+
+def audit_record(
+    workspace: ImageWorkspace,
+    outcome: AuditOutcome,
+    options: AuditOptions,
+    job_id: Optional[str] = None,
+    total_time: Optional[float] = None,
+    session: Optional[str] = None,
+    user: Optional[str] = None,
+) -> AuditRecord:
+    """
+    Summarize a finished audit for the store.
+
+    Args:
+        workspace: The audited upload
+        outcome: Pipeline result
+        options: Toggles the audit ran with
+        job_id: Queue job that produced it
+        total_time: Seconds from enqueue to result
+        session: Browser session its spend is charged to
+        user: Signed-in user its spend is charged to
+    """
+    protocol = load_protocol()
+    verdict = outcome.verdict()
+    spend = outcome.spend()
+    source = workspace.source
+    return AuditRecord(
+        sha256=source.sha256,
+        prompt_version=f"{protocol.version}·{protocol.sha256[:8]}",
+        job_id=job_id,
+        phash=_signed(frame_hash(workspace.preview)),
+        format=source.format,
+        width=workspace.size[0],
+        height=workspace.size[1],
+        verdict=verdict.label if verdict is not None else None,
+        confidence=verdict.confidence if verdict is not None else None,
+        tiers=parse_tiers(outcome.model_report),
+        local_suspicion=local_suspicion(outcome.local_reports),
+        model=outcome.model_name,
+        escalated=outcome.routed is not None and outcome.routed.escalated,
+        degraded=outcome.degraded,
+        latency=outcome.elapsed_time,
+        total_time=total_time,
+        prompt_tokens=spend.prompt_tokens,
+        output_tokens=spend.output_tokens,
+        options=asdict(options),
+        image_tokens=spend.image_tokens,
+        cost=spend.cost,
+        truncated=bool(spend.truncated),
+        session=session,
+        user=user,
+        profiled=outcome.profiled,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AuditStore(Database):
+    """Audit history in one SQLite database (safe across threads and processes)."""
+
+    def __init__(self, path: Path = DB_PATH):
+        super().__init__(path, SCHEMA)
+
+    def record(self, record: AuditRecord) -> None:
+        """Insert an audit and add it to its spend rollups (a job is recorded at most once)."""
+        row = asdict(record)
+        row.pop("id")
+        row["tiers"], row["options"] = json.dumps(row["tiers"]), json.dumps(row["options"])
+        columns = ", ".join(row)
+        with self._transaction() as db:
+            inserted = db.execute(
+                f"INSERT OR IGNORE INTO audits ({columns}) VALUES ({', '.join('?' * len(row))})",
+                tuple(row.values()),
+            ).rowcount
+            if inserted:
+                self._charge(db, record.scopes, record.spend)
+
+    def charge(self, scopes: Mapping[str, str], spend: Spend) -> None:
+        """Add spend that has no audit record (video audits, jobs that ended without a result)."""
+        with self._transaction() as db:
+            self._charge(db, scopes, spend)
+
+    @staticmethod
+    def _charge(db, scopes: Mapping[str, str], spend: Spend) -> None:
+        values = asdict(spend)
+        updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in SPEND_FIELDS)
+        db.executemany(
+            f"INSERT INTO spend (scope, {', '.join(SPEND_FIELDS)}) VALUES ({', '.join('?' * (len(values) + 1))})"
+            f" ON CONFLICT (scope) DO UPDATE SET {updates}",
+            [(scope, *values.values()) for scope in scopes.values()],
+        )
+
+    def save_profile(self, job_id: str, profile: AuditProfile) -> None:
+        """Keep a job's profile (compressed), dropping profiles past retention."""
+        blob = zlib.compress(pickle.dumps(profile, protocol=pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO profiles (job_id, created, profile) VALUES (?, ?, ?)", (job_id, now, blob))
+            db.execute("DELETE FROM profiles WHERE created < ?", (now - PROFILE_RETENTION,))
+
+    def profile(self, job_id: str) -> Optional[AuditProfile]:
+        row = self._connect().execute("SELECT profile FROM profiles WHERE job_id = ?", (job_id,)).fetchone()
+        return pickle.loads(zlib.decompress(row["profile"])) if row is not None else None
+
+    def spend(self, scopes: Mapping[str, str]) -> Dict[str, Spend]:
+        """
+        Current rollups.
+
+        Args:
+            scopes: Name → rollup key, as from ``spend_scopes``
+
+        Returns:
+            Rollup per name (empty ``Spend`` for keys nothing was charged to yet)
+        """
+        keys = list(scopes.values())
+        rows = self._connect().execute(
+            f"SELECT * FROM spend WHERE scope IN ({', '.join('?' * len(keys))})", keys
+        ).fetchall()
+        found = {row["scope"]: Spend(**{name: row[name] for name in SPEND_FIELDS}) for row in rows}
+        return {name: found.get(key, Spend()) for name, key in scopes.items()}
+
+    def lookup(self, sha256: str, limit: int = 5) -> List[AuditRecord]:
+        """Most recent audits of exactly these bytes."""
+        rows = self._connect().execute(
+            "SELECT * FROM audits WHERE sha256 = ? ORDER BY id DESC LIMIT ?", (sha256, limit)
+        ).fetchall()
+        return [AuditRecord.from_row(row) for row in rows]
+
+    def similar(self, phash: int, exclude_sha256: str, limit: int = 5) -> List[AuditRecord]:
+        """Most recent audits of other files with the same perceptual hash (re-encodes, resizes)."""
+        rows = self._connect().execute(
+            "SELECT * FROM audits WHERE phash = ? AND sha256 != ? ORDER BY id DESC LIMIT ?",
+            (_signed(phash), exclude_sha256, limit),
+        ).fetchall()
+        return [AuditRecord.from_row(row) for row in rows]
+
+    def page(self, before: Optional[int] = None, verdict: Optional[str] = None, limit: int = PAGE_SIZE) -> List[AuditRecord]:
+        """
+        One page of history, newest first.
+
+        Args:
+            before: Keyset cursor — the ``id`` of the last row of the previous page
+            verdict: Only audits with this verdict label
+            limit: Page size
+        """
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        if verdict is not None:
+            clauses.append("verdict = ?")
+            params.append(verdict)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM audits {where} ORDER BY id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [AuditRecord.from_row(row) for row in rows]
+
+    def verdict_counts(self, since: float) -> Dict[Optional[str], int]:
+        """Audits per verdict recorded since ``since`` (epoch seconds)."""
+        rows = self._connect().execute(
+            "SELECT verdict, COUNT(*) FROM audits WHERE created >= ? GROUP BY verdict", (since,)
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def prior(self, sha256: str, phash: int) -> Tuple[Optional[AuditRecord], Optional[AuditRecord]]:
+        """Latest audit of these exact bytes and latest of a visually identical file."""
+        exact, similar = self.lookup(sha256, limit=1), self.similar(phash, sha256, limit=1)
+        return (exact[0] if exact else None), (similar[0] if similar else None)
+
+    def approximate_count(self) -> int:
+        """Rows ever recorded (the largest id — constant time, unlike COUNT(*))."""
+        return self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM audits").fetchone()[0]
+
+
+class SharedAuditStore:
+    """
+    The same history on the shared key-value backend, for multi-replica deployments.
+
+    Records are JSON strings under ``audits:<id>``; sorted sets scored by id
+    index them by content hash, perceptual hash and verdict (keyset pages are
+    ``ZREVRANGEBYSCORE … (cursor``), and per-verdict sets scored by time
+    answer the analytics counts. Records never change, so they are near-cached.
+    """
+
+    prefix = f"{KEY_PREFIX}audits:"
+
+    def __init__(self, backend: Any = None):
+        self.backend = backend if backend is not None else shared_backend()
+        self._records = NearCache(NEAR_RECORDS, NEAR_TTL)
+
+    def record(self, record: AuditRecord) -> None:
+        """Insert an audit (a job is recorded at most once)."""
+        if record.job_id is not None and not self.backend.set(f"{self.prefix}job:{record.job_id}", 1, nx=True):
+            return
+        record.id = self.backend.incr(f"{self.prefix}next")
+        verdict = record.verdict or NO_VERDICT
+        pipe = self.backend.pipeline(transaction=False)
+        pipe.set(f"{self.prefix}{record.id}", json.dumps(asdict(record)))
+        pipe.zadd(f"{self.prefix}by_id", {record.id: record.id})
+        pipe.zadd(f"{self.prefix}sha:{record.sha256}", {record.id: record.id})
+        if record.phash is not None:
+            pipe.zadd(f"{self.prefix}phash:{record.phash}", {record.id: record.id})
+        pipe.zadd(f"{self.prefix}verdict:{verdict}", {record.id: record.id})
+        pipe.zadd(f"{self.prefix}created:{verdict}", {record.id: record.created})
+        self._charge(pipe, record.scopes, record.spend)
+        pipe.execute()
+
+    def charge(self, scopes: Mapping[str, str], spend: Spend) -> None:
+        """Add spend that has no audit record (video audits, jobs that ended without a result)."""
+        pipe = self.backend.pipeline(transaction=False)
+        self._charge(pipe, scopes, spend)
+        pipe.execute()
+
+    def _charge(self, pipe, scopes: Mapping[str, str], spend: Spend) -> None:
+        for scope in scopes.values():
+            for name, value in asdict(spend).items():
+                pipe.incrbyfloat(f"{self.prefix}spend:{scope}:{name}", value)
+                pipe.expire(f"{self.prefix}spend:{scope}:{name}", SPEND_TTL)
+
+    def _fetch(self, ids: List[bytes]) -> List[AuditRecord]:
+        """Records for index members, near-cache first, the rest in one MGET."""
+        ids = [int(member) for member in ids]
+        found: Dict[int, AuditRecord] = {}
+        missing = []
+        for audit_id in ids:
+            hit, record = self._records.get(audit_id)
+            if hit:
+                found[audit_id] = record
+            else:
+                missing.append(audit_id)
+        if missing:
+            values = self.backend.mget([f"{self.prefix}{audit_id}" for audit_id in missing])
+            for audit_id, value in zip(missing, values):
+                if value is not None:
+                    found[audit_id] = AuditRecord(**json.loads(value))
+                    self._records.put(audit_id, found[audit_id])
+        return [found[audit_id] for audit_id in ids if audit_id in found]
+
+    def lookup(self, sha256: str, limit: int = 5) -> List[AuditRecord]:
+        return self._fetch(self.backend.zrevrangebyscore(f"{self.prefix}sha:{sha256}", "+inf", "-inf", 0, limit))
+
+    def similar(self, phash: int, exclude_sha256: str, limit: int = 5) -> List[AuditRecord]:
+        ids = self.backend.zrevrangebyscore(f"{self.prefix}phash:{_signed(phash)}", "+inf", "-inf", 0, limit * 4)
+        return [record for record in self._fetch(ids) if record.sha256 != exclude_sha256][:limit]
+
+    def prior(self, sha256: str, phash: int) -> Tuple[Optional[AuditRecord], Optional[AuditRecord]]:
+        """Both lookups in one pipelined round trip, then one MGET."""
+        pipe = self.backend.pipeline(transaction=False)
+        pipe.zrevrangebyscore(f"{self.prefix}sha:{sha256}", "+inf", "-inf", 0, 1)
+        pipe.zrevrangebyscore(f"{self.prefix}phash:{_signed(phash)}", "+inf", "-inf", 0, 4)
+        exact_ids, similar_ids = pipe.execute()
+        records = {record.id: record for record in self._fetch([*exact_ids, *similar_ids])}
+        exact = records.get(int(exact_ids[0])) if exact_ids else None
+        similar = next(
+            (records[int(member)] for member in similar_ids
+             if int(member) in records and records[int(member)].sha256 != sha256),
+            None,
+        )
+        return exact, similar
+
+    def page(self, before: Optional[int] = None, verdict: Optional[str] = None, limit: int = PAGE_SIZE) -> List[AuditRecord]:
+        index = f"{self.prefix}verdict:{verdict}" if verdict is not None else f"{self.prefix}by_id"
+        high = f"({before}" if before is not None else "+inf"
+        return self._fetch(self.backend.zrevrangebyscore(index, high, "-inf", 0, limit))
+
+    def verdict_counts(self, since: float) -> Dict[Optional[str], int]:
+        labels = (*VERDICTS, MANIPULATED, NO_VERDICT)
+        pipe = self.backend.pipeline(transaction=False)
+        for label in labels:
+            pipe.zcount(f"{self.prefix}created:{label}", since, "+inf")
+        return {
+            (None if label == NO_VERDICT else label): count
+            for label, count in zip(labels, pipe.execute()) if count
+        }
+
+    def approximate_count(self) -> int:
+        return int(self.backend.get(f"{self.prefix}next") or 0)
+
+    def save_profile(self, job_id: str, profile: AuditProfile) -> None:
+        self.backend.set(f"{self.prefix}profile:{job_id}", seal(profile), ex=PROFILE_RETENTION)
+
+    def profile(self, job_id: str) -> Optional[AuditProfile]:
+        blob = self.backend.get(f"{self.prefix}profile:{job_id}")
+        if blob is None:
+            return None
+        try:
+            return unseal(blob)
+        except TamperedValue:
+            logger.warning("Ignoring profile %s with a bad signature", job_id)
+            return None
+
+    def spend(self, scopes: Mapping[str, str]) -> Dict[str, Spend]:
+        """Current rollups, every counter in one MGET."""
+        keys = [f"{self.prefix}spend:{scope}:{name}" for scope in scopes.values() for name in SPEND_FIELDS]
+        values = iter(self.backend.mget(keys))
+        rollups = {}
+        for name in scopes:
+            counters = {field_name: float(next(values) or 0) for field_name in SPEND_FIELDS}
+            rollups[name] = Spend(**{
+                field_name: value if field_name == "cost" else int(value) for field_name, value in counters.items()
+            })
+        return rollups
+
+
+@lru_cache(maxsize=None)
+def audit_store(path: Path = DB_PATH) -> Union[AuditStore, SharedAuditStore]:
+    """The process-wide store: shared when KINETIC_REDIS_URL is set, else SQLite at ``path``."""
+    if REDIS_URL:
+        return SharedAuditStore()
+    return AuditStore(path)
@@ -0,0 +1,217 @@
+"""
+⏱️ Stage Tracing
+Where an audit's time goes: spans for each stage (validate, queue wait,
+decode, payload build, local analyzers, model time-to-first-token and total,
+zoom verification, render) feed per-stage latency histograms and the trace of
+the audit they belong to.
+
+Histograms are per process and exported in the Prometheus text format on
+``/metrics`` by a small HTTP server thread — the Streamlit server with
+``METRICS_PORT`` in secrets (UI stages plus embedded workers), and each
+standalone worker process with ``--metrics-port``. The trace travels with the
+outcome, so the UI shows the breakdown of an audit wherever it ran.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Histogram upper bounds in seconds (Prometheus ``le`` labels)
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0)
+METRIC_NAME = "kinetic_stage_seconds"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Stage names in pipeline order (panels sort by it; unknown stages go last)
+STAGES = (
+    "validate", "queue_wait", "decode", "frame_hashing", "payload_build", "overlays",
+    "local_analyzers", "model_ttft", "model_total", "zoom_verify", "end_to_end", "render",
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HISTOGRAMS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Histogram:
+    """Cumulative-bucket latency histogram (not thread-safe; ``StageMetrics`` locks)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets, interpolating inside the one that holds the rank."""
+        if not self.count:
+            return 0.0
+        rank, seen, lower = q * self.count, 0, 0.0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            if count and seen + count >= rank:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+    def copy(self) -> "Histogram":
+        clone = Histogram(self.buckets)
+        clone.counts, clone.sum, clone.count = list(self.counts), self.sum, self.count
+        return clone
+
+
+class StageMetrics:
+    """Thread-safe histograms keyed by (stage, model) shared by every audit in the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, stage: str, seconds: float, model: Optional[str] = None) -> None:
+        with self._lock:
+            self.histograms.setdefault((stage, model or ""), Histogram()).observe(seconds)
+
+    def snapshot(self) -> List[Tuple[str, str, Histogram]]:
+        """(stage, model, histogram copy) rows in pipeline order."""
+        with self._lock:
+            rows = [(stage, model, histogram.copy()) for (stage, model), histogram in self.histograms.items()]
+        return sorted(rows, key=lambda row: (STAGES.index(row[0]) if row[0] in STAGES else len(STAGES), row[0], row[1]))
+
+    def exposition(self) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each audit stage.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, model, histogram in self.snapshot():
+            labels = f'stage="{stage}"' + (f',model="{model}"' if model else "")
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = StageMetrics()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SPANS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Span:
+    """One timed stage of an audit."""
+    stage: str
+    start: float  # seconds after the trace started
+    duration: float
+    model: Optional[str] = None
+
+
+@dataclass
+class Trace:
+    """Spans of one audit, in the order they finished."""
+    spans: List[Span] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+
+_CURRENT: ContextVar[Optional[Trace]] = ContextVar("kinetic_trace", default=None)
+
+
+@contextmanager
+def trace_scope() -> Iterator[Trace]:
+    """Collect the spans recorded in this thread into a fresh trace."""
+    trace = Trace()
+    token = _CURRENT.set(trace)
+    try:
+        yield trace
+    finally:
+        _CURRENT.reset(token)
+
+
+def record(stage: str, seconds: float, model: Optional[str] = None, started: Optional[float] = None) -> None:
+    """
+    Count a stage measured elsewhere (a worker pool, a streamed call).
+
+    Args:
+        stage: Stage name (histogram label)
+        seconds: Duration
+        model: Model label for model stages
+        started: ``perf_counter`` value when the stage began (defaults to ``seconds`` ago)
+    """
+    METRICS.observe(stage, seconds, model)
+    trace = _CURRENT.get()
+    if trace is not None:
+        began = started if started is not None else time.perf_counter() - seconds
+        trace.spans.append(Span(stage, began - trace.started, seconds, model))
+
+
+@contextmanager
+def span(stage: str, model: Optional[str] = None) -> Iterator[None]:
+    """Time the enclosed block as ``stage`` (recorded even if it raises)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started, model, started)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# METRICS ENDPOINT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("metrics: " + format, *args)
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` for this process on a daemon thread.
+
+    Raises:
+        OSError: The port is taken
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="kinetic-metrics", daemon=True).start()
+    logger.info("Metrics on http://%s:%d/metrics", host, port)
+    return server
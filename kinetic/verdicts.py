@@ -0,0 +1,154 @@
+"""
+⚖️ Verdict Parsing & Combination
+Turns free-form model reports and local analyzer scores into one comparable verdict.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from kinetic.analyzers import AnalyzerReport
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VERDICT BANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Canonical bands, most authentic first (matches the UPL verdict framework)
+VERDICTS = ("AUTHENTIC", "LIKELY AUTHENTIC", "INCONCLUSIVE", "LIKELY AI", "DEFINITELY AI")
+MANIPULATED = "MANIPULATED"
+
+# Longest phrases first so "LIKELY AUTHENTIC" never matches as "AUTHENTIC"
+_ALIASES = (
+    ("LIKELY AUTHENTIC", "LIKELY AUTHENTIC"),
+    ("PROBABLY AUTHENTIC", "LIKELY AUTHENTIC"),
+    ("DEFINITELY AI", "DEFINITELY AI"),
+    ("AI-GENERATED", "DEFINITELY AI"),
+    ("AI GENERATED", "DEFINITELY AI"),
+    ("LIKELY AI", "LIKELY AI"),
+    ("DIGITALLY MANIPULATED", MANIPULATED),
+    ("MANIPULATED", MANIPULATED),
+    ("SUSPICIOUS", "INCONCLUSIVE"),
+    ("INCONCLUSIVE", "INCONCLUSIVE"),
+    ("AUTHENTIC", "AUTHENTIC"),
+)
+
+_VERDICT_LINE = re.compile(r"VERDICT[^:\n]*:\s*\**\s*([^\n]+)", re.IGNORECASE)
+_CONFIDENCE = re.compile(r"CONFIDENCE[^:\n]*:\s*\**\s*(\d{1,3}(?:\.\d+)?)\s*%", re.IGNORECASE)
+_TIER_HEADING = re.compile(r"^#{2,4}\s*\W*\s*(TIER\s*-?\d+)\b", re.IGNORECASE | re.MULTILINE)
+_RED_FLAGS = re.compile(r"RED FLAGS FOUND\**\s*:\s*\**\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class Verdict:
+    """Normalised verdict. ``confidence`` is 0-100, ``source`` is model | local | combined."""
+    label: str
+    confidence: Optional[float] = None
+    source: str = "model"
+
+    @property
+    def is_ai(self) -> bool:
+        return self.label in ("LIKELY AI", "DEFINITELY AI", MANIPULATED)
+
+    @property
+    def severity(self) -> float:
+        """Position on the authentic → AI scale (manipulation ranks between the AI bands)."""
+        return 3.5 if self.label == MANIPULATED else float(VERDICTS.index(self.label))
+
+
+def _normalise(phrase: str) -> Optional[str]:
+    upper = phrase.upper()
+    for alias, label in _ALIASES:
+        if alias in upper:
+            return label
+    return None
+
+
+def parse_verdict(text: str) -> Optional[Verdict]:
+    """
+    Extract the verdict band and confidence from a model report.
+
+    Args:
+        text: Markdown report following the UPL output format
+
+    Returns:
+        Verdict, or None if no recognisable verdict line exists
+    """
+    if not text:
+        return None
+    for match in _VERDICT_LINE.finditer(text):
+        phrase = match.group(1)
+        if "/" in phrase:  # template echo like "[AUTHENTIC / SUSPICIOUS / ...]"
+            continue
+        label = _normalise(phrase)
+        if label:
+            confidence = _CONFIDENCE.search(text)
+            return Verdict(label, float(confidence.group(1)) if confidence else None)
+    return None
+
+
+def parse_tiers(text: str) -> Dict[str, Optional[int]]:
+    """
+    Red-flag count per tier section of a report (monolithic or fan-out).
+
+    Returns:
+        {"TIER -1": 2, "TIER 0": None, ...} — None when a section has no count
+    """
+    if not text:
+        return {}
+    headings = list(_TIER_HEADING.finditer(text))
+    tiers: Dict[str, Optional[int]] = {}
+    for heading, following in zip(headings, headings[1:] + [None]):
+        section = text[heading.end():following.start() if following is not None else len(text)]
+        count = _RED_FLAGS.search(section)
+        tiers[re.sub(r"\s+", " ", heading.group(1).upper())] = int(count.group(1)) if count else None
+    return tiers
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOCAL EVIDENCE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def local_suspicion(reports: Iterable[AnalyzerReport]) -> Optional[float]:
+    """Mean AI suspicion over successful analyzers, or None if none succeeded."""
+    scores = [report.score for report in reports if report.status == "ok" and report.score is not None]
+    return sum(scores) / len(scores) if scores else None
+
+
+def verdict_from_suspicion(suspicion: float) -> Verdict:
+    """
+    Map a local suspicion score to a verdict band.
+
+    Local pixel statistics alone cannot prove camera capture, so the strongest
+    authentic band reachable is LIKELY AUTHENTIC.
+    """
+    if suspicion >= 0.8:
+        label = "DEFINITELY AI"
+    elif suspicion >= 0.6:
+        label = "LIKELY AI"
+    elif suspicion >= 0.3:
+        label = "INCONCLUSIVE"
+    else:
+        label = "LIKELY AUTHENTIC"
+    confidence = abs(suspicion - 0.5) * 2 * 100
+    return Verdict(label, round(confidence, 1), source="local")
+
+
+def most_severe(verdicts: Iterable[Optional[Verdict]]) -> Optional[Verdict]:
+    """The least authentic verdict of a set (None entries are ignored)."""
+    present = [verdict for verdict in verdicts if verdict is not None]
+    return max(present, key=lambda verdict: verdict.severity) if present else None
+
+
+def combine_verdicts(model: Optional[Verdict], suspicion: Optional[float]) -> Optional[Verdict]:
+    """
+    Merge the model verdict with local evidence.
+
+    Local evidence can only make the result more cautious: a strongly
+    suspicious local score pulls an authentic model verdict down to
+    INCONCLUSIVE, never the other way round.
+    """
+    if model is None:
+        return verdict_from_suspicion(suspicion) if suspicion is not None else None
+    if suspicion is None or model.label not in ("AUTHENTIC", "LIKELY AUTHENTIC") or suspicion < 0.7:
+        return model
+    return Verdict("INCONCLUSIVE", model.confidence, source="combined")
@@ -0,0 +1,305 @@
+"""
+🎬 Video Analysis Pipeline
+Decode once, audit only scene keyframes, measure temporal consistency locally.
+"""
+
+import contextvars
+import io
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from kinetic.deadline import AuditAborted, current_deadline, wait_for
+from kinetic.tracing import record, span
+from kinetic.verdicts import Verdict, combine_verdicts, most_severe, parse_verdict
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MAX_VIDEO_BYTES = 200 * 1024 * 1024
+VIDEO_DEADLINE = 600.0  # seconds; a whole video audit, decode and every keyframe call included
+VIDEO_EXTENSIONS = ("mp4", "mov", "m4v", "webm", "mkv", "avi")
+
+SAMPLE_FPS = 4.0  # frames per second inspected for scene changes & temporal metrics
+SCENE_THRESHOLD = 0.35  # half-L1 histogram distance that starts a new scene
+MIN_KEYFRAME_GAP = 2.0  # seconds; scene cuts closer than this are merged
+MAX_KEYFRAME_GAP = 15.0  # seconds; long static shots still get re-audited
+MAX_KEYFRAMES = 24  # hard cap on model audits per video
+ECONOMY_KEYFRAMES = 6  # cap when the spend budget puts audits in economy mode
+AUDIT_CONCURRENCY = 4  # simultaneous model calls per video
+
+KEYFRAME_SIDE = 1536  # keyframes are downscaled before being sent to the model
+ANALYSIS_WIDTH = 320  # resolution of the cheap per-sample statistics
+
+AuditFn = Callable[[Image.Image], Tuple[bool, str]]
+
+
+class VideoLoadError(ValueError):
+    """Video rejected or undecodable; message is safe to show users."""
+
+
+def sniff_video_format(data: bytes) -> Optional[str]:
+    """
+    Identify common video containers from magic bytes.
+
+    Returns:
+        "MP4" (ISO-BMFF incl. MOV), "MATROSKA" (MKV/WebM), "AVI" or None
+    """
+    if data[4:8] == b"ftyp":
+        return "MP4"
+    if data.startswith(b"\x1a\x45\xdf\xa3"):
+        return "MATROSKA"
+    if data[:4] == b"RIFF" and data[8:12] == b"AVI ":
+        return "AVI"
+    return None
+
+
+def _import_av():
+    try:
+        import av
+    except ImportError:
+        raise VideoLoadError("Video analysis requires PyAV: pip install av")
+    return av
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FRAME SAMPLING & SCENE DETECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class FrameSample:
+    """Cheap statistics of one sampled frame."""
+    time: float
+    histogram: np.ndarray
+    mean_luma: float
+    noise: float
+
+
+def _sample_stats(gray: np.ndarray, timestamp: float) -> FrameSample:
+    """Histogram, brightness and high-pass noise level of a small grayscale frame."""
+    plane = gray.astype(np.float32)
+    histogram = np.bincount((gray >> 3).ravel(), minlength=32).astype(np.float32)
+    histogram /= max(histogram.sum(), 1.0)
+    residual = plane[1:-1, 1:-1] - 0.25 * (plane[:-2, 1:-1] + plane[2:, 1:-1] + plane[1:-1, :-2] + plane[1:-1, 2:])
+    # Median absolute deviation: robust to edges, tracks sensor/synthesis noise
+    noise = float(np.median(np.abs(residual)) * 1.4826)
+    return FrameSample(timestamp, histogram, float(plane.mean()), noise)
+
+
+def histogram_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Half L1 distance between normalised histograms, in [0, 1]."""
+    return float(np.abs(a - b).sum() * 0.5)
+
+
+def iter_samples(data: bytes, sample_fps: float = SAMPLE_FPS) -> Iterator[Tuple[FrameSample, "object"]]:
+    """
+    Decode the first video stream frame by frame, yielding a sample every 1/fps s.
+
+    Only the current decoded frame is alive; skipped frames are never converted.
+
+    Yields:
+        (FrameSample, av.VideoFrame) pairs
+    """
+    av = _import_av()
+    try:
+        container = av.open(io.BytesIO(data))
+    except Exception as e:
+        raise VideoLoadError(f"Unreadable video container: {e}")
+    with container:
+        if not container.streams.video:
+            raise VideoLoadError("No video stream found")
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        height = max(2, int(round(stream.height * ANALYSIS_WIDTH / max(stream.width, 1))))
+        next_time = 0.0
+        for frame in container.decode(stream):
+            timestamp = float(frame.time or 0.0)
+            if timestamp + 1e-6 < next_time:
+                continue
+            next_time = timestamp + 1.0 / sample_fps
+            gray = frame.to_ndarray(format="gray", width=ANALYSIS_WIDTH, height=height)
+            yield _sample_stats(gray, timestamp), frame
+
+
+def _keyframe_image(frame) -> Image.Image:
+    """Convert a decoded frame to a bounded-size RGB PIL image."""
+    width, height = frame.width, frame.height
+    scale = min(1.0, KEYFRAME_SIDE / max(width, height))
+    if scale < 1.0:
+        width, height = int(width * scale) // 2 * 2, int(height * scale) // 2 * 2
+    return frame.to_image(width=width, height=height)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEMPORAL CONSISTENCY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def temporal_metrics(samples: List[FrameSample]) -> Dict[str, float]:
+    """
+    Local temporal-consistency metrics for one segment.
+
+    - noise_cv: coefficient of variation of the noise level. A sensor's noise
+      floor is stable within a shot; per-frame synthesis re-rolls it.
+    - flicker: std of frame-to-frame brightness changes after removing the
+      segment's linear trend (fades and exposure ramps are not flicker).
+    """
+    if len(samples) < 3:
+        return {"noise_cv": 0.0, "flicker": 0.0, "samples": float(len(samples))}
+    noise = np.array([sample.noise for sample in samples])
+    luma = np.array([sample.mean_luma for sample in samples])
+    times = np.array([sample.time for sample in samples])
+    noise_cv = float(noise.std() / max(noise.mean(), 1e-3))
+    if np.ptp(times) > 0:
+        luma = luma - np.polyval(np.polyfit(times, luma, 1), times)
+    flicker = float(np.diff(luma).std())
+    return {"noise_cv": noise_cv, "flicker": flicker, "samples": float(len(samples))}
+
+
+def temporal_suspicion(metrics: Dict[str, float]) -> Optional[float]:
+    """Map temporal metrics to AI suspicion in [0, 1] (None if too few samples)."""
+    if metrics.get("samples", 0) < 3:
+        return None
+    noise_term = min(1.0, metrics["noise_cv"] / 0.5)
+    flicker_term = min(1.0, metrics["flicker"] / 4.0)
+    return 0.6 * noise_term + 0.4 * flicker_term
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PIPELINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Segment:
+    """One scene (or slice of a long scene) and its audited keyframe."""
+    start: float
+    end: float
+    keyframe_time: float
+    samples: List[FrameSample] = field(default_factory=list, repr=False)
+    audit: Optional[Future] = field(default=None, repr=False)
+    success: bool = False
+    report: str = ""
+    metrics: Dict[str, float] = field(default_factory=dict)
+    verdict: Optional[Verdict] = None
+
+
+@dataclass
+class VideoAudit:
+    """Timeline of per-segment verdicts plus pipeline counters."""
+    segments: List[Segment]
+    duration: float
+    sampled_frames: int
+    keyframe_cap_hit: bool = False
+
+    @property
+    def overall(self) -> Optional[Verdict]:
+        """A video is as suspicious as its most suspicious segment."""
+        return most_severe(segment.verdict for segment in self.segments)
+
+
+def _audit_keyframe(audit_fn: AuditFn, image: Image.Image) -> Tuple[bool, str]:
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.check("keyframe_audit")  # queued behind calls that just aborted: do not start
+    with span("keyframe_audit"):
+        return audit_fn(image)
+
+
+def analyze_video(
+    data: bytes,
+    audit_fn: AuditFn,
+    max_keyframes: int = MAX_KEYFRAMES,
+    concurrency: int = AUDIT_CONCURRENCY,
+    progress: Optional[Callable[[float, int], None]] = None,
+) -> VideoAudit:
+    """
+    Run the video pipeline: decode → scene detection → bounded-concurrency audits.
+
+    Keyframe audits are submitted the moment a scene starts, so model calls
+    overlap the rest of the decode instead of waiting for it. They run in the
+    caller's context: under ``deadline_scope`` a cancel or an expired deadline
+    stops the decode, cancels keyframes not yet started and aborts calls in flight.
+
+    Args:
+        data: Complete video file
+        audit_fn: Image audit, called once per keyframe (e.g. ``run_forensic_audit``)
+        max_keyframes: Maximum audits for the whole video
+        concurrency: Maximum audits in flight at once
+        progress: Optional callback(timestamp_seconds, audits_submitted)
+
+    Returns:
+        VideoAudit with a timeline of segment verdicts
+
+    Raises:
+        VideoLoadError: If the file cannot be decoded
+        AuditAborted: The audit was cancelled or ran out of time
+    """
+    if len(data) > MAX_VIDEO_BYTES:
+        raise VideoLoadError(f"Video too large. Maximum size: {MAX_VIDEO_BYTES // (1024 * 1024)}MB")
+
+    segments: List[Segment] = []
+    sampled = 0
+    cap_hit = False
+    previous: Optional[FrameSample] = None
+    last_time = 0.0
+
+    deadline = current_deadline()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="video-audit") as executor:
+        try:
+            decode_started = time.perf_counter()
+            for sample, frame in iter_samples(data):
+                if deadline is not None:
+                    deadline.check("video_decode")
+                sampled += 1
+                last_time = sample.time
+                current = segments[-1] if segments else None
+                since_key = sample.time - current.keyframe_time if current else float("inf")
+                cut = previous is not None and histogram_distance(sample.histogram, previous.histogram) > SCENE_THRESHOLD
+                previous = sample
+
+                if current is None or ((cut and since_key >= MIN_KEYFRAME_GAP) or since_key >= MAX_KEYFRAME_GAP):
+                    if len(segments) < max_keyframes:
+                        if current is not None:
+                            current.end = sample.time
+                        segment = Segment(sample.time, sample.time, sample.time)
+                        keyframe = _keyframe_image(frame)
+                        segment.audit = executor.submit(contextvars.copy_context().run, _audit_keyframe, audit_fn, keyframe)
+                        segments.append(segment)
+                        current = segment
+                        if progress:
+                            progress(sample.time, len(segments))
+                    else:
+                        cap_hit = True
+                current.samples.append(sample)
+
+            record("video_decode", time.perf_counter() - decode_started, started=decode_started)
+
+            if segments:
+                segments[-1].end = last_time
+
+            for segment in segments:
+                try:
+                    segment.success, segment.report = wait_for(segment.audit)
+                except AuditAborted:
+                    raise
+                except Exception as e:
+                    segment.success, segment.report = False, f"{type(e).__name__}: {e}"
+                segment.audit = None
+                segment.metrics = temporal_metrics(segment.samples)
+                model_verdict = parse_verdict(segment.report) if segment.success else None
+                segment.verdict = combine_verdicts(model_verdict, temporal_suspicion(segment.metrics))
+                segment.samples = []  # statistics are summarised; free the histograms
+        except AuditAborted:
+            # Keyframes still queued never start; those in flight abort on the same deadline
+            for segment in segments:
+                if segment.audit is not None:
+                    segment.audit.cancel()
+            raise
+
+    if not segments:
+        raise VideoLoadError("Video stream contains no decodable frames")
+    return VideoAudit(segments, last_time, sampled, cap_hit)
@@ -0,0 +1,287 @@
+"""
+🛠️ Audit Workers
+Claim jobs from the durable queue and run the audit pipeline on them.
+
+Run standalone, scaled independently of the UI:
+
+    python -m kinetic.worker --processes 4
+
+or embedded in the Streamlit server as background threads (see
+``EMBEDDED_WORKERS`` in secrets). Keys and model names come from the
+environment (GEMINI_API_KEYS / GEMINI_API_KEY, GEMINI_MODEL, …), falling back
+to ``.streamlit/secrets.toml``. With ``--metrics-port`` each process serves
+its stage latency histograms on ``/metrics``. Workers fill the verdict cache
+the UI reads: through Redis (``KINETIC_REDIS_URL`` and the replicas'
+``KINETIC_SIGNING_KEY``), or through the shared ``KINETIC_DATA_DIR`` on one host.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import tomllib
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from kinetic.cache import VerdictCache, verdict_cache
+from kinetic.costs import spend_scopes
+from kinetic.deadline import SAVINGS, AuditAborted, AuditCancelled, Deadline, deadline_scope
+from kinetic.jobs import (
+    CANCELLED,
+    DB_PATH,
+    DONE,
+    EXPIRED,
+    FAILED,
+    HEARTBEAT_SECONDS,
+    Job,
+    JobQueue,
+    job_queue,
+)
+from kinetic.loader import load_image
+from kinetic.pipeline import (
+    AuditModels,
+    AuditOptions,
+    AuditOutcome,
+    ModelSettings,
+    build_models,
+    execute_audit,
+    typical_audit_time,
+)
+from kinetic.profiling import PROFILE_ALL, profile_scope
+from kinetic.store import DB_PATH as STORE_PATH, AuditStore, SharedAuditStore, audit_record, audit_store
+from kinetic.tracing import record, span, start_metrics_server, trace_scope
+from kinetic.workspace import ImageWorkspace
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+IDLE_POLL = 0.5  # seconds between claims while the queue is empty
+SECRETS_PATH = Path(".streamlit/secrets.toml")
+CONFIG_KEYS = (
+    "GEMINI_API_KEYS",
+    "GEMINI_API_KEY",
+    "GEMINI_MODEL",
+    "GEMINI_ESCALATION_MODEL",
+    "GEMINI_HEDGE_MODEL",
+)
+
+
+def load_settings(secrets_path: Path = SECRETS_PATH) -> ModelSettings:
+    """Model settings from the environment, then the Streamlit secrets file."""
+    config: Dict[str, Any] = {}
+    if secrets_path.is_file():
+        with secrets_path.open("rb") as handle:
+            config.update(tomllib.load(handle))
+    config.update({key: os.environ[key] for key in CONFIG_KEYS if os.environ.get(key)})
+    return ModelSettings.from_config(config)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AuditWorker:
+    """One queue consumer: claims a job, runs it under its deadline, stores the outcome."""
+
+    def __init__(self, models: AuditModels, queue: JobQueue, store: Union[AuditStore, SharedAuditStore]):
+        self.models = models
+        self.queue = queue
+        self.store = store
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    def run_job(self, job: Job, payload: bytes) -> str:
+        """
+        Audit one claimed job, record its final state, and cache and store finished audits.
+
+        A heartbeat thread renews the lease, publishes the current stage and
+        turns a cancel request on the row into ``Deadline.cancel``. Stage spans
+        are collected into the outcome's trace; profiled jobs (or every job
+        under ``KINETIC_PROFILE``) also store a cProfile/tracemalloc capture.
+
+        Returns:
+            The job's final status
+        """
+        deadline = Deadline(job.deadline, age=job.elapsed)  # time spent queued counts against it
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(HEARTBEAT_SECONDS):
+                try:
+                    if self.queue.heartbeat(job.id, self.worker_id, deadline.stage):
+                        deadline.cancel()
+                except sqlite3.Error as e:
+                    logger.warning("Heartbeat for job %s failed: %s", job.id, e)
+
+        heartbeat = threading.Thread(target=beat, name=f"kinetic-heartbeat-{job.id[:8]}", daemon=True)
+        result, error, workspace, partial, options = None, None, None, None, None
+        with deadline_scope(deadline), trace_scope() as trace, profile_scope(job.profile or PROFILE_ALL) as capture:
+            heartbeat.start()  # only once nothing outside the try below can raise and leave it renewing the lease
+            try:
+                options = AuditOptions(**job.options)
+                record("queue_wait", (job.started or time.time()) - job.created)
+                deadline.check("decode")
+                with span("decode"):
+                    workspace = ImageWorkspace.from_source(load_image(payload))
+                del payload
+                partial = AuditOutcome(False, "", 0.0)  # keeps finished calls' usage if the audit aborts
+                result = execute_audit(workspace, self.models, options, deadline, partial)
+                record("end_to_end", deadline.elapsed)
+                result.trace = trace.spans
+                status = DONE
+            except AuditAborted as e:
+                cancelled = isinstance(e, AuditCancelled)
+                status, error = (CANCELLED if cancelled else EXPIRED), str(e)
+                SAVINGS.record_audit(cancelled, deadline.elapsed, typical_audit_time(self.models.router))
+            except Exception as e:
+                status, error = FAILED, f"{type(e).__name__}: {e}"
+                logger.exception("Job %s failed", job.id)
+            finally:
+                stop.set()
+                heartbeat.join()
+        if capture is not None:
+            try:
+                self.store.save_profile(job.id, capture.profile)
+                if result is not None:
+                    result.profiled = True
+            except Exception as e:
+                logger.warning("Could not store profile of job %s: %s", job.id, e)
+        self.queue.finish(job.id, self.worker_id, status, result, error, deadline.stage)
+        if status == DONE:
+            try:
+                verdict_cache().put(VerdictCache.key(job.digest, options, self.models), job.id, result)
+                self.store.record(
+                    audit_record(workspace, result, options, job.id, deadline.elapsed, job.session, job.user)
+                )
+            except Exception as e:
+                logger.warning("Could not store audit of job %s: %s", job.id, e)
+        elif partial is not None:
+            # Cancelled, expired or failed after model calls finished: their tokens were still billed
+            spend = partial.spend()
+            if spend.prompt_tokens or spend.output_tokens:
+                try:
+                    self.store.charge(spend_scopes(job.session, job.user), spend)
+                except Exception as e:
+                    logger.warning("Could not charge spend of job %s: %s", job.id, e)
+        return status
+
+    def serve(self, stop: threading.Event) -> None:
+        """Claim and run jobs until ``stop`` is set."""
+        self.queue.register_worker(self.worker_id)
+        logger.info("Worker %s serving %s", self.worker_id, self.queue.path)
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = self.queue.claim(self.worker_id)
+                except sqlite3.Error as e:
+                    logger.warning("Claim failed: %s", e)
+                    claimed = None
+                if claimed is None:
+                    stop.wait(IDLE_POLL)
+                    continue
+                job, payload = claimed
+                try:
+                    self.run_job(job, payload)
+                except Exception as e:
+                    # Outside the audit itself (profiler, store, queue): fail this job, keep serving
+                    logger.exception("Job %s failed", job.id)
+                    try:
+                        self.queue.finish(job.id, self.worker_id, FAILED, error=f"{type(e).__name__}: {e}")
+                    except sqlite3.Error as e:
+                        logger.warning("Could not fail job %s: %s", job.id, e)
+        finally:
+            self.queue.unregister_worker(self.worker_id)
+
+
+def start_threads(
+    models: AuditModels,
+    count: int,
+    queue: Optional[JobQueue] = None,
+    store: Optional[Union[AuditStore, SharedAuditStore]] = None,
+) -> List[threading.Thread]:
+    """
+    Run ``count`` workers as daemon threads of this process (the embedded mode).
+
+    Their jobs are re-queued by other workers if the process exits mid-audit.
+    """
+    queue, store = queue or job_queue(), store or audit_store()
+    threads = []
+    for number in range(count):
+        worker = AuditWorker(models, queue, store)
+        thread = threading.Thread(
+            target=worker.serve, args=(threading.Event(),), name=f"kinetic-worker-{number}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STANDALONE PROCESSES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _serve_process(settings: ModelSettings, db_path: Path, store_path: Path, metrics_port: Optional[int]) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    AuditWorker(build_models(settings), JobQueue(db_path), audit_store(store_path)).serve(stop)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run Kinetic.AI audit workers against the job queue.")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start (default 1)")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"queue database (default {DB_PATH})")
+    parser.add_argument(
+        "--store", type=Path, default=STORE_PATH,
+        help=f"audit history database when KINETIC_REDIS_URL is unset (default {STORE_PATH})",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=None,
+        help="serve Prometheus /metrics from each process, on this port plus the process number",
+    )
+    args = parser.parse_args(argv)
+
+    settings = load_settings()
+    if not settings.api_keys:
+        print("No API key: set GEMINI_API_KEYS or GEMINI_API_KEY", file=sys.stderr)
+        return 1
+    JobQueue(args.db), audit_store(args.store)  # create the schemas once before the workers race for them
+
+    # Spawned, not forked: a forked child would inherit the parent's cached stores and their open
+    # SQLite connections. Non-daemonic: each worker runs its own analyzer process pool
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_serve_process,
+            args=(settings, args.db, args.store, args.metrics_port + number if args.metrics_port is not None else None),
+            name=f"kinetic-worker-{number}",
+        )
+        for number in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+🧮 Shared Decoded-Pixel Workspace
+Decode once, derive lazily: every local forensic check reads from the same planes.
+"""
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+
+if TYPE_CHECKING:
+    from kinetic.loader import ImageSource
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# ITU-R BT.601 luma weights (matches PIL's "L" conversion)
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+# The spectrum is computed on a centred crop so FFT memory stays bounded on
+# 50MP uploads; 1024² is enough to resolve diffusion upsampling peaks.
+SPECTRUM_SIZE = 1024
+
+# Planes that are memoized as attributes (used by nbytes/release)
+_MEMOIZED_PLANES = ("rgb", "rgb_float", "luma", "residual", "gradient_magnitude", "spectrum")
+
+
+def _freeze(array: np.ndarray) -> np.ndarray:
+    """Mark a shared plane read-only so no analyzer can corrupt it for the others."""
+    array.flags.writeable = False
+    return array
+
+
+def _box_blur3(plane: np.ndarray) -> np.ndarray:
+    """
+    Separable 3×3 box blur with edge replication.
+
+    Args:
+        plane: 2-D float32 array
+
+    Returns:
+        New float32 array of the same shape
+    """
+    padded = np.pad(plane, 1, mode="edge")
+    horizontal = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+    blurred = horizontal[:-2, :] + horizontal[1:-1, :] + horizontal[2:, :]
+    blurred *= np.float32(1.0 / 9.0)
+    return blurred
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKSPACE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ImageWorkspace:
+    """
+    Per-audit container for decoded pixel planes.
+
+    The image is decoded exactly once into a C-contiguous uint8 RGB plane. Derived
+    products (luma, high-pass residual, gradient magnitude, log spectrum) are
+    computed on first access and memoized, so all analyzers share one buffer
+    instead of re-decoding. Every plane is read-only.
+    """
+
+    def __init__(
+        self,
+        image: Optional[Image.Image] = None,
+        rgb: Optional[np.ndarray] = None,
+        source: Optional["ImageSource"] = None,
+    ):
+        """
+        Args:
+            image: PIL Image to decode lazily
+            rgb: Already-decoded (H, W, 3) uint8 array, used instead of ``image``
+            source: Lazy upload; the full decode happens on first pixel access
+        """
+        if image is None and rgb is None and source is None:
+            raise ValueError("ImageWorkspace needs an image, an RGB array or a source")
+        self._image = image
+        self.source = source
+        self._tile_views: Dict[Tuple[str, int, int], np.ndarray] = {}
+        if rgb is not None:
+            if rgb.dtype != np.uint8 or rgb.ndim != 3 or rgb.shape[2] != 3:
+                raise ValueError(f"Expected (H, W, 3) uint8 array, got {rgb.dtype} {rgb.shape}")
+            self.__dict__["rgb"] = _freeze(np.ascontiguousarray(rgb))
+
+    @classmethod
+    def from_array(cls, rgb: np.ndarray) -> "ImageWorkspace":
+        """Wrap an existing RGB buffer (e.g. shared memory) without copying it."""
+        return cls(rgb=rgb)
+
+    @classmethod
+    def from_source(cls, source: "ImageSource") -> "ImageWorkspace":
+        """Wrap a validated upload without decoding it yet."""
+        return cls(source=source)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Base planes
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @property
+    def image(self) -> Image.Image:
+        """Full-resolution PIL image (decodes a lazy source on first access)."""
+        if self._image is None and self.source is not None:
+            return self.source.image
+        if self._image is None:
+            self._image = Image.fromarray(self.rgb)
+        return self._image
+
+    @property
+    def preview(self) -> Image.Image:
+        """Display-sized image; avoids the full decode for lazy sources."""
+        if self.source is not None:
+            return self.source.preview
+        return self.image
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) in pixels, without forcing a decode when possible."""
+        if "rgb" in self.__dict__:
+            height, width = self.rgb.shape[:2]
+            return width, height
+        if self.source is not None:
+            return self.source.size
+        return self.image.size
+
+    @cached_property
+    def rgb(self) -> np.ndarray:
+        """(H, W, 3) uint8 plane — the single decode of the source image."""
+        image = self.image
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return _freeze(np.ascontiguousarray(np.asarray(image, dtype=np.uint8)))
+
+    @cached_property
+    def rgb_float(self) -> np.ndarray:
+        """(H, W, 3) float32 copy of ``rgb`` on the 0-255 scale."""
+        return _freeze(self.rgb.astype(np.float32))
+
+    @cached_property
+    def luma(self) -> np.ndarray:
+        """(H, W) float32 BT.601 luma on the 0-255 scale."""
+        rgb = self.rgb
+        luma = rgb[..., 0].astype(np.float32)
+        luma *= np.float32(LUMA_WEIGHTS[0])
+        luma += np.float32(LUMA_WEIGHTS[1]) * rgb[..., 1]
+        luma += np.float32(LUMA_WEIGHTS[2]) * rgb[..., 2]
+        return _freeze(luma)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Derived planes
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @cached_property
+    def residual(self) -> np.ndarray:
+        """(H, W) float32 high-pass noise residual: luma minus its 3×3 box blur."""
+        residual = _box_blur3(self.luma)
+        np.subtract(self.luma, residual, out=residual)
+        return _freeze(residual)
+
+    @cached_property
+    def gradient_magnitude(self) -> np.ndarray:
+        """(H, W) float32 central-difference gradient magnitude of luma."""
+        luma = self.luma
+        gx = np.zeros_like(luma)
+        gy = np.zeros_like(luma)
+        gx[:, 1:-1] = luma[:, 2:] - luma[:, :-2]
+        gy[1:-1, :] = luma[2:, :] - luma[:-2, :]
+        np.hypot(gx, gy, out=gx)
+        gx *= np.float32(0.5)
+        return _freeze(gx)
+
+    @cached_property
+    def spectrum(self) -> np.ndarray:
+        """
+        Centred log-magnitude Fourier spectrum of luma.
+
+        Computed on a centred crop of at most ``SPECTRUM_SIZE`` per side so memory
+        stays bounded regardless of resolution.
+        """
+        luma = self.luma
+        height, width = luma.shape
+        crop_h, crop_w = min(height, SPECTRUM_SIZE), min(width, SPECTRUM_SIZE)
+        top, left = (height - crop_h) // 2, (width - crop_w) // 2
+        crop = luma[top:top + crop_h, left:left + crop_w]
+        magnitude = np.abs(np.fft.fftshift(np.fft.fft2(crop - crop.mean())))
+        return _freeze(np.log1p(magnitude).astype(np.float32))
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Views & bookkeeping
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def tiles(self, size: int, step: Optional[int] = None, plane: str = "luma") -> np.ndarray:
+        """
+        Tile view over a 2-D plane built with stride tricks — no pixel is copied.
+
+        Args:
+            size: Tile edge length in pixels
+            step: Stride between tiles (defaults to ``size``: non-overlapping)
+            plane: Name of the 2-D plane to tile ("luma", "residual", "gradient_magnitude")
+
+        Returns:
+            Read-only array of shape (rows, cols, size, size)
+        """
+        step = step or size
+        key = (plane, size, step)
+        if key not in self._tile_views:
+            source = getattr(self, plane)
+            if source.ndim != 2:
+                raise ValueError(f"Plane '{plane}' is not 2-D")
+            if min(source.shape) < size:
+                raise ValueError(f"Tile size {size} exceeds plane shape {source.shape}")
+            self._tile_views[key] = sliding_window_view(source, (size, size))[::step, ::step]
+        return self._tile_views[key]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently held by memoized planes (views cost nothing)."""
+        return sum(self.__dict__[name].nbytes for name in _MEMOIZED_PLANES if name in self.__dict__)
+
+    def release(self, *names: str) -> None:
+        """
+        Drop memoized derived planes to cap peak memory between analyzer stages.
+
+        Args:
+            names: Planes to drop; all derived planes (not ``rgb``) when omitted
+        """
+        targets = names or tuple(name for name in _MEMOIZED_PLANES if name != "rgb")
+        for name in targets:
+            self.__dict__.pop(name, None)
+        self._tile_views = {key: view for key, view in self._tile_views.items() if key[0] not in targets}
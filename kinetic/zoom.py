@@ -0,0 +1,223 @@
+"""
+🔎 Two-Pass Zoom Verification
+Checks the coordinates the first pass claims by sending native-resolution
+crops of exactly those regions in one small batched call.
+"""
+
+import json
+import re
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from kinetic import aio
+from kinetic.scheduler import estimate_request_tokens, model_name, scheduler_for
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MAX_CLAIMS = 8  # crops per verification call
+CROP_SIDE = 384  # ≤384px per side costs the minimum image tokens per crop
+MAX_CROP_SIDE = 768  # larger claimed regions are downscaled to this
+VERIFY_OUTPUT_TOKENS = 1024
+
+_BOX = re.compile(r"\[\s*(\d{1,5})\s*,\s*(\d{1,5})\s*,\s*(\d{1,5})\s*,\s*(\d{1,5})\s*\]")
+_POINT = re.compile(r"(?:\[|coordinates?\s*\(|at\s*\()\s*(\d{1,5})\s*,\s*(\d{1,5})\s*[\])]", re.IGNORECASE)
+
+VERIFY_PROMPT = """
+# FORENSIC CLAIM VERIFICATION (ZOOM PASS)
+
+A first forensic pass over a full image made the spatial claims listed below.
+Each attached image is a NATIVE-RESOLUTION crop centred on one claimed location,
+in the same order as the claims. Judge each claim ONLY from its crop.
+
+{claims}
+
+Respond with a JSON array, one object per claim:
+[{{"claim": <number>, "status": "CONFIRMED|REJECTED|UNCERTAIN", "evidence": "<what the crop actually shows>"}}]
+"""
+
+
+def coordinate_instruction(image_size: Tuple[int, int]) -> str:
+    """Prompt suffix pinning claimed coordinates to native pixels so crops line up."""
+    width, height = image_size
+    return (
+        f"\n\n**COORDINATE CONVENTION**: The image is {width} × {height} px. Report every location as "
+        f"[x, y] or [x1, y1, x2, y2] in these native pixel coordinates (origin top-left).\n"
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLAIM EXTRACTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Claim:
+    """A spatial claim from the first pass: a point or a box in pixel coordinates."""
+    text: str
+    box: Tuple[int, int, int, int]  # left, top, right, bottom
+    status: str = "UNVERIFIED"
+    evidence: str = ""
+
+
+def _claim_text(line: str) -> str:
+    cleaned = re.sub(r"[*_`#>]+", "", line).strip(" -•\t")
+    return cleaned[:240]
+
+
+def parse_claims(report: str, image_size: Tuple[int, int], limit: int = MAX_CLAIMS) -> List[Claim]:
+    """
+    Extract claimed coordinates and regions from a model report.
+
+    Template placeholders (``[X, Y]``) do not match; coordinates outside the
+    image are dropped; duplicates keep their first mention.
+
+    Args:
+        report: First-pass markdown report
+        image_size: (width, height) of the native image
+        limit: Maximum claims returned
+
+    Returns:
+        Claims in report order
+    """
+    width, height = image_size
+    claims: List[Claim] = []
+    seen = set()
+    for line in report.splitlines():
+        spans = []
+        for match in _BOX.finditer(line):
+            x1, y1, x2, y2 = (int(value) for value in match.groups())
+            if x2 > x1 and y2 > y1 and x2 <= width and y2 <= height:
+                spans.append((match.span(), (x1, y1, x2, y2)))
+        for match in _POINT.finditer(line):
+            if any(start <= match.start() < end for (start, end), _ in spans):
+                continue  # first two numbers of a box
+            x, y = int(match.group(1)), int(match.group(2))
+            if x < width and y < height:
+                spans.append((match.span(), (x, y, x + 1, y + 1)))
+        for _, box in sorted(spans):
+            if box in seen:
+                continue
+            seen.add(box)
+            claims.append(Claim(_claim_text(line), box))
+            if len(claims) >= limit:
+                return claims
+    return claims
+
+
+def crop_claim(image: Image.Image, claim: Claim) -> Image.Image:
+    """
+    Native-resolution crop around a claim.
+
+    Points get a ``CROP_SIDE`` square; boxes are padded by 25% and only
+    downscaled if they exceed ``MAX_CROP_SIDE``.
+    """
+    left, top, right, bottom = claim.box
+    pad_x = max((CROP_SIDE - (right - left)) // 2, (right - left) // 4)
+    pad_y = max((CROP_SIDE - (bottom - top)) // 2, (bottom - top) // 4)
+    box = (
+        max(0, left - pad_x),
+        max(0, top - pad_y),
+        min(image.width, right + pad_x),
+        min(image.height, bottom + pad_y),
+    )
+    crop = image.crop(box)
+    if crop.mode not in ("RGB", "L"):
+        crop = crop.convert("RGB")
+    crop.thumbnail((MAX_CROP_SIDE, MAX_CROP_SIDE))
+    return crop
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VERIFICATION CALL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class ZoomVerification:
+    """Second-pass outcome for every claim."""
+    claims: List[Claim] = field(default_factory=list)
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    image_tokens: int = 0  # estimated share of prompt_tokens
+    model_name: Optional[str] = None
+    error: Optional[str] = None
+
+    def count(self, status: str) -> int:
+        return sum(claim.status == status for claim in self.claims)
+
+    def to_markdown(self) -> str:
+        icons = {"CONFIRMED": "✅", "REJECTED": "❌", "UNCERTAIN": "❔", "UNVERIFIED": "⚪"}
+        return "\n".join(
+            f"{icons.get(claim.status, '⚪')} **{claim.status}** `{list(claim.box)}` — {claim.text}"
+            + (f"  \n  ↳ {claim.evidence}" if claim.evidence else "")
+            for claim in self.claims
+        )
+
+
+def _parse_statuses(text: str) -> List[Dict[str, Any]]:
+    cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    data = json.loads(cleaned)
+    return data if isinstance(data, list) else []
+
+
+async def verify_claims(model, claims: List[Claim], crops: List[Image.Image]) -> ZoomVerification:
+    """
+    Send all claim crops in one batched call and record per-claim status.
+
+    Args:
+        model: Gemini model
+        claims: Claims to verify (at most ``MAX_CLAIMS``)
+        crops: ``crop_claim`` output for each claim, same order
+
+    Returns:
+        ZoomVerification (``error`` set instead of raising)
+    """
+    result = ZoomVerification(claims, model_name=model_name(model))
+    if not claims:
+        return result
+    start = time.perf_counter()
+    listing = "\n".join(f"{number}. {claim.text}" for number, claim in enumerate(claims, 1))
+    try:
+        contents = [VERIFY_PROMPT.format(claims=listing), *crops]
+        response = await scheduler_for(model).call_async(
+            lambda: model.generate_content_async(
+                contents,
+                generation_config={"response_mime_type": "application/json", "max_output_tokens": VERIFY_OUTPUT_TOKENS},
+            ),
+            estimate_request_tokens(contents),
+        )
+        for entry in _parse_statuses(response.text):
+            index = int(entry.get("claim", 0)) - 1
+            if 0 <= index < len(claims):
+                status = str(entry.get("status", "UNCERTAIN")).upper()
+                claims[index].status = status if status in ("CONFIRMED", "REJECTED", "UNCERTAIN") else "UNCERTAIN"
+                claims[index].evidence = str(entry.get("evidence", ""))
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            result.prompt_tokens = usage.prompt_token_count
+            result.output_tokens = usage.candidates_token_count
+            result.image_tokens = estimate_request_tokens(crops)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.latency = time.perf_counter() - start
+    return result
+
+
+def submit_zoom_verification(model, image: Image.Image, report: str) -> Optional["Future[ZoomVerification]"]:
+    """
+    Parse claims from ``report`` and start verification without blocking.
+
+    Returns:
+        Future on the shared loop, or None when the report makes no spatial claims
+    """
+    claims = parse_claims(report, image.size)
+    if not claims:
+        return None
+    # Crop on the caller's thread; the event loop only waits on the network
+    crops = [crop_claim(image, claim) for claim in claims]
+    return aio.submit(verify_claims(model, claims, crops))